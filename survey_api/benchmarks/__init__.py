@@ -0,0 +1,7 @@
+"""
+Benchmarks for survey_api.
+
+They run standalone and offline: the edx-platform imports are served by the
+stand-ins under ``test_utils/edx_stubs`` and Google Forms by
+``test_utils.fake_google``.
+"""
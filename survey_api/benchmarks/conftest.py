@@ -0,0 +1,7 @@
+"""
+Fixtures for the benchmark suite.
+
+Run with ``make benchmark`` (or ``pytest benchmarks --ds=benchmarks.settings``).
+"""
+# pylint: disable=unused-import
+from test_utils.fixtures import admin_client, clear_caches, fake_google, fake_google_server
@@ -0,0 +1,171 @@
+"""
+Concurrent load test of the learner survey popup flow.
+
+Every simulated dashboard visit does what ``CenteredPopup`` does:
+
+1. ``GET /api/status/`` (popup mount);
+2. ``POST /api/status/`` (iframe loaded);
+3. for some learners, ``POST /api/completed/`` (Apps Script webhook);
+4. ``GET /api/status/`` again (close button re-check).
+
+Visits of the same learner are shuffled across the worker pool, so a learner
+with several visits in flight reproduces the multi-tab case. Learners that
+never complete are the control group for ``times_shown``: each of their
+``POST /api/status/`` calls must add exactly one, anything less is reported
+as lost updates.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.loadtest --learners 500 --visits 3 --concurrency 32
+
+It runs in-process against ``benchmarks.settings`` with a temporary SQLite
+file, so absolute numbers are only comparable between runs of the harness.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+STEPS = ("status_get", "status_post", "completed", "status_recheck")
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    """
+    Thread-safe collection of per-step latencies and errors.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.status_posts = defaultdict(int)
+
+    def record(self, step, seconds, ok):
+        with self.lock:
+            self.latencies[step].append(seconds)
+            if not ok:
+                self.errors[step] += 1
+
+
+def visit(client_factory, recorder, learner, completes):
+    from django.db import connection  # pylint: disable=import-outside-toplevel
+
+    client = client_factory(learner)
+    try:
+        def timed(step, call):
+            start = time.perf_counter()
+            try:
+                response = call()
+                ok = response.status_code == 200
+            except Exception:  # pylint: disable=broad-except
+                response, ok = None, False
+            recorder.record(step, time.perf_counter() - start, ok)
+            return response if ok else None
+
+        response = timed("status_get", lambda: client.get("/api/status/"))
+        if response is None or response.json()["status"] == "dont_show":
+            return
+
+        if timed("status_post", lambda: client.post("/api/status/")) is not None:
+            with recorder.lock:
+                recorder.status_posts[learner.pk] += 1
+
+        if completes:
+            timed("completed", lambda: client.post("/api/completed/", {"email": learner.email}, format="json"))
+
+        timed("status_recheck", lambda: client.get("/api/status/"))
+    finally:
+        connection.close()
+
+
+def run(learners, visits, concurrency, completion_rate, seed):
+    # pylint: disable=import-outside-toplevel
+    from rest_framework.test import APIClient
+
+    from survey_api.models import SurveyModel
+    from test_utils import datagen
+
+    rng = random.Random(seed)
+    users = datagen.create_learners(learners, seed=seed)
+    # Start every learner from a clean slate so each visit goes through the whole flow.
+    SurveyModel.objects.update(times_shown=0, is_completed=False)
+    completing = {user.pk for user in users if rng.random() < completion_rate}
+
+    def client_factory(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    tasks = [user for user in users for _ in range(visits)]
+    rng.shuffle(tasks)
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for user in tasks:
+            executor.submit(visit, client_factory, recorder, user, user.pk in completing)
+    elapsed = time.perf_counter() - start
+
+    control = [user.pk for user in users if user.pk not in completing]
+    shown = dict(SurveyModel.objects.filter(user_id__in=control).values_list("user_id", "times_shown"))
+    lost_updates = sum(max(0, recorder.status_posts[pk] - shown.get(pk, 0)) for pk in control)
+
+    return recorder, elapsed, lost_updates, len(control)
+
+
+def report(recorder, elapsed, lost_updates, control_size, out=sys.stdout):
+    total = sum(len(values) for values in recorder.latencies.values())
+    out.write(f"{'step':<16}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}\n")
+    for step in STEPS:
+        values = sorted(recorder.latencies.get(step, []))
+        if not values:
+            continue
+        out.write(
+            f"{step:<16}{len(values):>8}{recorder.errors[step]:>8}"
+            f"{percentile(values, 50) * 1000:>10.2f}{percentile(values, 95) * 1000:>10.2f}"
+            f"{percentile(values, 99) * 1000:>10.2f}{statistics.fmean(values) * 1000:>10.2f}\n"
+        )
+    out.write(f"\nrequests: {total} in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.1f} req/s)\n")
+    out.write(f"lost times_shown updates: {lost_updates} (over {control_size} non-completing learners)\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--learners", type=int, default=200)
+    parser.add_argument("--visits", type=int, default=3, help="dashboard loads per learner")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--completion-rate", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SURVEY_BENCH_DB"] = os.path.join(tmp, "loadtest.db")
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+        import django  # pylint: disable=import-outside-toplevel
+        from django.core.management import call_command  # pylint: disable=import-outside-toplevel
+
+        django.setup()
+        call_command("migrate", run_syncdb=True, verbosity=0)
+
+        results = run(args.learners, args.visits, args.concurrency, args.completion_rate, args.seed)
+        report(*results)
+        lost_updates = results[2]
+    return 1 if lost_updates else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+"""
+Settings for the benchmark suite.
+
+The test settings, with a database the load test's worker threads can share.
+"""
+import os
+
+from test_settings import *  # pylint: disable=wildcard-import,unused-wildcard-import
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        # The load test needs a file so that its worker threads share one database.
+        'NAME': os.environ.get('SURVEY_BENCH_DB', ':memory:'),
+        'OPTIONS': {'timeout': 30},
+    }
+}
@@ -0,0 +1,55 @@
+"""
+Benchmarks of the async Google-bound views.
+"""
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+
+from test_utils import datagen
+
+pytest.importorskip("httpx")
+
+from survey_api import async_views  # pylint: disable=wrong-import-position
+
+SCALES = [10, 100, 1000]
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def async_get(fake_google, admin_client, django_user_model, monkeypatch):
+    """
+    Call an async view as the benchmark admin and return ``(status_code, body)``.
+    """
+    async def token():
+        return "bench-token"
+
+    monkeypatch.setattr(async_views, "aget_access_token", token)
+    admin = django_user_model.objects.get(username="bench-admin")
+
+    def get(view_class, path):
+        request = AsyncRequestFactory().get(path)
+        request.user = admin
+        response = async_to_sync(view_class.as_view())(request)
+        return response.status_code, json.loads(response.content)
+
+    return get
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_async_form_responses(benchmark, fake_google, admin_client, async_get, scale):
+    datagen.add_onboarding_forms(fake_google, scale)
+    status_code, body = benchmark(async_get, async_views.AsyncFormResponses, "/api/responses/q?language=en")
+    assert status_code == 200
+    assert body == admin_client.get("/api/responses/q?language=en").json()
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_async_user_onboarding(benchmark, fake_google, admin_client, async_get, scale):
+    datagen.add_onboarding_forms(fake_google, scale)
+    path = f"/api/user/onboarding/q?email={datagen.learner_email(2 * scale - 1)}"
+    status_code, body = benchmark(async_get, async_views.AsyncUserOnboardingView, path)
+    assert status_code == 200
+    assert body == admin_client.get(path).json()
@@ -0,0 +1,111 @@
+"""
+Query-count and latency budgets for every survey_api endpoint.
+
+``BUDGETS`` is the single table of limits. Each endpoint is exercised on the
+same synthetic dataset at every size in ``SIZES``; since the query budget
+does not depend on the size, any N+1 regression fails here. Latency ceilings
+are generous wall-clock limits for the in-process run and can be scaled with
+``SURVEY_BUDGET_LATENCY_FACTOR`` on slow machines.
+"""
+import os
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from survey_api import metrics, urls
+from survey_api.caching import clear_local
+from survey_api.changes import start_cursor
+from test_utils import datagen
+
+SIZES = [20, 200]
+
+LATENCY_FACTOR = float(os.environ.get("SURVEY_BUDGET_LATENCY_FACTOR", "1"))
+
+COURSE_FORM = "course-form-0"
+
+# url name: (method, path, payload, client ("admin" or "learner"), max queries, max milliseconds)
+BUDGETS = {
+    "survey-status": ("get", "/api/status/", None, "learner", 2, 50),
+    "survey-status:post": ("post", "/api/status/", None, "learner", 2, 50),
+    "survey-status-wait": ("get", "/api/status/wait/?timeout=0", None, "learner", 2, 50),
+    "allowed": ("get", "/api/allowed/", None, "learner", 0, 50),
+    "dashboard": ("get", "/api/dashboard/", None, "admin", 2, 200),
+    "survey-completed": ("post", "/api/completed/", {"email": "{learner_email}"}, "anonymous", 3, 50),
+    "form-responses": ("get", "/api/responses/q?language=en", None, "admin", 0, 500),
+    "registration-responses": ("get", "/api/responses/registration/", None, "admin", 1, 500),
+    "registration-demographics": ("get", "/api/responses/registration/demographics/", None, "admin", 5, 200),
+    "course-responses": ("get", f"/api/responses/course/q?form_id={COURSE_FORM}", None, "admin", 0, 200),
+    "course-feedback-overview": ("get", "/api/responses/course/overview/", None, "admin", 3, 200),
+    "user-course": ("get", f"/api/user/course/q?form_id={COURSE_FORM}&username={{learner_username}}",
+                    None, "admin", 2, 100),
+    "user-onboarding": ("get", "/api/user/onboarding/q?email={learner_email}", None, "admin", 0, 300),
+    "user-registration": ("get", "/api/user/registration/q?username={learner_username}", None, "admin", 1, 50),
+    "submissions-feed": ("get", f"/api/submissions/?form_id={COURSE_FORM}", None, "admin", 1, 100),
+    "changes": ("get", f"/api/changes/?cursor={{changes_cursor}}&form_id={COURSE_FORM}", None, "admin", 4, 200),
+    "course-form": ("post", "/api/course-forms/",
+                    {"email": "{learner_email}", "form_id": "new-form", "response_id": "new-response"},
+                    "anonymous", 2, 50),
+    "metrics": ("get", "/api/metrics/", None, "admin", 0, 200),
+    "google-quota": ("get", "/api/google/quota/", None, "admin", 0, 50),
+}
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def dataset(fake_google, admin_client, request):
+    size = request.param
+    cache.clear()
+    clear_local()
+    learners = datagen.create_learners(size)
+    datagen.create_courses(3, learners)
+    datagen.create_form_submissions(COURSE_FORM, learners)
+    datagen.add_onboarding_forms(fake_google, size)
+    fake_google.add_form(datagen.make_form(COURSE_FORM), datagen.make_responses(COURSE_FORM, size))
+    for i in (1, 2):
+        form_id = f"course-form-{i}"
+        fake_google.add_form(datagen.make_form(form_id), datagen.make_responses(form_id, size))
+
+    learner = learners[-1]
+    learner_client = APIClient()
+    learner_client.force_authenticate(learner)
+    return {
+        "clients": {"admin": admin_client, "learner": learner_client, "anonymous": APIClient()},
+        "learner": learner,
+    }
+
+
+def test_every_url_has_a_budget():
+    names = {pattern.name for pattern in urls.urlpatterns}
+    budgeted = {name.split(":")[0] for name in BUDGETS}
+    assert names - budgeted == set(), "Add the new endpoints to BUDGETS"
+
+
+@pytest.mark.parametrize("dataset", SIZES, indirect=True)
+@pytest.mark.parametrize("name", sorted(BUDGETS))
+def test_budget(dataset, name):
+    if name == "metrics" and not metrics.ENABLED:
+        pytest.skip("prometheus-client is not installed, so api/metrics/ is not served.")
+    method, path, payload, client_name, max_queries, max_ms = BUDGETS[name]
+    learner = dataset["learner"]
+    fields = {"learner_email": learner.email, "learner_username": learner.username, "changes_cursor": start_cursor()}
+    path = path.format(**fields)
+    if payload:
+        payload = {key: value.format(**fields) for key, value in payload.items()}
+    client = dataset["clients"][client_name]
+
+    with CaptureQueriesContext(connections["default"]) as queries:
+        start = time.perf_counter()
+        response = getattr(client, method)(path, payload, format="json")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    assert response.status_code < 300, response.content
+    assert len(queries) <= max_queries, (
+        f"{name}: {len(queries)} queries > budget of {max_queries}:\n"
+        + "\n".join(query["sql"] for query in queries.captured_queries)
+    )
+    assert elapsed_ms <= max_ms * LATENCY_FACTOR, f"{name}: {elapsed_ms:.1f}ms > budget of {max_ms}ms"
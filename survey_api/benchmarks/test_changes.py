@@ -0,0 +1,41 @@
+"""
+Benchmark of ``api/changes/`` with few changes on a large dataset.
+"""
+import pytest
+from acl_extra_reg_fields.models import ExtraInfo
+
+from test_utils import datagen
+
+SCALES = [10, 100, 1000]
+
+pytestmark = pytest.mark.django_db
+
+
+def changes(client, cursor, query=""):
+    response = client.get(f"/api/changes/?cursor={cursor}{query}")
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+@pytest.fixture
+def no_overlap(settings):
+    settings.SURVEY_CHANGES_OVERLAP = 0
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_changes_cost_follows_the_changes(
+    benchmark, admin_client, django_assert_max_num_queries, django_capture_on_commit_callbacks, no_overlap, scale
+):
+    learners = datagen.create_learners(scale)
+    datagen.create_form_submissions("course-form-0", learners)
+    cursor = admin_client.get("/api/changes/").json()["cursor"]
+    learners[0].profile.name = "Renamed Learner"
+    with django_capture_on_commit_callbacks(execute=True):
+        learners[0].profile.save()
+
+    with django_assert_max_num_queries(4):
+        delta = benchmark(changes, admin_client, cursor)
+    assert [row["responseId"] for row in delta["registrations"]] == [
+        str(ExtraInfo.objects.get(user=learners[0]).pk)
+    ]
+    assert delta["responses"] == []
@@ -0,0 +1,38 @@
+"""
+Benchmark of ``reconcile_form_responses`` over a large course feedback form.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from survey_api.management.commands import reconcile_form_responses
+from survey_api.models import GoogleFormResponseModel
+from test_utils import datagen
+
+SCALES = [10, 100, 1000]
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def token(fake_google, monkeypatch):
+    monkeypatch.setattr(reconcile_form_responses, "get_access_token", lambda: "bench-token")
+
+
+def reconcile(*args):
+    call_command("reconcile_form_responses", *args, stdout=StringIO())
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_reconcile_form(benchmark, fake_google, token, scale):
+    learners = datagen.create_learners(scale)
+    datagen.create_courses(1, learners)
+    fake_google.add_form(datagen.make_form("course-form-0"), datagen.make_responses("course-form-0", scale))
+
+    def run():
+        GoogleFormResponseModel.objects.all().delete()
+        reconcile("--full", "--batch-size", "100")
+
+    benchmark(run)
+    assert GoogleFormResponseModel.objects.filter(form_id="course-form-0").count() == scale
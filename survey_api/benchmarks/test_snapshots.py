@@ -0,0 +1,22 @@
+"""
+Benchmark of the registration snapshot rebuild.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from survey_api.models import RegistrationSnapshotModel
+from test_utils import datagen
+
+SCALES = [10, 100, 1000]
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_rebuild_registration_snapshots(benchmark, scale):
+    datagen.create_learners(scale)
+    RegistrationSnapshotModel.objects.all().delete()
+    benchmark(call_command, "rebuild_registration_snapshots", "--batch-size", "100", stdout=StringIO())
+    assert RegistrationSnapshotModel.objects.count() == scale
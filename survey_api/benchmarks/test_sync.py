@@ -0,0 +1,25 @@
+"""
+Benchmark of an incremental ``sync_survey_data`` pass.
+"""
+import pytest
+
+from survey_api import sync
+from test_utils import datagen
+
+SCALES = [10, 100, 1000]
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def token(fake_google, monkeypatch):
+    monkeypatch.setattr(sync, "get_access_token", lambda: "bench-token")
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_sync_pass(benchmark, fake_google, token, scale):
+    datagen.add_onboarding_forms(fake_google, scale)
+    sync.sync_once()
+    # Steady state: nothing new since the previous pass.
+    results = benchmark(sync.sync_once)
+    assert set(results.values()) == {0}
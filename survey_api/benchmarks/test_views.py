@@ -0,0 +1,122 @@
+"""
+Benchmarks of the survey_api endpoints at several data scales.
+"""
+import pytest
+from rest_framework.test import APIClient
+
+from survey_api.models import SurveyFormModel
+from test_utils import datagen
+
+SCALES = [10, 100, 1000]
+
+pytestmark = pytest.mark.django_db
+
+
+def get_ok(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.content
+    return response
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_form_responses(benchmark, fake_google, admin_client, scale):
+    datagen.add_onboarding_forms(fake_google, scale)
+    response = benchmark(get_ok, admin_client, "/api/responses/q?language=en")
+    assert len(response.json()["responses"]) == 2 * scale
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_form_responses_columnar(benchmark, fake_google, admin_client, scale):
+    datagen.add_onboarding_forms(fake_google, scale)
+    response = benchmark(get_ok, admin_client, "/api/responses/q?language=en&format=columnar")
+    assert len(response.json()["rows"]) == 2 * scale
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_form_responses_three_languages(benchmark, fake_google, admin_client, scale):
+    for position, (locale, form_id) in enumerate([("en", "form-en"), ("fr-ca", "form-fr"), ("es", "form-es")]):
+        SurveyFormModel.objects.create(locale=locale, form_id=form_id, position=position)
+    datagen.add_onboarding_forms(fake_google, scale)
+    response = benchmark(get_ok, admin_client, "/api/responses/q?language=fr-ca")
+    responses = response.json()["responses"]
+    assert len(responses) == 3 * scale
+    roles = {r["answers"]["role"]["textAnswers"]["answers"][0]["value"] for r in responses}
+    assert roles <= {"Étudiant", "Enseignant", "Autre"}
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_user_onboarding(benchmark, fake_google, admin_client, scale):
+    datagen.add_onboarding_forms(fake_google, scale)
+    # The last French respondent is the worst case: both forms are scanned.
+    email = datagen.learner_email(2 * scale - 1)
+    response = benchmark(get_ok, admin_client, f"/api/user/onboarding/q?email={email}")
+    assert len(response.json()["responses"]) == 1
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_registration_responses(benchmark, admin_client, scale):
+    datagen.create_learners(scale)
+    response = benchmark(get_ok, admin_client, "/api/responses/registration/")
+    assert len(response.json()["responses"]) == scale
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_registration_demographics(benchmark, admin_client, scale):
+    learners = datagen.create_learners(scale)
+    response = benchmark(get_ok, admin_client, "/api/responses/registration/demographics/")
+    report = response.json()
+    assert report["total"] == scale
+    for name in ("gender", "year_of_birth", "preferred_language", "referrer"):
+        assert sum(row["count"] for row in report[name]) == scale
+    assert {row["label"] for row in report["gender"]} <= {"Male", "Female", "Other/Prefer Not to Say", None}
+
+    joined_before = learners[scale // 2].date_joined.strftime("%Y-%m-%dT%H:%M:%SZ")
+    window = get_ok(admin_client, f"/api/responses/registration/demographics/?joined_before={joined_before}").json()
+    assert window["total"] == scale // 2
+    assert admin_client.get("/api/responses/registration/demographics/?joined_after=soon").status_code == 400
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_submissions_feed_last_page(benchmark, admin_client, scale):
+    learners = datagen.create_learners(scale)
+    datagen.create_form_submissions("course-form-0", learners)
+    url = "/api/submissions/?form_id=course-form-0&limit=5"
+    page = get_ok(admin_client, url).json()
+    while page["next"]:
+        cursor = page["next"]
+        page = get_ok(admin_client, f"{url}&cursor={cursor}").json()
+    # A deep page costs the same as the first one.
+    response = benchmark(get_ok, admin_client, f"{url}&cursor={cursor}")
+    assert response.json()["results"][-1]["response_id"] == "course-form-0-r0"
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_registration_responses_columnar(benchmark, admin_client, scale):
+    datagen.create_learners(scale)
+    response = benchmark(get_ok, admin_client, "/api/responses/registration/?format=columnar")
+    assert len(response.json()["rows"]) == scale
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_dashboard_info(benchmark, admin_client, scale):
+    datagen.create_learners(scale)
+    datagen.create_courses(max(scale // 10, 1))
+    response = benchmark(get_ok, admin_client, "/api/dashboard/")
+    assert len(response.json()["users"]) == scale + 1
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_status_get(benchmark, scale):
+    learner = datagen.create_learners(scale)[-1]
+    client = APIClient()
+    client.force_authenticate(learner)
+    benchmark(get_ok, client, "/api/status/")
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_status_post(benchmark, scale):
+    learner = datagen.create_learners(scale)[-1]
+    client = APIClient()
+    client.force_authenticate(learner)
+    response = benchmark(client.post, "/api/status/")
+    assert response.status_code == 200
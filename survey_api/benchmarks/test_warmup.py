@@ -0,0 +1,42 @@
+"""
+Benchmark of the ``warm_survey_cache`` command.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from test_utils import datagen
+
+SCALES = [10, 100, 1000]
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def warm(fake_google, monkeypatch):
+    monkeypatch.setattr(
+        "survey_api.management.commands.warm_survey_cache.get_access_token", lambda: "bench-token"
+    )
+
+    def run():
+        out = StringIO()
+        call_command("warm_survey_cache", stdout=out)
+        return out.getvalue()
+
+    return run
+
+
+def add_course_forms(fake_google, count, responses):
+    datagen.create_courses(count)
+    for i in range(count):
+        form_id = f"course-form-{i}"
+        fake_google.add_form(datagen.make_form(form_id), datagen.make_responses(form_id, responses))
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_warm_survey_cache(benchmark, fake_google, warm, scale):
+    datagen.add_onboarding_forms(fake_google, scale)
+    add_course_forms(fake_google, 3, scale)
+    output = benchmark(warm)
+    assert "Warmed 5 form(s)" in output
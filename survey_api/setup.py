@@ -150,6 +150,10 @@ setup(
     },
     include_package_data=True,
     install_requires=load_requirements('requirements/base.in'),
+    extras_require={
+        'metrics': ['prometheus-client'],
+        'async': ['httpx'],
+    },
     python_requires=">=3.8",
     license="AGPL 3.0",
     zip_safe=False,
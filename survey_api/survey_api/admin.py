@@ -1,7 +1,156 @@
+"""
+Django admin for survey_api, usable on LMS databases with millions of survey rows.
+
+Changelists join their users and courses in one query, pick related rows by
+id instead of loading every user into a select, only filter on indexed
+columns and estimate the row count of large unfiltered tables.
+"""
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib import admin
-from .models import SurveyModel, GoogleFormResponseModel, CourseFeedbackModel
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import SurveyModel, GoogleFormResponseModel, CourseFeedbackModel, SurveyFormModel
+
+
+def estimated_row_count(queryset):
+    """
+    Return the database's estimate of the rows of the queryset's table, or None when it can't tell.
+    """
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    if connection.vendor == "mysql":
+        sql = "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    elif connection.vendor == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE relname = %s"
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that skips ``COUNT(*)`` over large unfiltered tables.
+
+    Unfiltered changelists of more than ``SURVEY_ADMIN_EXACT_COUNT_LIMIT`` rows
+    (default 10000) trust the database's row estimate instead. Filtered
+    changelists are counted exactly, through the indexes their filters use.
+    """
+
+    @cached_property
+    def count(self):
+        """
+        Return the row estimate of a large unfiltered changelist, the exact count otherwise.
+        """
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset)
+            if estimate is not None and estimate > getattr(settings, "SURVEY_ADMIN_EXACT_COUNT_LIMIT", 10000):
+                return estimate
+        return super().count
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # The "N total" link would run the exact COUNT(*) the paginator avoids.
+    show_full_result_count = False
+
+
+class FormIdFilter(admin.SimpleListFilter):
+    """
+    Filter on ``form_id``, listing the known forms rather than a ``DISTINCT`` over every response.
+    """
+
+    title = "form"
+    parameter_name = "form_id"
+
+    def lookups(self, request, model_admin):
+        """
+        List the registered survey forms, then every course feedback form.
+        """
+        from .registry import registered_form_ids  # pylint: disable=import-outside-toplevel
+
+        form_ids = registered_form_ids()
+        for form_id in CourseFeedbackModel.objects.order_by("form_id").values_list("form_id", flat=True):
+            if form_id not in form_ids:
+                form_ids.append(form_id)
+        return [(form_id, form_id) for form_id in form_ids]
+
+    def queryset(self, request, queryset):
+        """
+        Keep the rows of the selected form.
+        """
+        if self.value():
+            return queryset.filter(form_id=self.value())
+        return queryset
+
+
+class SubmittedSinceFilter(admin.SimpleListFilter):
+    """
+    Recent submissions; combined with ``FormIdFilter`` this is a range scan of the ``(form_id, submitted_at)`` index.
+    """
+
+    title = "submitted"
+    parameter_name = "submitted_since"
+
+    DAYS = {"1": "Last 24 hours", "7": "Last 7 days", "30": "Last 30 days"}
+
+    def lookups(self, request, model_admin):
+        """
+        List the offered windows.
+        """
+        return list(self.DAYS.items())
+
+    def queryset(self, request, queryset):
+        """
+        Keep the rows submitted within the selected window.
+        """
+        if self.value() in self.DAYS:
+            return queryset.filter(submitted_at__gte=timezone.now() - timedelta(days=int(self.value())))
+        return queryset
+
+
+@admin.register(SurveyModel)
+class SurveyModelAdmin(ScalableModelAdmin):
+    list_display = ("user", "times_shown", "is_completed", "status")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    # Exact matches go through the unique username and email indexes.
+    search_fields = ("=user__username", "=user__email")
+
+
+@admin.register(GoogleFormResponseModel)
+class GoogleFormResponseModelAdmin(ScalableModelAdmin):
+    list_display = ("user", "form_id", "response_id", "submitted_at")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    list_filter = (FormIdFilter, SubmittedSinceFilter)
+    search_fields = ("=user__username", "=user__email", "=response_id")
+
+
+@admin.register(CourseFeedbackModel)
+class CourseFeedbackModelAdmin(ScalableModelAdmin):
+    list_display = ("course", "course_name", "form_id")
+    list_select_related = ("course",)
+    raw_id_fields = ("course",)
+    search_fields = ("=form_id",)
+
+    @admin.display(description="Course name", ordering="course__display_name")
+    def course_name(self, obj):
+        """
+        Return the display name of the feedback form's course.
+        """
+        return obj.course.display_name
 
-admin.site.register(SurveyModel)
-admin.site.register(GoogleFormResponseModel)
-admin.site.register(CourseFeedbackModel)
 
+@admin.register(SurveyFormModel)
+class SurveyFormModelAdmin(admin.ModelAdmin):
+    list_display = ("survey", "locale", "form_id", "email_question", "position")
+    list_filter = ("survey",)
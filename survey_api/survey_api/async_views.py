@@ -0,0 +1,356 @@
+"""
+Async variants of the Google-bound report views, for LMS deployments served over ASGI.
+
+Enabled with ``SURVEY_ASYNC_VIEWS = True`` (requires ``httpx``); the urls then
+route ``FormResponses``, ``CourseResponseView``, ``UserCourseView``,
+``UserOnboardingView`` and ``SurveyStatusWaitView`` here, the latter then
+waiting for the survey's completion server-side. While a view waits its
+worker keeps serving other requests, and the Google calls a view needs are issued
+concurrently. Query parameters and response bodies are the same as the
+synchronous views, whose report building code is reused as is.
+
+Each async view runs the DRF authentication, permission and throttle checks
+of its synchronous view, in a worker thread, and shares its stale-response
+fallback while the Google circuit breaker is open.
+"""
+import asyncio
+import time
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import exceptions, status
+
+from . import metrics
+from .circuit_breaker import (
+    CLOSED,
+    CircuitOpenError,
+    StaleFallbackMixin,
+    google_breaker,
+    stale_key,
+    stale_response,
+    store_stale,
+)
+from .filters import FieldSelection, ResponseFilter, ResponseFilterError
+from .formats import COLUMNAR
+from .google_forms_async import (
+    aget_access_token,
+    aget_form,
+    aget_form_response,
+    aget_form_responses,
+    alist_form_responses,
+)
+from .models import GoogleFormResponseModel, SurveyModel
+from .rate_limit import RateLimitExceeded
+from .registry import get_survey_forms
+from .timing import ServerTiming, _current, phase
+from .views import (
+    CourseResponseView,
+    FormResponses,
+    SurveyStatusWaitView,
+    UserCourseView,
+    UserOnboardingView,
+    set_survey_done_cookie,
+    status_wait_timeout,
+)
+
+
+class AsyncSurveyAPIView(View):
+    """
+    Base class for the async views.
+
+    It applies the DRF checks and stale fallback of ``sync_view_class``, emits
+    ``Server-Timing`` and latency metrics, and answers Google outages with
+    JSON errors.
+    """
+
+    sync_view_class = None
+
+    @property
+    def stale_fallback(self):
+        """
+        Whether the request gets the stale fallback of ``sync_view_class``.
+        """
+        return self.request.method == "GET" and issubclass(self.sync_view_class, StaleFallbackMixin)
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Handle the request, timing it and falling back to the stale copy while Google is unavailable.
+        """
+        timing = ServerTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        # Shared with the synchronous view, whose responses are the same.
+        key = stale_key(self.sync_view_class.__name__, request)
+        try:
+            response = await self._handle(request, *args, **kwargs)
+            if self.stale_fallback and response.status_code == 200:
+                await sync_to_async(store_stale)(key, response)
+            elif self.stale_fallback and response.status_code >= 500:
+                if await sync_to_async(google_breaker.state)() != CLOSED:
+                    response = await sync_to_async(stale_response)(key)
+        except CircuitOpenError:
+            if self.stale_fallback:
+                response = await sync_to_async(stale_response)(key)
+            else:
+                response = JsonResponse(
+                    {"error": "Google Forms is unavailable, please retry later."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+                response["Retry-After"] = str(google_breaker.reset_timeout)
+        finally:
+            _current.reset(token)
+
+        metrics.VIEW_LATENCY.labels(view=type(self).__name__, method=request.method).observe(
+            time.perf_counter() - start
+        )
+        response["Server-Timing"] = timing.header_value()
+        return response
+
+    async def _handle(self, request, *args, **kwargs):
+        with phase("auth"):
+            denied = await sync_to_async(self.check_access)(request, *args, **kwargs)
+        if denied is not None:
+            return denied
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except RateLimitExceeded as e:
+            response = JsonResponse({"detail": str(e.detail)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            response["Retry-After"] = str(e.wait)
+            return response
+
+    def check_access(self, request, *args, **kwargs):
+        """
+        Run the DRF checks of ``sync_view_class`` on ``request``; return the error response, or None.
+
+        These are the synchronous view's own ``initial`` checks, so
+        authentication, permissions and throttles can't drift apart between
+        the two, and ``CircuitOpenError`` is raised, as there, for a GET while
+        the breaker is open.
+        """
+        view = self.sync_view_class()
+        view.args, view.kwargs = args, kwargs
+        view.headers = view.default_response_headers
+        drf_request = view.initialize_request(request, *args, **kwargs)
+        view.request = drf_request
+        try:
+            view.initial(drf_request, *args, **kwargs)
+        except exceptions.APIException as e:
+            response = view.finalize_response(drf_request, view.handle_exception(e), *args, **kwargs)
+            return response.render()
+        request.user = drf_request.user
+        return None
+
+
+async def _headers():
+    return {"Authorization": f"Bearer {await aget_access_token()}"}
+
+
+async def _aget_responses(form_id, headers, timestamp_filter=None):
+    """
+    Responses in the window of ``timestamp_filter``, or all of them through the cache, like ``fetch_forms``.
+    """
+    if timestamp_filter:
+        return await alist_form_responses(form_id, headers, timestamp_filter)
+    return await aget_form_responses(form_id, headers)
+
+
+async def _aget_form_and_responses(form_id, headers, timestamp_filter=None):
+    return await asyncio.gather(
+        aget_form(form_id, headers),
+        _aget_responses(form_id, headers, timestamp_filter),
+    )
+
+
+aget_survey_forms = sync_to_async(get_survey_forms)
+
+
+class AsyncFormResponses(AsyncSurveyAPIView):
+    sync_view_class = FormResponses
+
+    async def get(self, request):
+        """
+        Answer like ``FormResponses.get`` without blocking the worker on Google.
+        """
+        view = FormResponses()
+        try:
+            response_filter = ResponseFilter.from_query_params(request.GET)
+            selection = FieldSelection.from_query_params(request.GET)
+        except ResponseFilterError as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            headers = await _headers()
+        except Exception as e:
+            return JsonResponse({"error": f"Token error: {str(e)}"}, status=500)
+
+        google_filter = response_filter.google_filter()
+        variants = await aget_survey_forms(view.survey)
+        try:
+            with phase("google_responses"):
+                fetched = await asyncio.gather(*[
+                    _aget_form_and_responses(variant.form_id, headers, google_filter) for variant in variants
+                ])
+        except httpx.HTTPError as e:
+            return JsonResponse({"error": f"API error: {str(e)}"}, status=500)
+
+        forms = [(variant, meta, responses) for variant, (meta, responses) in zip(variants, fetched)]
+        with phase("transform"):
+            data = view.build_report(
+                forms,
+                request.GET.get('language'),
+                response_filter,
+                selection,
+                request.GET.get("format") == COLUMNAR,
+            )
+        return JsonResponse(data)
+
+
+class AsyncCourseResponseView(AsyncSurveyAPIView):
+    sync_view_class = CourseResponseView
+
+    async def get(self, request):
+        """
+        Answer like ``CourseResponseView.get`` without blocking the worker on Google.
+        """
+        form_id = request.GET.get('form_id')
+
+        try:
+            response_filter = ResponseFilter.from_query_params(request.GET)
+            selection = FieldSelection.from_query_params(request.GET)
+        except ResponseFilterError as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            headers = await _headers()
+        except Exception as e:
+            return JsonResponse({"error": f"Token error: {str(e)}"}, status=500)
+
+        try:
+            with phase("google_responses"):
+                meta, responses = await _aget_form_and_responses(form_id, headers, response_filter.google_filter())
+        except httpx.HTTPError as e:
+            return JsonResponse({"error": f"API error: {str(e)}"}, status=500)
+
+        data = CourseResponseView().build_report(
+            meta, responses, response_filter, selection, request.GET.get("format") == COLUMNAR
+        )
+        return JsonResponse(data)
+
+
+class AsyncUserCourseView(AsyncSurveyAPIView):
+    sync_view_class = UserCourseView
+
+    async def get(self, request):
+        """
+        Answer like ``UserCourseView.get`` without blocking the worker on Google.
+        """
+        form_id = request.GET.get('form_id')
+        username = request.GET.get('username')
+
+        try:
+            selection = FieldSelection.from_query_params(request.GET)
+        except ResponseFilterError as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        submission = await GoogleFormResponseModel.objects.filter(
+            form_id=form_id, user__username=username
+        ).afirst()
+        if submission is None:
+            if not await User.objects.filter(username=username).aexists():
+                return JsonResponse({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+            return JsonResponse(selection.payload({"items": []}, responses=[]))
+
+        try:
+            headers = await _headers()
+        except Exception as e:
+            return JsonResponse({"error": f"Token error: {str(e)}"}, status=500)
+
+        try:
+            with phase("google_responses"):
+                meta, response = await asyncio.gather(
+                    aget_form(form_id, headers),
+                    aget_form_response(form_id, submission.response_id, headers),
+                )
+        except httpx.HTTPError as e:
+            return JsonResponse({"error": f"API error: {str(e)}"}, status=500)
+
+        return JsonResponse(selection.payload(meta, responses=[selection.response(response)]))
+
+
+class AsyncUserOnboardingView(AsyncSurveyAPIView):
+    sync_view_class = UserOnboardingView
+
+    async def get(self, request):
+        """
+        Answer like ``UserOnboardingView.get`` without blocking the worker on Google.
+        """
+        view = UserOnboardingView()
+        email = request.GET.get('email')
+
+        try:
+            selection = FieldSelection.from_query_params(request.GET)
+        except ResponseFilterError as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            headers = await _headers()
+        except Exception as e:
+            return JsonResponse({"error": f"Token error: {str(e)}"}, status=500)
+
+        variants = await aget_survey_forms(view.survey)
+        try:
+            with phase("google_responses"):
+                fetched = await asyncio.gather(*[
+                    _aget_form_and_responses(variant.form_id, headers) for variant in variants
+                ])
+        except httpx.HTTPError as e:
+            return JsonResponse(
+                {"error": f"Google Forms API request failed: {e}"},
+                status=status.HTTP_502_BAD_GATEWAY,
+            )
+
+        forms = [(variant, meta, responses) for variant, (meta, responses) in zip(variants, fetched)]
+        data, status_code = view.build_report(email, selection, forms)
+        return JsonResponse(data, status=status_code)
+
+
+class AsyncSurveyStatusWaitView(AsyncSurveyAPIView):
+    """
+    Long-poll of ``SurveyStatusView``.
+
+    While the survey can't be skipped any more, wait up to ``?timeout=``
+    seconds (at most, and by default, ``SURVEY_STATUS_WAIT_TIMEOUT``) for
+    ``SurveyCompletedView`` to mark it completed, then answer with the current
+    status.
+
+    Waiting polls a cache flag set on completion, not the database. It only
+    frees the worker when the LMS is served over ASGI.
+    """
+
+    sync_view_class = SurveyStatusWaitView
+
+    POLL_INTERVAL = 0.25
+
+    async def get(self, request):
+        """
+        Wait for the survey's completion, then answer with its status.
+        """
+        try:
+            timeout = status_wait_timeout(request.GET)
+        except ValueError:
+            return JsonResponse({"error": "timeout must be a number of seconds."}, status=status.HTTP_400_BAD_REQUEST)
+
+        survey, _ = await SurveyModel.objects.aget_or_create(user=request.user)
+        key = SurveyModel.completion_key(request.user.pk)
+        deadline = time.monotonic() + timeout
+        while survey.status == SurveyModel.STATUS_MUST_SHOW and time.monotonic() < deadline:
+            await asyncio.sleep(min(self.POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+            if await cache.aget(key) or time.monotonic() >= deadline:
+                await survey.arefresh_from_db()
+
+        response = JsonResponse({"status": survey.status, "count": survey.times_shown, "email": request.user.email})
+        return set_survey_done_cookie(response, survey)
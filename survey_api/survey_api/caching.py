@@ -0,0 +1,272 @@
+"""
+Two-tier cache for survey_api: a small in-process LRU in front of the Django cache.
+
+Every cached value lives in a ``Namespace`` (form metadata, response lists,
+reports, ...). A lookup tries the process-local tier first, then the shared
+Django cache, and records a hit or miss for each tier under the namespace's
+name. Local entries live for at most ``SURVEY_LOCAL_CACHE_TIMEOUT`` seconds
+(default 10) and the local tier holds ``SURVEY_LOCAL_CACHE_SIZE`` entries
+(default 256), least recently used first out.
+
+``Namespace.invalidate`` bumps a version stored in the shared cache, so every
+key of the namespace changes at once in every process; other processes see
+the new version within ``SURVEY_LOCAL_CACHE_TIMEOUT`` seconds.
+
+``Namespace.get_or_set`` loads a missing value once: threads of a process wait
+for the one loading it, and other processes wait (up to ``LOAD_LOCK_TIMEOUT``
+seconds) for its result to reach the shared cache.
+
+Cached values are shared between callers of a process and must be treated
+as read-only.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+
+# Longest a process waits for another one to load a value before loading it itself.
+LOAD_LOCK_TIMEOUT = 30
+POLL_INTERVAL = 0.05
+
+# Longer keys are hashed; memcached refuses keys over 250 characters.
+MAX_KEY_LENGTH = 160
+
+
+def _local_timeout():
+    return getattr(settings, "SURVEY_LOCAL_CACHE_TIMEOUT", 10)
+
+
+class LocalCache:
+    """
+    Thread-safe LRU of ``key -> value`` with a per-entry time to live.
+    """
+
+    def __init__(self):
+        """
+        Create an empty cache.
+        """
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the value of ``key``, or None when missing or expired.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        """
+        Keep ``value`` for ``timeout`` seconds, evicting the least recently used entries when full.
+        """
+        max_entries = getattr(settings, "SURVEY_LOCAL_CACHE_SIZE", 256)
+        with self._lock:
+            self._data[key] = (time.monotonic() + timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Drop ``key`` if present.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Drop every entry.
+        """
+        with self._lock:
+            self._data.clear()
+
+
+local_cache = LocalCache()
+
+_flights = {}
+_flights_guard = threading.Lock()
+
+
+@contextmanager
+def _single_flight(key):
+    """
+    Hold a per-key lock of this process while ``key`` is being loaded.
+    """
+    with _flights_guard:
+        lock, waiters = _flights.get(key, (None, 0))
+        _flights[key] = (lock or threading.Lock(), waiters + 1)
+        lock = _flights[key][0]
+    try:
+        with lock:
+            yield
+    finally:
+        with _flights_guard:
+            lock, waiters = _flights[key]
+            if waiters == 1:
+                del _flights[key]
+            else:
+                _flights[key] = (lock, waiters - 1)
+
+
+class Namespace:
+    """
+    A named group of cache entries sharing a default timeout and a version.
+
+    ``timeout_setting`` names the Django setting holding the default timeout
+    in seconds, ``default_timeout`` is used when it isn't set.
+    """
+
+    def __init__(self, name, timeout_setting=None, default_timeout=300):
+        """
+        Create the ``name`` namespace; see the class docstring for the timeouts.
+        """
+        self.name = name
+        self.timeout_setting = timeout_setting
+        self.default_timeout = default_timeout
+        self.version_key = f"survey_api.{name}.version"
+
+    @property
+    def timeout(self):
+        """
+        The default timeout of the namespace's entries, in seconds.
+        """
+        if self.timeout_setting is None:
+            return self.default_timeout
+        return getattr(settings, self.timeout_setting, self.default_timeout)
+
+    def version(self):
+        """
+        Return the namespace's current version, shared by every process.
+        """
+        version = local_cache.get(self.version_key)
+        if version is None:
+            version = cache.get(self.version_key)
+            if version is None:
+                cache.add(self.version_key, time.time_ns(), None)
+                version = cache.get(self.version_key) or time.time_ns()
+            local_cache.set(self.version_key, version, _local_timeout())
+        return version
+
+    def key(self, key):
+        """
+        Return the Django cache key of ``key`` under the current version.
+        """
+        if len(key) > MAX_KEY_LENGTH or not key.isprintable() or " " in key:
+            # Keep keys memcached-safe whatever ends up in them (request parameters, long joins).
+            key = hashlib.sha1(key.encode()).hexdigest()
+        return f"survey_api.{self.name}.{self.version()}.{key}"
+
+    def get(self, key):
+        """
+        Return the cached value of ``key``, or None.
+        """
+        full_key = self.key(key)
+        value = local_cache.get(full_key)
+        metrics.record_cache(self.name, value is not None, tier="local")
+        if value is None:
+            value = cache.get(full_key)
+            metrics.record_cache(self.name, value is not None)
+            if value is not None:
+                local_cache.set(full_key, value, _local_timeout())
+        return value
+
+    def set(self, key, value, timeout=None):
+        """
+        Cache ``value`` for ``timeout`` seconds (the namespace default when None); a timeout of 0 caches nothing.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if timeout <= 0:
+            return
+        full_key = self.key(key)
+        cache.set(full_key, value, timeout)
+        local_cache.set(full_key, value, min(timeout, _local_timeout()))
+
+    def delete(self, key):
+        """
+        Drop ``key`` from both tiers.
+        """
+        full_key = self.key(key)
+        cache.delete(full_key)
+        local_cache.delete(full_key)
+
+    def invalidate(self):
+        """
+        Drop every entry of the namespace, in every process.
+        """
+        version = time.time_ns()
+        cache.set(self.version_key, version, None)
+        local_cache.set(self.version_key, version, _local_timeout())
+
+    def get_or_set(self, key, loader, timeout=None, refresh=False):
+        """
+        Return the cached value of ``key``, calling ``loader()`` once to fill it when missing.
+
+        ``timeout`` may be a callable taking the loaded value, e.g. to skip
+        caching partial results by returning 0. With ``refresh`` the value is
+        loaded again even when cached.
+        """
+        if not refresh:
+            value = self.get(key)
+            if value is not None:
+                return value
+
+        full_key = self.key(key)
+        with _single_flight(full_key):
+            if not refresh:
+                # Another thread may have loaded it while we waited.
+                value = local_cache.get(full_key)
+                if value is not None:
+                    return value
+
+            lock_key = f"{full_key}.loading"
+            locked = cache.add(lock_key, True, LOAD_LOCK_TIMEOUT)
+            deadline = time.monotonic() + LOAD_LOCK_TIMEOUT
+            while not locked and not refresh and time.monotonic() < deadline:
+                # Another process is loading it; wait for its result.
+                time.sleep(POLL_INTERVAL)
+                value = cache.get(full_key)
+                if value is not None:
+                    local_cache.set(full_key, value, _local_timeout())
+                    return value
+                locked = cache.add(lock_key, True, LOAD_LOCK_TIMEOUT)
+
+            try:
+                value = loader()
+                self.set(key, value, timeout(value) if callable(timeout) else timeout)
+            finally:
+                if locked:
+                    cache.delete(lock_key)
+            return value
+
+
+def clear_local():
+    """
+    Empty the in-process tier, e.g. between tests.
+    """
+    local_cache.clear()
+
+
+GOOGLE_TOKEN = Namespace("google_token")
+FORM_META = Namespace("form_meta", "SURVEY_FORM_CACHE_TIMEOUT", 300)
+FORM_RESPONSES = Namespace("form_responses", "SURVEY_RESPONSES_CACHE_TIMEOUT", 60)
+TRANSLATIONS = Namespace("translations", "SURVEY_FORM_CACHE_TIMEOUT", 300)
+SURVEY_FORMS = Namespace("survey_forms")
+COURSE_OVERVIEW = Namespace("course_feedback_overview", "SURVEY_OVERVIEW_CACHE_TIMEOUT", 60)
+DASHBOARD = Namespace("dashboard", "SURVEY_REPORT_CACHE_TIMEOUT", 60)
+REGISTRATIONS = Namespace("registrations", "SURVEY_REPORT_CACHE_TIMEOUT", 60)
+SYNC = Namespace("sync")
@@ -0,0 +1,138 @@
+"""
+Incremental "changes since" reads for clients that keep the reports locally.
+
+A client loads the full reports once, then sends back the opaque cursor of
+its last call and only gets what changed after it:
+
+* submissions recorded in ``GoogleFormResponseModel`` since: those with an
+  id above the last one it saw (as those rows are never updated), and those
+  submitted within the time window, which catches rows whose transaction
+  committed after one with a higher id,
+* registration rows whose snapshot ``modified`` marker moved, and those
+  removed (``RegistrationRemovalModel``),
+* survey statuses whose ``SurveyModel.modified`` marker moved,
+* for the Google forms it asks for, the responses submitted since, through
+  the ``timestamp >=`` filter of ``forms.responses.list``.
+
+Time windows start ``SURVEY_CHANGES_OVERLAP`` seconds (default 5) before the
+cursor, so rows committed late with an earlier timestamp are still seen; a
+change may therefore be sent twice and clients apply changes as upserts by
+id. Changes are read from the default database, since a lagging replica
+would hide them for good. When more than ``SURVEY_CHANGES_MAX_ROWS`` rows
+(default 5000) of a kind changed, or the cursor is older than
+``SURVEY_CHANGES_RETENTION`` seconds (default 30 days, how long removals are
+kept), the answer only asks the client to reload the full reports.
+"""
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .feeds import SUBMISSION_FIELDS, decode_cursor, encode_cursor, submission_json
+from .filters import ResponseFilterError
+from .google_forms import iter_form_responses
+from .models import GoogleFormResponseModel, RegistrationRemovalModel, RegistrationSnapshotModel, SurveyModel
+
+
+def make_cursor(since, last_response_id):
+    """
+    Return a cursor resuming at ``since`` and after the ``GoogleFormResponseModel`` id ``last_response_id``.
+    """
+    return encode_cursor("changes", [since.isoformat(), last_response_id])
+
+
+def parse_cursor(cursor):
+    """
+    Return ``(since, last_response_id)`` of a cursor made by ``make_cursor``.
+    """
+    try:
+        since, last_response_id = decode_cursor("changes", cursor)
+        since = parse_datetime(since)
+        last_response_id = int(last_response_id)
+    except (TypeError, ValueError) as e:
+        raise ResponseFilterError("Invalid cursor.") from e
+    if since is None:
+        raise ResponseFilterError("Invalid cursor.")
+    return since, last_response_id
+
+
+def start_cursor():
+    """
+    Cursor for a client about to load the full reports: later changes are all after it.
+    """
+    last = GoogleFormResponseModel.objects.order_by("-id").values_list("id", flat=True).first()
+    return make_cursor(timezone.now(), last or 0)
+
+
+def collect_changes(cursor, snapshot_fields, form_ids=(), headers=None):
+    """
+    Return the changes after ``cursor`` and the cursor to send next time.
+
+    ``snapshot_fields`` are the ``RegistrationSnapshotModel`` fields read for
+    changed registration rows, and the responses of ``form_ids`` submitted since
+    are fetched from Google with ``headers``. The result holds ``cursor``,
+    ``full_refresh`` and, unless a full reload is needed, ``responses``,
+    ``registrations`` (snapshot value dicts), ``removed_registrations``,
+    ``survey_status`` and ``forms``.
+    """
+    since, last_response_id = parse_cursor(cursor)
+    now = timezone.now()
+    retention = getattr(settings, "SURVEY_CHANGES_RETENTION", 30 * 24 * 3600)
+    max_rows = getattr(settings, "SURVEY_CHANGES_MAX_ROWS", 5000)
+    window = since - timedelta(seconds=getattr(settings, "SURVEY_CHANGES_OVERLAP", 5))
+
+    def full_refresh():
+        return {"cursor": start_cursor(), "full_refresh": True}
+
+    if since < now - timedelta(seconds=retention):
+        return full_refresh()
+
+    responses = list(
+        GoogleFormResponseModel.objects.filter(Q(id__gt=last_response_id) | Q(submitted_at__gte=window))
+        .order_by("id")
+        .values(*SUBMISSION_FIELDS)[:max_rows + 1]
+    )
+    registrations = list(
+        RegistrationSnapshotModel.objects.filter(modified__gte=window)
+        .order_by("modified")
+        .values("extra_info_id", *snapshot_fields)[:max_rows + 1]
+    )
+    removed = list(
+        RegistrationRemovalModel.objects.filter(removed_at__gte=window)
+        .order_by("removed_at")
+        .values_list("extra_info_id", flat=True)[:max_rows + 1]
+    )
+    surveys = list(
+        SurveyModel.objects.filter(modified__gte=window)
+        .select_related("user")
+        .only("user__username", "times_shown", "is_completed")
+        .order_by("modified")[:max_rows + 1]
+    )
+    if max(len(responses), len(registrations), len(removed), len(surveys)) > max_rows:
+        return full_refresh()
+
+    forms = {}
+    timestamp_filter = f"timestamp >= {window.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')}"
+    for form_id in form_ids:
+        forms[form_id] = list(iter_form_responses(form_id, headers, timestamp_filter))
+
+    return {
+        "cursor": make_cursor(now, max(last_response_id, responses[-1]["id"]) if responses else last_response_id),
+        "full_refresh": False,
+        "responses": [submission_json(row) for row in responses],
+        "registrations": registrations,
+        "removed_registrations": [str(pk) for pk in removed],
+        "survey_status": [
+            {
+                "user_id": survey.user_id,
+                "username": survey.user.username,
+                "status": survey.status,
+                "count": survey.times_shown,
+            }
+            for survey in surveys
+        ],
+        "forms": forms,
+    }
@@ -0,0 +1,204 @@
+"""
+Circuit breaker for the Google APIs, with a stale-response fallback for views.
+
+The breaker state lives in the Django cache so that every worker sees the
+same state:
+
+* closed: calls go through; consecutive failures (connection errors,
+  timeouts, HTTP 429/5xx) are counted, and reaching
+  ``SURVEY_BREAKER_FAILURE_THRESHOLD`` opens the breaker;
+* open: calls fail fast with ``CircuitOpenError`` for
+  ``SURVEY_BREAKER_RESET_TIMEOUT`` seconds;
+* half-open: once the timeout has elapsed, exactly one call (the probe) is let
+  through. Its success closes the breaker, its failure opens it again.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling Google while the breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker whose state is shared through the Django cache.
+    """
+
+    def __init__(self, name):
+        """
+        Create the breaker ``name``; breakers of the same name share their state.
+        """
+        self.state_key = f"survey_api.breaker.{name}"
+        self.probe_key = f"survey_api.breaker.{name}.probe"
+
+    @property
+    def failure_threshold(self):
+        """
+        Consecutive failures that open the breaker (``SURVEY_BREAKER_FAILURE_THRESHOLD``).
+        """
+        return getattr(settings, "SURVEY_BREAKER_FAILURE_THRESHOLD", 5)
+
+    @property
+    def reset_timeout(self):
+        """
+        Seconds the breaker stays open before letting a probe through (``SURVEY_BREAKER_RESET_TIMEOUT``).
+        """
+        return getattr(settings, "SURVEY_BREAKER_RESET_TIMEOUT", 30)
+
+    def _load(self):
+        return cache.get(self.state_key) or {"failures": 0, "opened_at": None}
+
+    def state(self):
+        """
+        Return ``CLOSED``, ``OPEN`` or ``HALF_OPEN``.
+        """
+        opened_at = self._load()["opened_at"]
+        if opened_at is None:
+            return CLOSED
+        if time.time() - opened_at < self.reset_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    def before_call(self):
+        """
+        Raise ``CircuitOpenError`` unless the call may go to Google.
+        """
+        state = self.state()
+        if state == OPEN:
+            raise CircuitOpenError("Google API circuit breaker is open.")
+        # In half-open state only the caller that grabs the probe slot goes through.
+        if state == HALF_OPEN and not cache.add(self.probe_key, True, self.reset_timeout):
+            raise CircuitOpenError("Google API circuit breaker is open; a probe is in flight.")
+
+    def record_success(self):
+        """
+        Close the breaker after a successful call.
+        """
+        data = self._load()
+        if data["failures"] or data["opened_at"] is not None:
+            cache.delete_many([self.state_key, self.probe_key])
+
+    def record_failure(self):
+        """
+        Count a failed call, opening the breaker at the threshold or when a probe fails.
+        """
+        # Read-modify-write through the cache: concurrent failures may be
+        # under-counted, which only delays opening by a call or two.
+        data = self._load()
+        data["failures"] += 1
+        if data["opened_at"] is not None or data["failures"] >= self.failure_threshold:
+            data["opened_at"] = time.time()
+            cache.delete(self.probe_key)
+        cache.set(self.state_key, data, None)
+
+
+google_breaker = CircuitBreaker("google")
+
+
+def stale_key(name, request):
+    """
+    Cache key of the last good response of view ``name`` for the query string of ``request``.
+    """
+    query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    return f"survey_api.stale.{name}.{query}"
+
+
+def store_stale(key, response):
+    """
+    Keep a rendered 200 ``response`` under ``key`` for ``SURVEY_STALE_TTL`` seconds.
+
+    Bodies over ``SURVEY_STALE_MAX_BYTES`` (default 1 MB, memcached's item
+    limit) are not kept. When the body is the one already kept, only its
+    expiry and the small timestamp entry beside it are refreshed.
+    """
+    content = response.content
+    if len(content) > getattr(settings, "SURVEY_STALE_MAX_BYTES", 1024 * 1024):
+        return
+    ttl = getattr(settings, "SURVEY_STALE_TTL", 24 * 60 * 60)
+    digest = hashlib.md5(content).hexdigest()
+    stamp = cache.get(f"{key}.stamp")
+    if stamp is not None and stamp[0] == digest and cache.touch(key, ttl):
+        cache.set(f"{key}.stamp", (digest, time.time()), ttl)
+        return
+    cache.set_many({key: (content, response["Content-Type"]), f"{key}.stamp": (digest, time.time())}, ttl)
+
+
+def stale_response(key):
+    """
+    Return the response stored under ``key`` with ``Age`` and ``Warning: 110`` headers, or a 503 when there is none.
+    """
+    cached = cache.get_many([key, f"{key}.stamp"])
+    found = len(cached) == 2
+    metrics.record_cache("stale_fallback", found)
+    if not found:
+        response = HttpResponse(
+            b'{"error": "Google Forms is unavailable, please retry later."}',
+            content_type="application/json",
+            status=503,
+        )
+        response["Retry-After"] = str(google_breaker.reset_timeout)
+        return response
+
+    content, content_type = cached[key]
+    _, stored_at = cached[f"{key}.stamp"]
+    response = HttpResponse(content, content_type=content_type)
+    response["Age"] = str(int(time.time() - stored_at))
+    response["Warning"] = '110 - "Response is Stale"'
+    return response
+
+
+class StaleFallbackMixin:
+    """
+    Keep the last good response of a GET view and serve it while Google is unavailable.
+
+    Successful responses are stored per view and query string for
+    ``SURVEY_STALE_TTL`` seconds (see ``store_stale``). While the breaker is open, requests that pass
+    authentication and permission checks skip the view; they, and requests
+    that fail because the breaker just opened, get the stored copy with an
+    ``Age`` header and ``Warning: 110``, or a 503 with ``Retry-After`` when
+    there is none.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Store successful GET responses and fall back to the stored copy while Google is unavailable.
+        """
+        if request.method != "GET" or request.GET.get("profile") == "1":
+            return super().dispatch(request, *args, **kwargs)
+
+        key = stale_key(type(self).__name__, request)
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        except CircuitOpenError:
+            return stale_response(key)
+
+        if response.status_code == 200:
+            if callable(getattr(response, "render", None)) and not response.is_rendered:
+                response.render()
+            store_stale(key, response)
+        elif response.status_code >= 500 and google_breaker.state() != CLOSED:
+            return stale_response(key)
+        return response
+
+    def initial(self, request, *args, **kwargs):
+        """
+        Raise ``CircuitOpenError`` for a permitted GET while the breaker is open.
+        """
+        super().initial(request, *args, **kwargs)
+        # Fail fast once the request is authenticated and authorized, without
+        # spending a token refresh on a call that would be rejected anyway.
+        if request.method == "GET" and google_breaker.state() == OPEN:
+            raise CircuitOpenError("Google API circuit breaker is open.")
@@ -0,0 +1,122 @@
+"""
+Keyset-paginated feeds over the survey tables.
+
+Pages are read with ``WHERE (key) < (cursor) ORDER BY key DESC LIMIT n`` along
+an index instead of ``OFFSET``, so the cost of a page doesn't grow with the
+table or with how deep the client has paged. Cursors are opaque signed tokens
+holding the key of the last row returned.
+"""
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .filters import ResponseFilterError
+from .models import GoogleFormResponseModel
+from .replica import for_reports
+
+CURSOR_SALT = "survey_api.feeds"
+
+
+def encode_cursor(kind, values):
+    """
+    Return a signed cursor of ``kind`` resuming after the key ``values``.
+    """
+    return signing.dumps([kind, *values], salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(kind, cursor):
+    """
+    Return the key values of a cursor made by ``encode_cursor(kind, ...)``.
+    """
+    try:
+        decoded = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature as e:
+        raise ResponseFilterError("Invalid cursor.") from e
+    if not isinstance(decoded, list) or not decoded or decoded[0] != kind:
+        raise ResponseFilterError("Invalid cursor.")
+    return decoded[1:]
+
+
+def page_size(value=None):
+    """
+    Parse ``?limit=``, defaulting to ``SURVEY_FEED_PAGE_SIZE`` (50) and capped at ``SURVEY_FEED_MAX_PAGE_SIZE`` (500).
+    """
+    if not value:
+        return getattr(settings, "SURVEY_FEED_PAGE_SIZE", 50)
+    try:
+        limit = int(value)
+    except ValueError as e:
+        raise ResponseFilterError(f"Invalid limit: '{value}'.") from e
+    if limit < 1:
+        raise ResponseFilterError(f"Invalid limit: '{value}'.")
+    return min(limit, getattr(settings, "SURVEY_FEED_MAX_PAGE_SIZE", 500))
+
+
+SUBMISSION_FIELDS = (
+    "id", "form_id", "response_id", "submitted_at",
+    "user_id", "user__username", "user__email", "user__profile__name",
+)
+
+
+def submission_json(row):
+    """
+    Serialize a ``GoogleFormResponseModel`` row read with ``values(*SUBMISSION_FIELDS)``.
+    """
+    return {
+        "id": row["id"],
+        "form_id": row["form_id"],
+        "response_id": row["response_id"],
+        "submitted_at": row["submitted_at"].isoformat(),
+        "user": {
+            "id": row["user_id"],
+            "username": row["user__username"],
+            "email": row["user__email"],
+            "name": row["user__profile__name"],
+        },
+    }
+
+
+def submissions_page(form_id=None, submitted_after=None, submitted_before=None, cursor=None, limit=50):
+    """
+    One page of ``GoogleFormResponseModel`` rows, newest first, with their user's username, email and name.
+
+    Rows are ordered by ``(submitted_at, id)`` descending. With ``form_id`` the
+    page is a range scan of the ``(form_id, submitted_at)`` index, without it
+    of the ``(submitted_at, id)`` index. ``submitted_after`` is inclusive and
+    ``submitted_before`` exclusive. Returns ``{"results", "next"}`` where
+    ``next`` is the cursor of the following page, or None on the last one.
+    """
+    queryset = GoogleFormResponseModel.objects.all()
+    if form_id:
+        queryset = queryset.filter(form_id=form_id)
+    if submitted_after:
+        queryset = queryset.filter(submitted_at__gte=submitted_after)
+    if submitted_before:
+        queryset = queryset.filter(submitted_at__lt=submitted_before)
+
+    if cursor:
+        try:
+            last_submitted, last_id = decode_cursor("submissions", cursor)
+            last_submitted = parse_datetime(last_submitted)
+        except (TypeError, ValueError) as e:
+            raise ResponseFilterError("Invalid cursor.") from e
+        if last_submitted is None:
+            raise ResponseFilterError("Invalid cursor.")
+        queryset = queryset.filter(
+            Q(submitted_at__lt=last_submitted)
+            | Q(submitted_at=last_submitted, id__lt=last_id)
+        )
+
+    rows = list(
+        for_reports(queryset)
+        .order_by("-submitted_at", "-id")
+        .values(*SUBMISSION_FIELDS)[:limit + 1]
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor("submissions", [last["submitted_at"].isoformat(), last["id"]])
+
+    return {"results": [submission_json(row) for row in rows], "next": next_cursor}
@@ -0,0 +1,258 @@
+"""
+Server-side filtering of Google Forms responses.
+
+Filters are built from the request query parameters and applied to each raw
+response as it is streamed from Google, before any translation or
+serialization work is done for it. ``FieldSelection`` likewise prunes the
+answers and ``meta`` items a report returns while it is being built.
+"""
+from datetime import datetime, time, timezone
+
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+class ResponseFilterError(ValueError):
+    """
+    Raised when the filter query parameters are malformed.
+    """
+
+
+def parse_timestamp(value):
+    """
+    Parse an RFC 3339 timestamp or a plain ``YYYY-MM-DD`` date into an aware datetime (UTC by default).
+    """
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError(value)
+            parsed = datetime.combine(day, time.min)
+    except ValueError as e:
+        raise ResponseFilterError(f"Invalid timestamp: '{value}'.") from e
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def answer_values(ans_block):
+    """
+    Return the raw values of a Google ``Answer`` object as a list.
+    """
+    if "value" in ans_block:
+        return [ans_block["value"]]
+    if "textAnswers" in ans_block:
+        return [a.get("value") for a in ans_block["textAnswers"].get("answers", [])]
+    if "emailAnswer" in ans_block:
+        return [ans_block["emailAnswer"].get("email")]
+    return []
+
+
+class ResponseFilter:
+    """
+    Predicate over Google Forms responses.
+
+    Supported query parameters:
+
+    * ``created_after`` / ``created_before``: window on ``createTime``.
+    * ``submitted_after`` / ``submitted_before``: window on ``lastSubmittedTime``.
+    * ``question_id`` + ``answer``: exact match on one of the answers to a question.
+    * ``respondent_email``: case-insensitive match on the respondent email.
+
+    ``*_after`` bounds are inclusive and ``*_before`` bounds are exclusive.
+    """
+
+    def __init__(self, created_after=None, created_before=None, submitted_after=None,
+                 submitted_before=None, question_id=None, answer=None, respondent_email=None):
+        """
+        Create a filter from parsed values; the timestamps are aware datetimes.
+        """
+        self.created_after = created_after
+        self.created_before = created_before
+        self.submitted_after = submitted_after
+        self.submitted_before = submitted_before
+        self.question_id = question_id
+        self.answer = answer
+        self.respondent_email = respondent_email.strip().lower() if respondent_email else None
+
+    @classmethod
+    def from_query_params(cls, params):
+        """
+        Build the filter from request query parameters; raise ``ResponseFilterError`` when malformed.
+        """
+        timestamps = {}
+        for name in ("created_after", "created_before", "submitted_after", "submitted_before"):
+            value = params.get(name)
+            timestamps[name] = parse_timestamp(value) if value else None
+
+        question_id = params.get("question_id")
+        answer = params.get("answer")
+        if bool(question_id) != bool(answer):
+            raise ResponseFilterError("'question_id' and 'answer' must be given together.")
+
+        return cls(
+            question_id=question_id,
+            answer=answer,
+            respondent_email=params.get("respondent_email"),
+            **timestamps,
+        )
+
+    @property
+    def is_empty(self):
+        """
+        Whether every response matches.
+        """
+        return not any((
+            self.created_after, self.created_before, self.submitted_after,
+            self.submitted_before, self.question_id, self.respondent_email,
+        ))
+
+    def google_filter(self):
+        """
+        Return the ``filter`` expression understood by ``forms.responses.list``.
+
+        The API only supports a lower bound on the submission timestamp, so
+        everything else is evaluated locally in ``matches``.
+        """
+        if not self.submitted_after:
+            return None
+        stamp = self.submitted_after.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        return f"timestamp >= {stamp}"
+
+    def matches(self, resp, translate=None):
+        """
+        Return True when the raw response ``resp`` passes every filter.
+
+        ``translate(question_id, value)`` is applied to answer values before the
+        exact-match comparison, so callers that localize answers can match on
+        the localized label as well as on the raw one.
+        """
+        if self.is_empty:
+            return True
+
+        if self.created_after or self.created_before:
+            if not self._in_window(resp.get("createTime"), self.created_after, self.created_before):
+                return False
+
+        if self.submitted_after or self.submitted_before:
+            submitted = resp.get("lastSubmittedTime", resp.get("createTime"))
+            if not self._in_window(submitted, self.submitted_after, self.submitted_before):
+                return False
+
+        if self.question_id:
+            ans_block = resp.get("answers", {}).get(self.question_id)
+            if not ans_block:
+                return False
+            values = answer_values(ans_block)
+            if self.answer not in values:
+                if translate is None or self.answer not in [translate(self.question_id, v) for v in values]:
+                    return False
+
+        if self.respondent_email:
+            if (resp.get("respondentEmail") or "").strip().lower() != self.respondent_email:
+                return False
+
+        return True
+
+    @staticmethod
+    def _in_window(value, after, before):
+        if not value:
+            return False
+        stamp = parse_datetime(value)
+        if stamp is None:
+            return False
+        if after and stamp < after:
+            return False
+        if before and stamp >= before:
+            return False
+        return True
+
+
+def item_question_ids(item):
+    """
+    Return the question ids of a form ``meta`` item (one, several for grids, none for text/page items).
+    """
+    if "questionItem" in item:
+        qid = item["questionItem"].get("question", {}).get("questionId")
+        return [qid] if qid else []
+    if "questionGroupItem" in item:
+        return [q.get("questionId") for q in item["questionGroupItem"].get("questions", []) if q.get("questionId")]
+    return []
+
+
+class FieldSelection:
+    """
+    Sparse fieldset of a report.
+
+    Supported query parameters:
+
+    * ``fields``: comma-separated question ids; answers to other questions
+      (and their ``meta`` items) are left out.
+    * ``include_meta``: ``false`` leaves out the form ``meta`` altogether.
+    """
+
+    FALSE_VALUES = {"0", "false", "no"}
+    TRUE_VALUES = {"1", "true", "yes"}
+
+    def __init__(self, fields=None, include_meta=True):
+        """
+        Select the ``fields`` question ids, or every question when empty.
+        """
+        self.fields = frozenset(fields) if fields else None
+        self.include_meta = include_meta
+
+    @classmethod
+    def from_query_params(cls, params):
+        """
+        Build the selection from request query parameters; raise ``ResponseFilterError`` when malformed.
+        """
+        fields = [name.strip() for name in params.get("fields", "").split(",") if name.strip()]
+
+        include_meta = params.get("include_meta", "true").strip().lower()
+        if include_meta not in cls.TRUE_VALUES | cls.FALSE_VALUES:
+            raise ResponseFilterError("'include_meta' must be true or false.")
+
+        return cls(fields=fields, include_meta=include_meta in cls.TRUE_VALUES)
+
+    def wants(self, qid):
+        """
+        Whether answers to question ``qid`` are selected.
+        """
+        return self.fields is None or qid in self.fields
+
+    def items(self, items):
+        """
+        Return the form ``items`` asking a selected question.
+        """
+        if self.fields is None:
+            return items
+        return [item for item in items if any(self.wants(qid) for qid in item_question_ids(item))]
+
+    def meta(self, meta):
+        """
+        Return ``meta`` with only the selected items, or None when it is not wanted.
+        """
+        if not self.include_meta:
+            return None
+        if self.fields is None:
+            return meta
+        return {**meta, "items": self.items(meta.get("items", []))}
+
+    def response(self, resp):
+        """
+        Return the raw response ``resp`` with only the selected answers.
+        """
+        if self.fields is None:
+            return resp
+        answers = {qid: ans for qid, ans in resp.get("answers", {}).items() if qid in self.fields}
+        return {**resp, "answers": answers}
+
+    def payload(self, meta, **data):
+        """
+        Build a report body, adding the (pruned) ``meta`` unless it was excluded.
+        """
+        meta = self.meta(meta)
+        if meta is not None:
+            data["meta"] = meta
+        return data
@@ -0,0 +1,146 @@
+"""
+Compact, columnar encoding of form reports.
+
+Requested with ``?format=columnar`` on the report endpoints. Instead of the
+Google shape (every answer wrapped in ``{"questionId", "textAnswers":
+{"answers": [{"value"}]}}``) the payload lists the questions once and then
+one positional row per response::
+
+    {
+        "format": "columnar",
+        "questions": [{"questionId": "q1", "title": "Role", "options": ["Student", "Teacher"], "multiple": false}],
+        "columns": ["responseId", "createTime", "lastSubmittedTime", "respondentEmail", "q1"],
+        "rows": [["r1", "2025-...", "2025-...", null, 1]]
+    }
+
+A cell holds the single answer of a question, a list for checkbox questions,
+or ``null`` when unanswered. Answers to questions with options are encoded as
+their index in ``options``; values outside the list (e.g. "Other") are kept
+as strings.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from .filters import answer_values, item_question_ids
+
+COLUMNAR = "columnar"
+
+HEAD_COLUMNS = ["responseId", "createTime", "lastSubmittedTime", "respondentEmail"]
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Plain JSON renderer selected by ``?format=columnar``; views check ``wants_columnar`` to build the compact shape.
+    """
+
+    format = COLUMNAR
+
+
+REPORT_RENDERER_CLASSES = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+
+
+def wants_columnar(request):
+    """
+    Whether content negotiation picked the columnar format for ``request``.
+    """
+    return getattr(getattr(request, "accepted_renderer", None), "format", None) == COLUMNAR
+
+
+class ColumnarEncoder:
+    """
+    Turns responses into positional rows for the questions of ``items`` (form ``meta["items"]``).
+
+    Every row of a grid (``questionGroupItem``) is a question of its own,
+    titled ``"Grid title [Row title]"`` as in Google's spreadsheet export, with
+    the grid columns as its options.
+    """
+
+    def __init__(self, items):
+        """
+        Describe the questions of ``items``, numbered after the head columns.
+        """
+        self.questions = []
+        self.position = {}
+        self.codes = {}
+        for item in items:
+            for qid in item_question_ids(item):
+                title, options, multiple = self._describe(item, qid)
+                self.position[qid] = len(HEAD_COLUMNS) + len(self.questions)
+                self.questions.append({
+                    "questionId": qid,
+                    "title": title,
+                    "options": options or None,
+                    "multiple": multiple,
+                })
+                if options:
+                    self.codes[qid] = {value: index for index, value in enumerate(options)}
+
+    @staticmethod
+    def _describe(item, qid):
+        """
+        Return ``(title, option values, whether several may be picked)`` of question ``qid`` of ``item``.
+        """
+        title = item.get("title", "")
+        if "questionGroupItem" in item:
+            group = item["questionGroupItem"]
+            columns = group.get("grid", {}).get("columns", {})
+            row = next(q for q in group.get("questions", []) if q.get("questionId") == qid)
+            row_title = row.get("rowQuestion", {}).get("title", "")
+            options = [option.get("value") for option in columns.get("options", [])]
+            return f"{title} [{row_title}]", options, columns.get("type") == "CHECKBOX"
+
+        question = item["questionItem"]["question"]
+        choices = question.get("checkboxQuestion") or question.get("choiceQuestion") or {}
+        options = [option.get("value") for option in choices.get("options", [])]
+        return title, options, "checkboxQuestion" in question
+
+    @property
+    def columns(self):
+        """
+        The head columns followed by the question ids, in row order.
+        """
+        return HEAD_COLUMNS + [question["questionId"] for question in self.questions]
+
+    def row(self, head, values_by_qid):
+        """
+        Build a row from the head values and ``{questionId: [raw values]}``.
+        """
+        row = list(head) + [None] * len(self.questions)
+        for qid, values in values_by_qid.items():
+            position = self.position.get(qid)
+            if position is None:
+                continue
+            codes = self.codes.get(qid)
+            if codes:
+                values = [codes.get(value, value) for value in values]
+            if self.questions[position - len(HEAD_COLUMNS)]["multiple"]:
+                row[position] = values
+            elif values:
+                row[position] = values[0] if len(values) == 1 else values
+        return row
+
+    def encode(self, resp, translate=None):
+        """
+        Encode a Google-shaped response, optionally passing each answer through ``translate(qid, value)``.
+        """
+        values_by_qid = {}
+        for qid, ans_block in resp.get("answers", {}).items():
+            if qid not in self.position:
+                continue
+            values = answer_values(ans_block)
+            if translate is not None:
+                values = [translate(qid, value) for value in values]
+            values_by_qid[qid] = values
+        head = (
+            resp.get("responseId"),
+            resp.get("createTime"),
+            resp.get("lastSubmittedTime", resp.get("createTime")),
+            resp.get("respondentEmail"),
+        )
+        return self.row(head, values_by_qid)
+
+    def payload(self, rows, **extra):
+        """
+        Return the columnar report of ``rows``, with the question descriptions and ``extra`` keys.
+        """
+        return {"format": COLUMNAR, "questions": self.questions, "columns": self.columns, "rows": rows, **extra}
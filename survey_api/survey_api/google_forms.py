@@ -0,0 +1,232 @@
+"""
+Thin helpers around the Google Forms REST API.
+
+The access token, form metadata and full response lists are cached in the
+``caching`` namespaces (see ``get_access_token``, ``get_form`` and
+``get_form_responses``), so reports reuse them across requests and workers.
+The ``warm_survey_cache`` management command fills these caches ahead of time.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+from google.auth.transport.requests import Request
+from google.oauth2 import service_account
+
+from . import metrics
+from .caching import FORM_META, FORM_RESPONSES, GOOGLE_TOKEN
+from .circuit_breaker import google_breaker
+from .rate_limit import RateLimitExceeded, google_bucket, keep_priority
+from .timing import phase
+
+FORMS_API_URL = "https://forms.googleapis.com/v1/forms"
+
+SCOPES = [
+    "https://www.googleapis.com/auth/forms.responses.readonly",
+    "https://www.googleapis.com/auth/forms.body.readonly",
+    "https://www.googleapis.com/auth/drive.file",
+    "https://www.googleapis.com/auth/drive",
+    "openid",
+    "profile",
+    "email",
+]
+
+
+# Refresh the cached token this many seconds before Google expires it.
+TOKEN_EXPIRY_MARGIN = 300
+
+
+def _refresh_token():
+    """
+    Ask Google for a new service account access token; return ``(token, seconds it can be cached)``.
+    """
+    credentials = service_account.Credentials.from_service_account_info(
+        settings.SERVICE_ACCOUNT_INFO, scopes=SCOPES
+    )
+
+    google_breaker.before_call()
+    start = time.perf_counter()
+    try:
+        with phase("token"):
+            credentials.refresh(Request())
+    except Exception:
+        metrics.record_google_call("oauth2.token", "error", time.perf_counter() - start)
+        google_breaker.record_failure()
+        raise
+    metrics.record_google_call("oauth2.token", 200, time.perf_counter() - start)
+    google_breaker.record_success()
+    metrics.TOKEN_REFRESHES.inc()
+    lifetime = 0
+    if credentials.expiry is not None:
+        lifetime = (credentials.expiry - datetime.utcnow()).total_seconds() - TOKEN_EXPIRY_MARGIN
+    return credentials.token, lifetime
+
+
+def get_access_token(refresh=False):
+    """
+    Return a service account access token, refreshing it only when the cached one is about to expire.
+    """
+    token, _ = GOOGLE_TOKEN.get_or_set("token", _refresh_token, timeout=lambda value: value[1], refresh=refresh)
+    return token
+
+
+def google_timeout():
+    """
+    Seconds to wait for Google before giving up on a call (``SURVEY_GOOGLE_TIMEOUT``).
+    """
+    return getattr(settings, "SURVEY_GOOGLE_TIMEOUT", 10)
+
+
+def _before_request():
+    google_breaker.before_call()
+    google_bucket.acquire()
+
+
+def _after_response(endpoint, status_code, retry_after, seconds):
+    """
+    Record a Google answer, updating the breaker and the bucket; raise ``RateLimitExceeded`` on 429.
+    """
+    metrics.record_google_call(endpoint, status_code, seconds)
+    if status_code == 429 or status_code >= 500:
+        google_breaker.record_failure()
+    else:
+        google_breaker.record_success()
+    if status_code == 429:
+        # Our budget is out of sync with Google's; stop every worker for a while.
+        retry_after = int(retry_after or 60)
+        google_bucket.drain(retry_after)
+        raise RateLimitExceeded(wait=retry_after)
+
+
+def _after_error(endpoint, seconds):
+    metrics.record_google_call(endpoint, "error", seconds)
+    google_breaker.record_failure()
+
+
+def _get(endpoint, url, headers, params=None):
+    """
+    GET a Google Forms API url, record it under ``endpoint`` and return the decoded JSON body.
+
+    Raises ``CircuitOpenError`` without calling Google while the breaker is
+    open, and ``RateLimitExceeded`` when the shared quota is exhausted.
+    """
+    _before_request()
+    start = time.perf_counter()
+    try:
+        with phase("google_meta" if endpoint == "forms.get" else "google_responses"):
+            resp = requests.get(url, headers=headers, params=params, timeout=google_timeout())
+            body = resp.json() if resp.ok else None
+    except requests.exceptions.RequestException:
+        _after_error(endpoint, time.perf_counter() - start)
+        raise
+    _after_response(endpoint, resp.status_code, resp.headers.get("Retry-After"), time.perf_counter() - start)
+    resp.raise_for_status()
+    return body
+
+
+def forms_api_url():
+    """
+    Return the base url of the Forms API; ``SURVEY_FORMS_API_URL`` points it at a local stand-in for benchmarks.
+    """
+    return getattr(settings, "SURVEY_FORMS_API_URL", FORMS_API_URL)
+
+
+def get_form(form_id, headers, refresh=False):
+    """
+    Fetch the form metadata (title, items, questions), cached for ``SURVEY_FORM_CACHE_TIMEOUT`` seconds.
+    """
+    return FORM_META.get_or_set(
+        form_id, lambda: _get("forms.get", f"{forms_api_url()}/{form_id}", headers), refresh=refresh
+    )
+
+
+def get_form_response(form_id, response_id, headers):
+    """
+    Fetch a single response of a form.
+    """
+    return _get("forms.responses.get", f"{forms_api_url()}/{form_id}/responses/{response_id}", headers)
+
+
+def iter_form_responses(form_id, headers, timestamp_filter=None):
+    """
+    Yield the responses of a form one by one, following ``nextPageToken``.
+
+    ``timestamp_filter`` is passed through as the ``filter`` query parameter
+    (e.g. ``timestamp >= 2025-01-01T00:00:00Z``) so that Google only returns
+    responses submitted in the requested window.
+    """
+    params = {}
+    if timestamp_filter:
+        params["filter"] = timestamp_filter
+
+    while True:
+        data = _get("forms.responses.list", f"{forms_api_url()}/{form_id}/responses", headers, params)
+        yield from data.get("responses", [])
+
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            return
+        params["pageToken"] = page_token
+
+
+def submitted_time(resp):
+    """
+    Google timestamp of a response's last submission (its creation when never edited), or "".
+    """
+    return resp.get("lastSubmittedTime", resp.get("createTime")) or ""
+
+
+def latest_submitted(responses, since=None):
+    """
+    Return the latest ``submitted_time`` of ``responses``, or ``since`` when it is later or none has one.
+    """
+    latest = since
+    for resp in responses:
+        stamp = submitted_time(resp)
+        if stamp and (latest is None or parse_datetime(stamp) > parse_datetime(latest)):
+            latest = stamp
+    return latest
+
+
+def get_form_responses(form_id, headers, refresh=False):
+    """
+    Return every response of a form as a list, cached for ``SURVEY_RESPONSES_CACHE_TIMEOUT`` seconds.
+
+    New submissions show up once the cached list expires (or is refreshed by
+    ``warm_survey_cache``); callers that need a time window should stream
+    ``iter_form_responses`` with a timestamp filter instead.
+    """
+    return FORM_RESPONSES.get_or_set(
+        form_id, lambda: list(iter_form_responses(form_id, headers)), refresh=refresh
+    )
+
+
+def cache_form_responses(form_id, responses, timeout=None):
+    """
+    Store the full response list of a form for ``get_form_responses``.
+    """
+    FORM_RESPONSES.set(form_id, responses, timeout)
+
+
+def fetch_forms(form_ids, headers, timestamp_filter=None):
+    """
+    Fetch the metadata and responses of several forms concurrently; return ``[(meta, responses)]`` in order.
+
+    Up to ``SURVEY_FORMS_MAX_WORKERS`` forms are fetched at once, so adding a
+    language variant to a survey doesn't add its latency to the report's.
+    """
+    def fetch(form_id):
+        meta = get_form(form_id, headers)
+        if timestamp_filter:
+            return meta, list(iter_form_responses(form_id, headers, timestamp_filter))
+        return meta, get_form_responses(form_id, headers)
+
+    with phase("google_responses"):
+        if len(form_ids) <= 1:
+            return [fetch(form_id) for form_id in form_ids]
+        max_workers = min(len(form_ids), getattr(settings, "SURVEY_FORMS_MAX_WORKERS", 4))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(keep_priority(fetch), form_ids))
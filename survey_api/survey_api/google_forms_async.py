@@ -0,0 +1,130 @@
+"""
+Async counterparts of the ``google_forms`` helpers, used by ``async_views``.
+
+Built on ``httpx`` (``pip install survey_api[async]``). Every event loop gets
+one pooled ``AsyncClient`` (``SURVEY_GOOGLE_MAX_CONNECTIONS`` connections), so
+concurrent calls reuse keep-alive connections to Google. The circuit breaker,
+rate limiter, metrics and the ``FORM_META`` and ``FORM_RESPONSES`` caches are
+shared with the synchronous helpers; their cache I/O, and the token refresh,
+run in worker threads.
+"""
+import asyncio
+import time
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from .caching import FORM_META, FORM_RESPONSES
+from .google_forms import (
+    _after_error,
+    _after_response,
+    _before_request,
+    forms_api_url,
+    get_access_token,
+    google_timeout,
+)
+
+ENABLED = httpx is not None
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    """
+    Return the pooled ``httpx.AsyncClient`` of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        max_connections = getattr(settings, "SURVEY_GOOGLE_MAX_CONNECTIONS", 20)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=google_timeout(),
+        )
+        _clients[loop] = client
+    return client
+
+
+aget_access_token = sync_to_async(get_access_token, thread_sensitive=False)
+_abefore_request = sync_to_async(_before_request, thread_sensitive=False)
+_aafter_response = sync_to_async(_after_response, thread_sensitive=False)
+_aafter_error = sync_to_async(_after_error, thread_sensitive=False)
+
+
+async def _aget(endpoint, url, headers, params=None):
+    """
+    Async ``google_forms._get``: raises ``CircuitOpenError``, ``RateLimitExceeded`` or ``httpx.HTTPError``.
+    """
+    await _abefore_request()
+    start = time.perf_counter()
+    try:
+        resp = await get_client().get(url, headers=headers, params=params)
+    except httpx.TransportError:
+        await _aafter_error(endpoint, time.perf_counter() - start)
+        raise
+    await _aafter_response(endpoint, resp.status_code, resp.headers.get("Retry-After"), time.perf_counter() - start)
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def _acached(namespace, key, aload, refresh=False):
+    """
+    ``Namespace.get_or_set`` for a coroutine loader.
+
+    Unlike the synchronous version, concurrent misses of a key all call Google.
+    """
+    if not refresh:
+        value = await sync_to_async(namespace.get, thread_sensitive=False)(key)
+        if value is not None:
+            return value
+    value = await aload()
+    await sync_to_async(namespace.set, thread_sensitive=False)(key, value)
+    return value
+
+
+async def aget_form(form_id, headers, refresh=False):
+    """
+    Async ``google_forms.get_form``, sharing its ``FORM_META`` cache.
+    """
+    return await _acached(
+        FORM_META, form_id, lambda: _aget("forms.get", f"{forms_api_url()}/{form_id}", headers), refresh
+    )
+
+
+async def aget_form_response(form_id, response_id, headers):
+    """
+    Async ``google_forms.get_form_response``.
+    """
+    return await _aget("forms.responses.get", f"{forms_api_url()}/{form_id}/responses/{response_id}", headers)
+
+
+async def alist_form_responses(form_id, headers, timestamp_filter=None):
+    """
+    Return every response of a form, following ``nextPageToken``.
+    """
+    params = {}
+    if timestamp_filter:
+        params["filter"] = timestamp_filter
+
+    responses = []
+    while True:
+        data = await _aget("forms.responses.list", f"{forms_api_url()}/{form_id}/responses", headers, params)
+        responses.extend(data.get("responses", []))
+
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            return responses
+        params["pageToken"] = page_token
+
+
+async def aget_form_responses(form_id, headers, refresh=False):
+    """
+    Async ``google_forms.get_form_responses``, sharing its ``FORM_RESPONSES`` cache.
+    """
+    return await _acached(FORM_RESPONSES, form_id, lambda: alist_form_responses(form_id, headers), refresh)
@@ -0,0 +1,44 @@
+"""
+Rebuild the denormalized registration report rows from ExtraInfo, User and UserProfile.
+"""
+from django.core.management.base import BaseCommand
+
+from survey_api.caching import REGISTRATIONS
+from survey_api.models import RegistrationSnapshotModel
+
+
+class Command(BaseCommand):
+    """
+    Rebuild ``RegistrationSnapshotModel`` in batches, e.g. after installing or after a bulk user import.
+
+    Signals keep the snapshots current afterwards. Example:
+
+        ./manage.py lms rebuild_registration_snapshots --batch-size 2000
+    """
+
+    help = "Rebuild the registration report snapshot of every learner, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="ExtraInfo rows read and written per transaction (default 1000).",
+        )
+        parser.add_argument(
+            "--if-empty",
+            action="store_true",
+            help="Do nothing when snapshots already exist, e.g. on every deploy.",
+        )
+
+    def handle(self, *args, **options):
+        if options["if_empty"] and RegistrationSnapshotModel.objects.exists():
+            self.stdout.write("Registration snapshots already built.")
+            return
+
+        def on_batch(written, last_pk):
+            self.stdout.write(f"  {written} snapshot(s) written, up to ExtraInfo {last_pk}")
+
+        total = RegistrationSnapshotModel.objects.rebuild(options["batch_size"], on_batch)
+        REGISTRATIONS.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} registration snapshot(s)."))
@@ -0,0 +1,79 @@
+"""
+Insert the GoogleFormResponseModel rows of course feedback submissions the webhook missed.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from requests.exceptions import RequestException
+
+from survey_api.circuit_breaker import CircuitOpenError
+from survey_api.google_forms import get_access_token
+from survey_api.rate_limit import BACKGROUND, RateLimitExceeded, priority
+from survey_api.reconcile import course_form_ids, reconcile_form
+
+GOOGLE_ERRORS = (RequestException, CircuitOpenError, RateLimitExceeded)
+
+
+class Command(BaseCommand):
+    """
+    Match the responses of every course feedback form to users by email and record the missing ones.
+
+    Each form resumes from its checkpoint, saved after every batch. Example:
+
+        ./manage.py lms reconcile_form_responses --batch-size 1000
+        ./manage.py lms reconcile_form_responses --full   # also retry learners who registered since
+    """
+
+    help = (
+        "Stream the responses of every course feedback form from Google and insert the "
+        "GoogleFormResponseModel rows missing for respondents with a matching user email."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--form-id",
+            action="append",
+            dest="form_ids",
+            help="Only reconcile this form (can be repeated). Defaults to every course feedback form.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Responses matched and inserted per batch (default 500).",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignore the checkpoints and stream every response again.",
+        )
+
+    def handle(self, *args, **options):
+        form_ids = options["form_ids"] or course_form_ids()
+        failures = inserted = 0
+
+        # Reconciliation must never take quota from admins viewing reports.
+        with priority(BACKGROUND):
+            try:
+                headers = {"Authorization": f"Bearer {get_access_token()}"}
+            except Exception as e:
+                raise CommandError(f"Could not get a Google access token: {e}") from e
+
+            for form_id in form_ids:
+
+                def on_batch(seen, inserted, unmatched, form_id=form_id):
+                    self.stdout.write(f"  {form_id}: {seen} seen, {inserted} inserted, {unmatched} unmatched")
+
+                try:
+                    totals = reconcile_form(form_id, headers, options["batch_size"], options["full"], on_batch)
+                except GOOGLE_ERRORS as e:
+                    failures += 1
+                    self.stderr.write(f"{form_id}: {e}")
+                    continue
+                inserted += totals["inserted"]
+                self.stdout.write(
+                    f"{form_id}: {totals['seen']} response(s) seen, {totals['inserted']} inserted, "
+                    f"{totals['unmatched']} without a matching user."
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {len(form_ids)} form(s), {inserted} row(s) inserted."))
+        if failures:
+            raise CommandError(f"{failures} form(s) failed.")
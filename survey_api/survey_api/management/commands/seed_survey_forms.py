@@ -0,0 +1,25 @@
+"""
+Copy the ``SURVEY_FORMS`` setting into the admin-editable survey form registry.
+"""
+from django.core.management.base import BaseCommand
+
+from survey_api.registry import seed_survey_forms
+
+
+class Command(BaseCommand):
+    """
+    Create the survey language variants of ``SURVEY_FORMS`` that aren't registered yet.
+
+    Variants already in the table are left as edited in the admin, so the
+    command is safe to run on every deploy.
+
+    Example:
+
+        ./manage.py lms seed_survey_forms
+    """
+
+    help = "Register the survey language variants of the SURVEY_FORMS setting."
+
+    def handle(self, *args, **options):
+        created = seed_survey_forms()
+        self.stdout.write(self.style.SUCCESS(f"Registered {created} survey form(s)."))
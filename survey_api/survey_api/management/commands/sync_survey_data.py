@@ -0,0 +1,71 @@
+"""
+Keep the survey_api caches in sync with Google Forms.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from survey_api.sync import sync_interval, sync_max_interval, sync_once
+
+
+class Command(BaseCommand):
+    """
+    Pull new submissions of every known form at a fixed interval, backing off while nothing changes.
+
+    Example:
+
+        ./manage.py lms sync_survey_data
+        ./manage.py lms sync_survey_data --once   # single pass, e.g. from cron
+    """
+
+    help = (
+        "Periodically pull new Google Forms submissions into the survey_api caches. "
+        "Runs every SURVEY_SYNC_INTERVAL seconds, doubling the delay up to "
+        "SURVEY_SYNC_MAX_INTERVAL while no form changes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run a single pass and exit.")
+        parser.add_argument("--interval", type=float, help="Seconds between passes (SURVEY_SYNC_INTERVAL).")
+        parser.add_argument(
+            "--max-interval", type=float, help="Longest back-off between passes (SURVEY_SYNC_MAX_INTERVAL)."
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"] or sync_interval()
+        max_interval = max(options["max_interval"] or sync_max_interval(), interval)
+        delay = interval
+
+        while True:
+            changed = self.run_pass()
+            if options["once"]:
+                return
+            delay = interval if changed else min(delay * 2, max_interval)
+            self.stdout.write(f"Next pass in {delay:.0f} s.")
+            time.sleep(delay)
+
+    def run_pass(self):
+        """
+        Sync every form once and return whether anything changed.
+        """
+        start = time.perf_counter()
+        try:
+            results = sync_once()
+        except Exception as e:  # pylint: disable=broad-except
+            # Token or database errors: keep the process alive and back off.
+            self.stderr.write(f"{timezone.now().isoformat()} sync failed: {e}")
+            return False
+
+        changed = 0
+        for form_id, result in results.items():
+            if isinstance(result, Exception):
+                self.stderr.write(f"{form_id}: {result}")
+            else:
+                changed += result
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stdout.write(
+            f"{timezone.now().isoformat()} synced {len(results)} form(s) in {elapsed:.0f} ms, "
+            f"{changed} new or updated response(s)."
+        )
+        return bool(changed)
@@ -0,0 +1,101 @@
+"""
+Pre-fetch the Google Forms data behind the survey reports into the cache.
+"""
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from requests.exceptions import RequestException
+
+from survey_api.circuit_breaker import CircuitOpenError
+from survey_api.google_forms import get_access_token, get_form, get_form_responses
+from survey_api.rate_limit import BACKGROUND, RateLimitExceeded, priority
+from survey_api.registry import get_registry
+from survey_api.sync import known_form_ids
+from survey_api.views import CourseFeedbackOverviewView, FormResponses
+
+GOOGLE_ERRORS = (RequestException, CircuitOpenError, RateLimitExceeded)
+
+
+class Command(BaseCommand):
+    """
+    Fill the token, form metadata, response, translation and course overview caches, e.g. after a deploy.
+
+    Example:
+
+        ./manage.py lms warm_survey_cache
+    """
+
+    help = (
+        "Fetch the onboarding forms and every course feedback form from Google "
+        "into the survey_api caches, and report how long each step took."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--form-id",
+            action="append",
+            dest="form_ids",
+            help="Only warm this form (can be repeated). Defaults to every known form.",
+        )
+        parser.add_argument(
+            "--skip-overview",
+            action="store_true",
+            help="Don't rebuild the course feedback overview.",
+        )
+
+    def handle(self, *args, **options):
+        form_ids = options["form_ids"] or known_form_ids()
+        metas = {}
+        failures = 0
+        started = time.perf_counter()
+
+        # Warm-up calls must never take quota from admins viewing reports.
+        with priority(BACKGROUND):
+            try:
+                with self.timed("token"):
+                    headers = {"Authorization": f"Bearer {get_access_token()}"}
+            except Exception as e:
+                raise CommandError(f"Could not get a Google access token: {e}") from e
+
+            for form_id in form_ids:
+                try:
+                    with self.timed(f"{form_id} metadata"):
+                        metas[form_id] = get_form(form_id, headers, refresh=True)
+                    with self.timed(f"{form_id} responses") as detail:
+                        detail["responses"] = len(get_form_responses(form_id, headers, refresh=True))
+                except GOOGLE_ERRORS as e:
+                    failures += 1
+                    self.stderr.write(f"{form_id}: {e}")
+
+            for survey, variants in get_registry().items():
+                # Only surveys whose every variant was just fetched; the table is keyed on their revisions.
+                if variants and all(variant.form_id in metas for variant in variants):
+                    with self.timed(f"{survey} translations") as detail:
+                        forms = [(variant, metas[variant.form_id], None) for variant in variants]
+                        options_by_question, _ = FormResponses().get_translation_table(forms, refresh=True)
+                        detail["questions"] = len(options_by_question)
+
+            if not options["skip_overview"]:
+                try:
+                    with self.timed("course feedback overview") as detail:
+                        detail["courses"] = len(CourseFeedbackOverviewView().get_courses(refresh=True))
+                except GOOGLE_ERRORS as e:
+                    failures += 1
+                    self.stderr.write(f"course feedback overview: {e}")
+
+        self.stdout.write(f"Warmed {len(form_ids)} form(s) in {(time.perf_counter() - started) * 1000:.0f} ms.")
+        if failures:
+            raise CommandError(f"{failures} step(s) failed.")
+
+    @contextmanager
+    def timed(self, label):
+        """
+        Print ``label`` with the time spent in the block and the details it sets on the yielded dict.
+        """
+        detail = {}
+        start = time.perf_counter()
+        yield detail
+        elapsed = (time.perf_counter() - start) * 1000
+        extra = "".join(f"  {key}={value}" for key, value in detail.items())
+        self.stdout.write(f"{label:<60} {elapsed:9.1f} ms{extra}")
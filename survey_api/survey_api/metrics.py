@@ -0,0 +1,147 @@
+"""
+Prometheus metrics for survey_api.
+
+``prometheus_client`` is optional. When it is not installed every metric is
+the same no-op object and ``MetricsViewMixin`` skips its bookkeeping, so the
+instrumentation costs nothing.
+"""
+import os
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+ENABLED = prometheus_client is not None
+
+
+class _NoOpMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def observe(self, amount):
+        pass
+
+
+if ENABLED:
+    VIEW_LATENCY = prometheus_client.Histogram(
+        "survey_api_view_latency_seconds",
+        "Time spent in survey_api views.",
+        ["view", "method"],
+    )
+    VIEW_DB_QUERIES = prometheus_client.Histogram(
+        "survey_api_view_db_queries",
+        "Number of database queries issued per survey_api request.",
+        ["view", "method"],
+        buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000),
+    )
+    GOOGLE_REQUESTS = prometheus_client.Counter(
+        "survey_api_google_requests_total",
+        "Calls made to Google APIs, by endpoint and HTTP status.",
+        ["endpoint", "status"],
+    )
+    GOOGLE_LATENCY = prometheus_client.Histogram(
+        "survey_api_google_request_seconds",
+        "Latency of calls made to Google APIs.",
+        ["endpoint"],
+    )
+    TOKEN_REFRESHES = prometheus_client.Counter(
+        "survey_api_token_refreshes_total",
+        "Service account access token refreshes.",
+    )
+    GOOGLE_RATE_LIMITED = prometheus_client.Counter(
+        "survey_api_google_rate_limited_total",
+        "Google Forms calls held back by the shared rate limiter, by priority and outcome (waited/rejected).",
+        ["priority", "outcome"],
+    )
+    CACHE_REQUESTS = prometheus_client.Counter(
+        "survey_api_cache_requests_total",
+        "Cache lookups made by survey_api, by cache name, tier (local/shared) and result (hit/miss).",
+        ["cache", "tier", "result"],
+    )
+else:
+    VIEW_LATENCY = VIEW_DB_QUERIES = GOOGLE_REQUESTS = GOOGLE_LATENCY = TOKEN_REFRESHES = _NoOpMetric()
+    GOOGLE_RATE_LIMITED = CACHE_REQUESTS = _NoOpMetric()
+
+
+def record_google_call(endpoint, status, seconds):
+    """
+    Record one call to a Google API. ``status`` is the HTTP status code, or "error" when no response was received.
+    """
+    GOOGLE_REQUESTS.labels(endpoint=endpoint, status=str(status)).inc()
+    GOOGLE_LATENCY.labels(endpoint=endpoint).observe(seconds)
+
+
+def record_cache(cache_name, hit, tier="shared"):
+    """
+    Count a lookup of ``cache_name`` in ``tier`` as a hit or a miss.
+    """
+    CACHE_REQUESTS.labels(cache=cache_name, tier=tier, result="hit" if hit else "miss").inc()
+
+
+def render_latest():
+    """
+    Return ``(body, content_type)`` in the Prometheus text exposition format.
+
+    Honors ``PROMETHEUS_MULTIPROC_DIR`` so that metrics from every gunicorn
+    worker are aggregated.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess  # pylint: disable=import-outside-toplevel
+
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+class QueryCounter:
+    """
+    ``connection.execute_wrapper`` hook that counts executed queries.
+    """
+
+    def __init__(self):
+        """
+        Start counting at zero.
+        """
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Count the query and run it.
+        """
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsViewMixin:
+    """
+    Record latency and DB query count for every request handled by the view.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Handle the request, recording its latency and query count when metrics are enabled.
+        """
+        if not ENABLED:
+            return super().dispatch(request, *args, **kwargs)
+
+        queries = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(queries))
+            response = super().dispatch(request, *args, **kwargs)
+
+        labels = {"view": type(self).__name__, "method": request.method}
+        VIEW_LATENCY.labels(**labels).observe(time.perf_counter() - start)
+        VIEW_DB_QUERIES.labels(**labels).observe(queries.count)
+        return response
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.19 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0002_coursefeedbackmodel_googleformresponsemodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SurveyFormModel',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('survey', models.CharField(default='onboarding', help_text='Logical survey this form is a language variant of.', max_length=64)),
+                ('locale', models.CharField(help_text="Language of this variant, as passed in ?language= (e.g. 'en', 'fr-ca').", max_length=16)),
+                ('form_id', models.CharField(help_text='The {formId} you need when calling GET /forms/{formId}/responses.', max_length=128)),
+                ('email_question', models.CharField(default='Email address', help_text="Title of the question holding the respondent's email in this variant.", max_length=255)),
+                ('position', models.PositiveIntegerField(default=0, help_text='Variants are listed in this order; the first one is the default language.')),
+            ],
+            options={
+                'ordering': ('survey', 'position', 'id'),
+                'unique_together': {('survey', 'locale')},
+            },
+        ),
+    ]
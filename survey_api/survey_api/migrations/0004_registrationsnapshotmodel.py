@@ -0,0 +1,35 @@
+# Generated by Django 4.2.19 on 2026-10-19 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acl_extra_reg_fields', '__first__'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('survey_api', '0003_surveyformmodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationSnapshotModel',
+            fields=[
+                ('extra_info', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='acl_extra_reg_fields.extrainfo')),
+                ('name', models.CharField(blank=True, max_length=255)),
+                ('username', models.CharField(blank=True, db_index=True, max_length=150)),
+                ('email', models.CharField(blank=True, max_length=254)),
+                ('date_joined', models.DateTimeField(null=True)),
+                ('year_of_birth', models.IntegerField(null=True)),
+                ('gender', models.CharField(max_length=255, null=True)),
+                ('preferred_language', models.CharField(blank=True, max_length=255)),
+                ('referrer', models.CharField(blank=True, max_length=255)),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('extra_info',),
+            },
+        ),
+    ]
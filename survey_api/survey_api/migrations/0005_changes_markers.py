@@ -0,0 +1,33 @@
+# Generated by Django 4.2.19 on 2026-10-19 12:00
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0004_registrationsnapshotmodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='surveymodel',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='registrationsnapshotmodel',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.CreateModel(
+            name='RegistrationRemovalModel',
+            fields=[
+                ('extra_info_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('removed_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0005_changes_markers'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='googleformresponsemodel',
+            index=models.Index(fields=['submitted_at', 'id'], name='survey_api__submitt_f84607_idx'),
+        ),
+    ]
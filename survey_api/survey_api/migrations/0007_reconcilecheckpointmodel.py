@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0006_googleformresponsemodel_submitted_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReconcileCheckpointModel',
+            fields=[
+                ('form_id', models.CharField(max_length=128, primary_key=True, serialize=False)),
+                ('since', models.CharField(blank=True, help_text='Google timestamp the current run streams responses from; empty for all of them.', max_length=40, null=True)),
+                ('reconciled', models.PositiveIntegerField(default=0, help_text='Responses of the current run already reconciled.')),
+                ('latest', models.CharField(blank=True, help_text='Latest Google submission time reconciled.', max_length=40, null=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -1,7 +1,20 @@
-from django.db import models
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 from django.contrib.auth.models import User
 
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.djangoapps.user_api.accounts.signals import USER_RETIRE_LMS_CRITICAL
+from common.djangoapps.student.models.user import UserProfile
+
+from acl_extra_reg_fields.models import ExtraInfo
+
+from .caching import COURSE_OVERVIEW, DASHBOARD, REGISTRATIONS, SURVEY_FORMS, SYNC
 
 class SurveyModel(models.Model):
     STATUS_SHOW      = "show"
@@ -11,6 +24,8 @@ class SurveyModel(models.Model):
     user         = models.OneToOneField(User, on_delete=models.CASCADE)
     times_shown  = models.PositiveIntegerField(default=0)
     is_completed = models.BooleanField(default=False)
+    # Read by the changes API; queryset .update() calls must set it themselves.
+    modified     = models.DateTimeField(auto_now=True, db_index=True)
 
     def update_count(self):
         """Call this whenever the survey is shown."""
@@ -32,6 +47,11 @@ class SurveyModel(models.Model):
         # first and second views are skippable
         return self.STATUS_SHOW
 
+    @staticmethod
+    def completion_key(user_id):
+        """Cache key flagged when the user's survey is marked completed, for the status long-poll."""
+        return f"survey_api.survey_completed.{user_id}"
+
     def __str__(self):
         return f"{self.user.username}: {self.status} (shown {self.times_shown})"
 
@@ -79,7 +99,366 @@ class GoogleFormResponseModel(models.Model):
         indexes = [
             models.Index(fields=['user', 'form_id']),     
             models.Index(fields=['form_id', 'submitted_at']), 
+            models.Index(fields=['submitted_at', 'id']),
         ]
 
     def __str__(self):
         return f"{self.user} - {self.form_id}/{self.response_id}"
+
+
+class SurveyFormModel(models.Model):
+    """
+    One language variant of a logical survey, e.g. the French onboarding form.
+
+    Reports on a survey fetch every variant and merge their responses,
+    translating choice answers by option position.
+
+    .. no_pii:
+    """
+
+    SURVEY_ONBOARDING = "onboarding"
+
+    survey = models.CharField(
+        max_length=64,
+        default=SURVEY_ONBOARDING,
+        help_text="Logical survey this form is a language variant of.",
+    )
+    locale = models.CharField(
+        max_length=16,
+        help_text="Language of this variant, as passed in ?language= (e.g. 'en', 'fr-ca').",
+    )
+    form_id = models.CharField(
+        max_length=128,
+        help_text="The {formId} you need when calling GET /forms/{formId}/responses."
+    )
+    email_question = models.CharField(
+        max_length=255,
+        default="Email address",
+        help_text="Title of the question holding the respondent's email in this variant.",
+    )
+    position = models.PositiveIntegerField(
+        default=0,
+        help_text="Variants are listed in this order; the first one is the default language.",
+    )
+
+    class Meta:
+        unique_together = (
+            ('survey', 'locale'),
+        )
+        ordering = ('survey', 'position', 'id')
+
+    def __str__(self):
+        return f"{self.survey} ({self.locale}): {self.form_id}"
+
+
+class RegistrationSnapshotManager(models.Manager):
+
+    # SYNC flag set while ``rebuild`` runs, renewed after every batch so a killed rebuild doesn't leave it behind.
+    REBUILDING_KEY = "registration_snapshots.rebuilding"
+    REBUILDING_TIMEOUT = 600
+
+    def snapshot(self, info):
+        """
+        Return an unsaved snapshot of ``info`` (an ``ExtraInfo`` with user and profile joined).
+        """
+        user = info.user
+        profile = getattr(user, "profile", None) if user is not None else None
+        return self.model(
+            extra_info_id=info.pk,
+            user_id=info.user_id,
+            name=profile.name if profile is not None else "",
+            username=user.username if user is not None else "",
+            email=user.email if user is not None else "",
+            date_joined=user.date_joined if user is not None else None,
+            year_of_birth=profile.year_of_birth if profile is not None else None,
+            gender=profile.gender_display if profile is not None else None,
+            preferred_language=info.get_preferred_language_display(),
+            referrer=info.get_referrer_display(),
+        )
+
+    def refresh(self, infos):
+        """
+        Upsert the snapshots of the ``ExtraInfo`` rows of queryset ``infos``; return how many were written.
+        """
+        snapshots = [self.snapshot(info) for info in infos.select_related("user", "user__profile")]
+        self._upsert(snapshots)
+        return len(snapshots)
+
+    def _upsert(self, snapshots):
+        if not snapshots:
+            return
+        features = connections[self.db].features
+        self.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            # MySQL upserts on any unique key and refuses an explicit target.
+            unique_fields=["extra_info"] if features.supports_update_conflicts_with_target else None,
+            update_fields=self.model.SNAPSHOT_FIELDS + ["modified"],
+        )
+
+    def keep_current(self, infos):
+        """
+        Write the snapshots of ``infos`` that differ from the stored ones; return how many did.
+
+        Returns None, writing nothing, while the table awaits its first
+        rebuild: outside of a ``rebuild`` the table is kept either empty or
+        complete, since writing a few rows before ``rebuild_registration_snapshots``
+        has run would hide every other learner from the reports, which read
+        the join while it is empty. Also None when ``infos`` is empty, as
+        there was nothing to compare.
+        """
+        if not self.exists() and ExtraInfo.objects.exclude(pk__in=infos.values("pk")).exists():
+            return None
+        snapshots = [self.snapshot(info) for info in infos.select_related("user", "user__profile")]
+        if not snapshots:
+            return None
+        fields = [self.model._meta.get_field(name).attname for name in self.model.SNAPSHOT_FIELDS]
+        stored = {
+            row.pop("extra_info_id"): row
+            for row in self.filter(extra_info_id__in=[snapshot.extra_info_id for snapshot in snapshots])
+            .values("extra_info_id", *fields)
+        }
+        changed = [
+            snapshot for snapshot in snapshots
+            if stored.get(snapshot.extra_info_id) != {field: getattr(snapshot, field) for field in fields}
+        ]
+        self._upsert(changed)
+        return len(changed)
+
+    def joined(self, infos):
+        """
+        Unsaved snapshots of the ``ExtraInfo`` rows of queryset ``infos`` in primary key order, read from the join.
+        """
+        return [self.snapshot(info) for info in infos.select_related("user", "user__profile").order_by("pk")]
+
+    def rebuilding(self):
+        """
+        Whether a ``rebuild`` is under way, so the table may be missing learners.
+        """
+        return bool(SYNC.get(self.REBUILDING_KEY))
+
+    def rebuild(self, batch_size=1000, on_batch=None):
+        """
+        Rebuild every snapshot and return how many were written.
+
+        ``batch_size`` ``ExtraInfo`` rows are read at a time, and the snapshots
+        of deleted rows are dropped.
+
+        The reports read the join until it is done (see ``rebuilding``).
+        ``on_batch(written, last_pk)`` is called after each batch.
+        """
+        total = last_pk = 0
+        try:
+            while True:
+                SYNC.set(self.REBUILDING_KEY, True, self.REBUILDING_TIMEOUT)
+                pks = list(
+                    ExtraInfo.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:batch_size]
+                )
+                if not pks:
+                    self.filter(extra_info_id__gt=last_pk).delete()
+                    return total
+                with transaction.atomic(using=self.db):
+                    self.filter(extra_info_id__gt=last_pk, extra_info_id__lte=pks[-1]).exclude(
+                        extra_info_id__in=pks
+                    ).delete()
+                    written = self.refresh(ExtraInfo.objects.filter(pk__in=pks))
+                total += written
+                last_pk = pks[-1]
+                if on_batch is not None:
+                    on_batch(written, last_pk)
+        finally:
+            SYNC.delete(self.REBUILDING_KEY)
+
+
+class RegistrationSnapshotModel(models.Model):
+    """
+    The registration report row of one learner.
+
+    It is flattened from ``ExtraInfo``, ``User`` and ``UserProfile``, with
+    display labels already rendered.
+
+    Kept current by signals on those models once their transaction commits;
+    ``rebuild_registration_snapshots`` rebuilds it in batches (e.g. after
+    installing, or after bulk imports that bypass signals). Until its first
+    rebuild the table stays empty, and the reports read the join instead then
+    and while a rebuild runs.
+
+    .. pii: Copies of the learner's name, username, email, year of birth and gender.
+    .. pii_types: name, username, email_address, birth_date, gender
+    .. pii_retirement: local_api
+    """
+
+    SNAPSHOT_FIELDS = [
+        "user", "name", "username", "email", "date_joined",
+        "year_of_birth", "gender", "preferred_language", "referrer",
+    ]
+
+    extra_info = models.OneToOneField(
+        ExtraInfo, primary_key=True, on_delete=models.CASCADE, related_name="+"
+    )
+    user = models.ForeignKey(User, null=True, on_delete=models.CASCADE, related_name="+")
+    name = models.CharField(max_length=255, blank=True)
+    username = models.CharField(max_length=150, blank=True, db_index=True)
+    email = models.CharField(max_length=254, blank=True)
+    date_joined = models.DateTimeField(null=True)
+    year_of_birth = models.IntegerField(null=True)
+    gender = models.CharField(max_length=255, null=True)
+    preferred_language = models.CharField(max_length=255, blank=True)
+    referrer = models.CharField(max_length=255, blank=True)
+    modified = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = RegistrationSnapshotManager()
+
+    class Meta:
+        ordering = ("extra_info",)
+
+    def __str__(self):
+        return f"{self.username} ({self.extra_info_id})"
+
+
+class RegistrationRemovalModel(models.Model):
+    """
+    When the snapshot of an ``ExtraInfo`` row was deleted.
+
+    The changes API tells clients to drop that registration row. Kept for
+    ``SURVEY_CHANGES_RETENTION`` seconds.
+
+    .. no_pii:
+    """
+
+    extra_info_id = models.IntegerField(primary_key=True)
+    removed_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.extra_info_id} removed at {self.removed_at}"
+
+
+class ReconcileCheckpointModel(models.Model):
+    """
+    How far ``reconcile_form_responses`` got through the responses of a form.
+
+    A run streams the responses submitted since ``since`` and counts those it
+    has reconciled in ``reconciled`` after each batch, so an interrupted run
+    resumes where it stopped. A complete run moves ``since`` to ``latest``.
+
+    .. no_pii:
+    """
+
+    form_id = models.CharField(max_length=128, primary_key=True)
+    since = models.CharField(
+        max_length=40, null=True, blank=True,
+        help_text="Google timestamp the current run streams responses from; empty for all of them."
+    )
+    reconciled = models.PositiveIntegerField(
+        default=0,
+        help_text="Responses of the current run already reconciled."
+    )
+    latest = models.CharField(
+        max_length=40, null=True, blank=True,
+        help_text="Latest Google submission time reconciled."
+    )
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.form_id} reconciled up to {self.latest}"
+
+
+@receiver(post_save, sender=SurveyModel)
+def flag_survey_completed(instance, **kwargs):
+    """
+    Wake up the ``AsyncSurveyStatusWaitView`` long-polls of the learner once their survey is completed.
+    """
+    if instance.is_completed:
+        cache.set(SurveyModel.completion_key(instance.user_id), True, 300)
+
+
+@receiver(post_delete, sender=RegistrationSnapshotModel)
+def record_registration_removal(instance, **kwargs):
+    """
+    Record the removal of a snapshot for the changes API, dropping the records past ``SURVEY_CHANGES_RETENTION``.
+    """
+    retention = getattr(settings, "SURVEY_CHANGES_RETENTION", 30 * 24 * 3600)
+    RegistrationRemovalModel.objects.filter(removed_at__lt=timezone.now() - timedelta(seconds=retention)).delete()
+    features = connections[RegistrationRemovalModel.objects.db].features
+    RegistrationRemovalModel.objects.bulk_create(
+        [RegistrationRemovalModel(extra_info_id=instance.extra_info_id)],
+        update_conflicts=True,
+        unique_fields=["extra_info_id"] if features.supports_update_conflicts_with_target else None,
+        update_fields=["removed_at"],
+    )
+
+
+@receiver(post_save, sender=SurveyFormModel)
+@receiver(post_delete, sender=SurveyFormModel)
+def invalidate_survey_forms(**kwargs):
+    """
+    Drop the cached survey form registry.
+    """
+    SURVEY_FORMS.invalidate()
+
+
+@receiver(post_save, sender=CourseFeedbackModel)
+@receiver(post_delete, sender=CourseFeedbackModel)
+def invalidate_course_feedback_reports(**kwargs):
+    """
+    Drop the cached reports that list the course feedback forms.
+    """
+    DASHBOARD.invalidate()
+    COURSE_OVERVIEW.invalidate()
+
+
+# Fields of each source model that the snapshots copy.
+SNAPSHOT_SOURCES = {
+    User: {"username", "email", "date_joined"},
+    UserProfile: {"user", "user_id", "name", "year_of_birth", "gender"},
+    ExtraInfo: {"user", "user_id", "preferred_language", "referrer"},
+}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_save, sender=ExtraInfo)
+@receiver(post_delete, sender=ExtraInfo)
+def update_learner_reports(sender, instance, using, signal, update_fields=None, created=False, **kwargs):
+    """
+    Bring the learner's snapshot up to date after a commit, invalidating the reports it changed.
+    """
+    # Every login saves last_login alone; it isn't part of any report.
+    if update_fields is not None and not SNAPSHOT_SOURCES[sender] & set(update_fields):
+        return
+    added_or_removed = created or signal is post_delete
+    if sender is ExtraInfo:
+        lookup = {"pk": instance.pk}
+    elif sender is User:
+        lookup = {"user_id": instance.pk}
+    else:
+        lookup = {"user_id": instance.user_id}
+
+    def update():
+        # Deleted users and ExtraInfo rows take their snapshot with them.
+        changed = RegistrationSnapshotModel.objects.keep_current(ExtraInfo.objects.filter(**lookup))
+        # None: the reports may read the join, so assume the change shows.
+        if changed is None or changed or added_or_removed:
+            REGISTRATIONS.invalidate()
+            # The dashboard lists the username and email of every user, which the snapshot copies.
+            if sender is User:
+                DASHBOARD.invalidate()
+
+    # Read the rows as committed, and don't let a rolled back save reach the reports.
+    transaction.on_commit(update, using=using)
+
+
+@receiver(USER_RETIRE_LMS_CRITICAL)
+def retire_learner_reports(sender, user, **kwargs):
+    """
+    Drop the registration snapshot of a retired learner, which copies their PII.
+
+    The retirement's own saves of ``User`` and ``UserProfile`` only update
+    snapshots once it commits, so at most they copy the retired values.
+    """
+    # Deleting through the queryset records the removal for the changes API.
+    RegistrationSnapshotModel.objects.filter(user=user).delete()
+    DASHBOARD.invalidate()
+    REGISTRATIONS.invalidate()
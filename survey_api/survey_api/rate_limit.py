@@ -0,0 +1,234 @@
+"""
+Shared token-bucket rate limiting for Google Forms API calls.
+
+The bucket lives in the Django cache so that every worker draws from one
+per-project budget. It refills at ``SURVEY_GOOGLE_RATE_LIMIT`` calls per
+minute up to ``SURVEY_GOOGLE_BURST`` tokens; set the rate to ``None`` to turn
+limiting off. A rate of zero or less is a configuration error.
+
+Calls are interactive unless made inside ``with priority(BACKGROUND):``.
+Background calls may not dip into the last ``SURVEY_GOOGLE_INTERACTIVE_RESERVE``
+share of the bucket, so syncs and warm-ups never starve an admin's report.
+When the bucket is empty a caller waits for the refill, up to
+``SURVEY_GOOGLE_MAX_WAIT`` seconds (``SURVEY_GOOGLE_BACKGROUND_MAX_WAIT`` for
+background calls), then gets ``RateLimitExceeded``.
+"""
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import Throttled
+
+from . import metrics
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+_priority = ContextVar("survey_api_google_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(level):
+    """
+    Run the enclosed Google calls at ``level`` (``INTERACTIVE`` or ``BACKGROUND``).
+    """
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    """
+    Return the priority the Google calls of the current context run at.
+    """
+    return _priority.get()
+
+
+def keep_priority(func):
+    """
+    Wrap ``func`` to run at the caller's priority.
+
+    Executor threads don't inherit context variables, so work submitted to a
+    pool would otherwise always run at ``INTERACTIVE``.
+    """
+    level = _priority.get()
+
+    def run(*args, **kwargs):
+        with priority(level):
+            return func(*args, **kwargs)
+
+    return run
+
+
+class RateLimitExceeded(Throttled):
+    default_detail = "Google Forms API quota exhausted."
+
+
+class TokenBucket:
+    """
+    Token bucket whose state is shared through the Django cache.
+    """
+
+    LOCK_TIMEOUT = 5
+    LOCK_WAIT = 0.5
+
+    def __init__(self, name):
+        """
+        Create the bucket ``name``; buckets of the same name share their tokens.
+        """
+        self.state_key = f"survey_api.bucket.{name}"
+        self.lock_key = f"survey_api.bucket.{name}.lock"
+        self.used_key = f"survey_api.bucket.{name}.used"
+
+    @property
+    def enabled(self):
+        """
+        Whether calls are limited at all.
+        """
+        return self.rate_per_minute is not None
+
+    @property
+    def rate_per_minute(self):
+        """
+        Refill rate in tokens per minute (``SURVEY_GOOGLE_RATE_LIMIT``), None when limiting is off.
+        """
+        rate = getattr(settings, "SURVEY_GOOGLE_RATE_LIMIT", 900)
+        if rate is not None and rate <= 0:
+            raise ImproperlyConfigured("SURVEY_GOOGLE_RATE_LIMIT must be positive, or None to turn limiting off.")
+        return rate
+
+    @property
+    def capacity(self):
+        """
+        Most tokens the bucket holds (``SURVEY_GOOGLE_BURST``).
+        """
+        return getattr(settings, "SURVEY_GOOGLE_BURST", 60)
+
+    @property
+    def reserve(self):
+        """
+        Tokens kept for interactive calls (``SURVEY_GOOGLE_INTERACTIVE_RESERVE`` of the capacity).
+        """
+        return self.capacity * getattr(settings, "SURVEY_GOOGLE_INTERACTIVE_RESERVE", 0.25)
+
+    def max_wait(self, level):
+        """
+        Return the longest a call at ``level`` waits for a token, in seconds.
+        """
+        if level == BACKGROUND:
+            return getattr(settings, "SURVEY_GOOGLE_BACKGROUND_MAX_WAIT", 30)
+        return getattr(settings, "SURVEY_GOOGLE_MAX_WAIT", 2)
+
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the bucket lock for the block and yield whether it was acquired.
+
+        cache.add is atomic on every production backend. The lock is given up
+        on after ``LOCK_WAIT`` seconds rather than blocking a worker on it, and
+        only its holder ever releases it.
+        """
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + self.LOCK_WAIT
+        acquired = cache.add(self.lock_key, owner, self.LOCK_TIMEOUT)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(0.005)
+            acquired = cache.add(self.lock_key, owner, self.LOCK_TIMEOUT)
+        try:
+            yield acquired
+        finally:
+            if acquired and cache.get(self.lock_key) == owner:
+                cache.delete(self.lock_key)
+
+    def _refilled(self, now):
+        state = cache.get(self.state_key)
+        if state is None:
+            return self.capacity
+        elapsed = max(0.0, now - state["updated"])
+        return min(self.capacity, state["tokens"] + elapsed * self.rate_per_minute / 60)
+
+    def _save(self, tokens, now):
+        cache.set(self.state_key, {"tokens": tokens, "updated": now}, None)
+
+    def try_acquire(self, level):
+        """
+        Take one token and return 0, or return the seconds to wait until one is available to ``level``.
+        """
+        floor = self.reserve if level == BACKGROUND else 0
+        with self._locked() as acquired:
+            if not acquired:
+                # Another worker is stuck holding the lock; try again shortly.
+                return self.LOCK_WAIT
+            now = time.time()
+            tokens = self._refilled(now)
+            if tokens - 1 >= floor:
+                self._save(tokens - 1, now)
+                self._count_use(now)
+                return 0
+        return (floor + 1 - tokens) * 60 / self.rate_per_minute
+
+    def acquire(self, level=None):
+        """
+        Take one token, waiting for the refill if needed; raise ``RateLimitExceeded`` past the wait limit.
+        """
+        if not self.enabled:
+            return
+        level = level or _priority.get()
+        deadline = time.monotonic() + self.max_wait(level)
+        waited = False
+        while True:
+            wait = self.try_acquire(level)
+            if not wait:
+                if waited:
+                    metrics.GOOGLE_RATE_LIMITED.labels(priority=level, outcome="waited").inc()
+                return
+            remaining = deadline - time.monotonic()
+            if wait > remaining:
+                metrics.GOOGLE_RATE_LIMITED.labels(priority=level, outcome="rejected").inc()
+                raise RateLimitExceeded(wait=math.ceil(wait))
+            waited = True
+            time.sleep(wait)
+
+    def drain(self, seconds):
+        """
+        Empty the bucket and push the next token ``seconds`` away, e.g. after Google answered 429.
+        """
+        if not self.enabled:
+            return
+        # Google has already refused us, so drain even without the lock: at
+        # worst a concurrent take lets one more call through to a 429.
+        with self._locked():
+            self._save(-seconds * self.rate_per_minute / 60, time.time())
+
+    def _count_use(self, now):
+        key = f"{self.used_key}.{int(now // 60)}"
+        if not cache.add(key, 1, 120):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, 120)
+
+    def usage(self):
+        """
+        Return the bucket's settings, available tokens and calls of this and the last minute.
+        """
+        now = time.time()
+        return {
+            "enabled": self.enabled,
+            "rate_per_minute": self.rate_per_minute,
+            "capacity": self.capacity,
+            "interactive_reserve": self.reserve if self.enabled else None,
+            "tokens_available": round(self._refilled(now), 2) if self.enabled else None,
+            "used_this_minute": cache.get(f"{self.used_key}.{int(now // 60)}", 0),
+            "used_last_minute": cache.get(f"{self.used_key}.{int(now // 60) - 1}", 0),
+        }
+
+
+google_bucket = TokenBucket("google_forms")
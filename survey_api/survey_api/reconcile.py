@@ -0,0 +1,127 @@
+"""
+Backfill of ``GoogleFormResponseModel`` rows the submission webhook missed.
+
+``UserCourseView`` only finds a learner's course feedback through the row
+``GoogleFormResponseView`` writes when Google's Apps Script calls it; when that
+call fails, the learner's submission is invisible. Reconciliation streams the
+responses of every course feedback form page by page, matches their
+``respondentEmail`` to users with one query per batch and inserts the missing
+rows with ``bulk_create(ignore_conflicts=True)``, so it can run alongside the
+webhook and be interrupted at any point.
+
+Progress is kept per form in ``ReconcileCheckpointModel`` and advanced after
+every batch. After a form is fully reconciled, the next run only asks Google
+for the responses submitted since the latest one seen. An interrupted run
+streams the same responses again but skips, without matching them, the ones
+it already reconciled, relying on Google listing them in a stable order; a
+``--full`` run matches everything again.
+
+Run by the ``reconcile_form_responses`` management command.
+"""
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.utils.dateparse import parse_datetime
+
+from .google_forms import iter_form_responses, latest_submitted, submitted_time
+from .models import CourseFeedbackModel, GoogleFormResponseModel, ReconcileCheckpointModel
+
+
+def course_form_ids():
+    """
+    Return the form id of every course feedback form.
+    """
+    return list(CourseFeedbackModel.objects.values_list("form_id", flat=True).order_by("form_id").distinct())
+
+
+def get_checkpoint(form_id):
+    """
+    Return the ``ReconcileCheckpointModel`` of a form, unsaved when it was never reconciled.
+    """
+    return ReconcileCheckpointModel.objects.filter(form_id=form_id).first() or ReconcileCheckpointModel(form_id=form_id)
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _users_by_email(emails):
+    """
+    Map lowercased emails to users with one indexed ``IN`` query.
+
+    Both the emails as submitted and lowercased are looked up, so the email
+    index is used on case-sensitive databases too.
+    """
+    candidates = set(emails) | {email.lower() for email in emails}
+    users = {}
+    for user_id, email in User.objects.filter(email__in=candidates).values_list("id", "email").order_by("id"):
+        users.setdefault(email.lower(), user_id)
+    return users
+
+
+def reconcile_batch(form_id, responses):
+    """
+    Insert the missing rows for one batch of responses; return ``(inserted, unmatched)``.
+
+    ``unmatched`` counts responses without an email or whose email matches no user.
+    ``inserted`` counts the matched responses that had no row before the batch;
+    it is approximate when the webhook records some of them concurrently, as
+    those rows are skipped but still counted.
+    """
+    response_ids = [resp.get("responseId") for resp in responses if resp.get("responseId")]
+    existing = set(
+        GoogleFormResponseModel.objects.filter(form_id=form_id, response_id__in=response_ids)
+        .values_list("response_id", flat=True)
+    )
+    missing = [resp for resp in responses if resp.get("responseId") and resp["responseId"] not in existing]
+    if not missing:
+        return 0, 0
+
+    emails = [(resp.get("respondentEmail") or "").strip() for resp in missing]
+    users = _users_by_email([email for email in emails if email])
+    rows = []
+    for resp, email in zip(missing, emails):
+        user_id = users.get(email.lower())
+        if user_id is None:
+            continue
+        rows.append(GoogleFormResponseModel(
+            user_id=user_id,
+            form_id=form_id,
+            response_id=resp["responseId"],
+            submitted_at=parse_datetime(submitted_time(resp)),
+        ))
+    if rows:
+        GoogleFormResponseModel.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows), len(missing) - len(rows)
+
+
+def reconcile_form(form_id, headers, batch_size=500, full=False, on_batch=None):
+    """
+    Reconcile one form and return ``{"seen", "inserted", "unmatched"}`` counts for this run.
+
+    Without ``full``, the form resumes from its checkpoint. ``on_batch(seen,
+    inserted, unmatched)`` is called after each batch with the running totals.
+    """
+    checkpoint = get_checkpoint(form_id)
+    if full:
+        checkpoint.since, checkpoint.reconciled, checkpoint.latest = None, 0, None
+    since = checkpoint.since
+    responses = iter_form_responses(form_id, headers, f"timestamp >= {since}" if since else None)
+
+    totals = {"seen": 0, "inserted": 0, "unmatched": 0}
+    for batch in _batches(islice(responses, checkpoint.reconciled, None), batch_size):
+        inserted, unmatched = reconcile_batch(form_id, batch)
+        totals["seen"] += len(batch)
+        totals["inserted"] += inserted
+        totals["unmatched"] += unmatched
+        checkpoint.reconciled += len(batch)
+        checkpoint.latest = latest_submitted(batch, checkpoint.latest)
+        checkpoint.save()
+        if on_batch is not None:
+            on_batch(totals["seen"], totals["inserted"], totals["unmatched"])
+
+    checkpoint.since, checkpoint.reconciled = checkpoint.latest, 0
+    checkpoint.save()
+    return totals
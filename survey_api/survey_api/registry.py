@@ -0,0 +1,104 @@
+"""
+Registry of the language variants of each logical survey.
+
+Variants are ``SurveyFormModel`` rows, editable in the Django admin. A survey
+without any row falls back to the ``SURVEY_FORMS`` setting (filled in by the
+Tutor plugin), which has the shape::
+
+    SURVEY_FORMS = {
+        "onboarding": [
+            {"locale": "en", "form_id": "...", "email_question": "Email address"},
+            {"locale": "fr-ca", "form_id": "...", "email_question": "Adresse e-mail"},
+        ],
+    }
+
+``seed_survey_forms`` copies the setting into the table. The registry is
+cached, and the cache is invalidated whenever a row is saved or deleted.
+"""
+from collections import namedtuple
+
+from django.conf import settings
+
+from .caching import SURVEY_FORMS
+from .models import SurveyFormModel
+
+SurveyForm = namedtuple("SurveyForm", ["locale", "form_id", "email_question"])
+
+DEFAULT_SURVEY_FORMS = {
+    SurveyFormModel.SURVEY_ONBOARDING: [
+        {
+            "locale": "en",
+            "form_id": "1MXaneZl67ofajuD9CuEhABtW-xzuWOw-uYfxGLyZ3dA",
+            "email_question": "Email address",
+        },
+        {
+            "locale": "fr-ca",
+            "form_id": "1xjY3XCawFdY5L_NcU4L7HCuDtwaizGg3fIbF8fVlThQ",
+            "email_question": "Adresse e-mail",
+        },
+    ],
+}
+
+
+def _configured_survey_forms():
+    return getattr(settings, "SURVEY_FORMS", None) or DEFAULT_SURVEY_FORMS
+
+
+def _from_config(variant):
+    return SurveyForm(variant["locale"], variant["form_id"], variant.get("email_question", "Email address"))
+
+
+def _load():
+    registry = {}
+    for row in SurveyFormModel.objects.all():
+        registry.setdefault(row.survey, []).append(SurveyForm(row.locale, row.form_id, row.email_question))
+    for survey, variants in _configured_survey_forms().items():
+        if survey not in registry:
+            registry[survey] = [_from_config(variant) for variant in variants]
+    return registry
+
+
+def get_registry():
+    """
+    Return ``{survey: [SurveyForm, ...]}`` for every known survey.
+    """
+    return SURVEY_FORMS.get_or_set("registry", _load)
+
+
+def get_survey_forms(survey=SurveyFormModel.SURVEY_ONBOARDING):
+    """
+    Return the language variants of ``survey``, the default language first.
+    """
+    return get_registry().get(survey, [])
+
+
+def registered_form_ids():
+    """
+    Return the form id of every variant of every survey, without duplicates.
+    """
+    form_ids = []
+    for variants in get_registry().values():
+        for variant in variants:
+            if variant.form_id not in form_ids:
+                form_ids.append(variant.form_id)
+    return form_ids
+
+
+def seed_survey_forms():
+    """
+    Create the variants of ``SURVEY_FORMS`` missing from the table; existing rows are left as edited.
+    """
+    created = 0
+    for survey, variants in _configured_survey_forms().items():
+        for position, variant in enumerate(variants):
+            _, was_created = SurveyFormModel.objects.get_or_create(
+                survey=survey,
+                locale=variant["locale"],
+                defaults={
+                    "form_id": variant["form_id"],
+                    "email_question": variant.get("email_question", "Email address"),
+                    "position": position,
+                },
+            )
+            created += was_created
+    return created
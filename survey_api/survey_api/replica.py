@@ -0,0 +1,31 @@
+"""
+Send the read-only admin report queries to a database replica.
+
+The registration and dashboard reports scan ``auth_user``, ``ExtraInfo`` and
+``UserProfile`` in full. When ``SURVEY_REPORT_DATABASE`` names an alias of
+``DATABASES`` (e.g. a read replica of the LMS database), those queries run
+there instead of competing with learner traffic on the primary. Without it,
+or when the alias isn't configured, they run on ``default``.
+
+Only report reads go through ``for_reports``; writes, and reads that must see
+them (survey status, submissions), always use the primary.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def report_database():
+    """
+    Return the database alias the report queries should use.
+    """
+    alias = getattr(settings, "SURVEY_REPORT_DATABASE", None)
+    if alias and alias in connections.settings:
+        return alias
+    return DEFAULT_DB_ALIAS
+
+
+def for_reports(queryset):
+    """
+    Return ``queryset`` bound to the report database.
+    """
+    return queryset.using(report_database())
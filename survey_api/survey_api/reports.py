@@ -0,0 +1,141 @@
+"""
+Aggregated reports built on top of the survey models and the Google Forms API.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from acl_extra_reg_fields.models import ExtraInfo
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.models.user import UserProfile
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.dateparse import parse_datetime
+from requests.exceptions import RequestException
+
+from .circuit_breaker import CircuitOpenError
+from .google_forms import get_form_responses, submitted_time
+from .models import CourseFeedbackModel, GoogleFormResponseModel
+from .rate_limit import RateLimitExceeded, keep_priority
+from .replica import for_reports
+from .timing import phase
+
+
+def summarize_form_responses(form_id, headers):
+    """
+    Count the responses of a form on Google and find the latest submission time.
+    """
+    count = 0
+    last_submitted = None
+    for resp in get_form_responses(form_id, headers):
+        count += 1
+        submitted = parse_datetime(submitted_time(resp))
+        if submitted and (last_submitted is None or submitted > last_submitted):
+            last_submitted = submitted
+    return {
+        "response_count": count,
+        "last_submitted": last_submitted.isoformat() if last_submitted else None,
+    }
+
+
+def course_feedback_overview(get_headers):
+    """
+    Return one row per ``CourseFeedbackModel``.
+
+    Each row has the form's response count, last submission time and
+    completion rate (responses / active enrollments).
+
+    Counts come from the local ``GoogleFormResponseModel`` rows whenever a form
+    has any; the remaining forms are summarized from Google concurrently, in a
+    pool bounded by ``SURVEY_OVERVIEW_MAX_WORKERS``. ``get_headers`` is only
+    called when at least one form needs Google, so a fully local overview
+    never fetches a token.
+    """
+    feedback_forms = list(
+        CourseFeedbackModel.objects.select_related('course').order_by('id')
+    )
+    form_ids = [feedback.form_id for feedback in feedback_forms]
+    course_ids = [feedback.course_id for feedback in feedback_forms]
+
+    local = {
+        row['form_id']: {"response_count": row['count'], "last_submitted": row['last'].isoformat()}
+        for row in GoogleFormResponseModel.objects.filter(form_id__in=form_ids)
+        .values('form_id')
+        .annotate(count=Count('id'), last=Max('submitted_at'))
+    }
+    enrollments = {
+        str(row['course_id']): row['total']
+        for row in CourseEnrollment.objects.filter(course_id__in=course_ids, is_active=True)
+        .values('course_id')
+        .annotate(total=Count('id'))
+    }
+
+    summaries = {form_id: dict(summary, source="local") for form_id, summary in local.items()}
+    remote_ids = [form_id for form_id in dict.fromkeys(form_ids) if form_id not in local]
+    if remote_ids:
+        headers = get_headers()
+        max_workers = min(getattr(settings, "SURVEY_OVERVIEW_MAX_WORKERS", 4), len(remote_ids))
+        with phase("google_responses"), ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                form_id: executor.submit(keep_priority(summarize_form_responses), form_id, headers)
+                for form_id in remote_ids
+            }
+            for form_id, future in futures.items():
+                try:
+                    summaries[form_id] = dict(future.result(), source="google")
+                except (RequestException, CircuitOpenError, RateLimitExceeded) as e:
+                    summaries[form_id] = {
+                        "response_count": None,
+                        "last_submitted": None,
+                        "source": "google",
+                        "error": str(e),
+                    }
+
+    rows = []
+    for feedback in feedback_forms:
+        summary = summaries[feedback.form_id]
+        enrolled = enrollments.get(str(feedback.course_id), 0)
+        count = summary["response_count"]
+        rows.append({
+            "id": feedback.id,
+            "form_id": feedback.form_id,
+            "course_id": str(feedback.course_id),
+            "course": feedback.course.display_name,
+            "enrolled": enrolled,
+            "completion_rate": round(count / enrolled, 4) if enrolled and count is not None else None,
+            **summary,
+        })
+    return rows
+
+
+# histogram name -> (ExtraInfo lookup grouped on, choices labelling its values, or None)
+DEMOGRAPHICS = {
+    "gender": ("user__profile__gender", UserProfile.GENDER_CHOICES),
+    "year_of_birth": ("user__profile__year_of_birth", None),
+    "preferred_language": ("preferred_language", ExtraInfo.LANGUAGES),
+    "referrer": ("referrer", ExtraInfo.SOCIAL_NETWORKS),
+}
+
+
+def registration_demographics(joined_after=None, joined_before=None):
+    """
+    Count the registration answers of learners who joined in the given window.
+
+    The histograms are counted in the database.
+
+    Returns ``{"total": n, <histogram>: [{"value", "label", "count"}, ...]}``;
+    labels come from the model choices, like the registration report's.
+    """
+    infos = for_reports(ExtraInfo.objects.all())
+    if joined_after:
+        infos = infos.filter(user__date_joined__gte=joined_after)
+    if joined_before:
+        infos = infos.filter(user__date_joined__lt=joined_before)
+
+    report = {"total": infos.count()}
+    for name, (lookup, choices) in DEMOGRAPHICS.items():
+        labels = dict(choices or ())
+        rows = infos.values(lookup).annotate(count=Count("pk")).order_by(lookup)
+        report[name] = [
+            {"value": row[lookup], "label": labels.get(row[lookup], row[lookup]), "count": row["count"]}
+            for row in rows
+        ]
+    return report
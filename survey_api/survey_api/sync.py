@@ -0,0 +1,105 @@
+"""
+Incremental background sync of Google Forms submissions into the survey_api caches.
+
+Each pass asks Google only for the responses submitted (or edited) since the
+last one it saw, using the ``timestamp >`` filter of ``forms.responses.list``,
+merges them into the cached response list of the form and rebuilds the course
+feedback overview when anything changed. While the sync runs, cached lists are
+kept for at least twice ``SURVEY_SYNC_MAX_INTERVAL`` so they never go cold
+between passes.
+
+Run by the ``sync_survey_data`` management command.
+"""
+from django.conf import settings
+
+from .caching import COURSE_OVERVIEW, FORM_RESPONSES, SYNC
+from .google_forms import (
+    cache_form_responses,
+    get_access_token,
+    get_form,
+    get_form_responses,
+    iter_form_responses,
+    latest_submitted,
+)
+from .models import CourseFeedbackModel
+from .rate_limit import BACKGROUND, priority
+from .registry import registered_form_ids
+from .views import CourseFeedbackOverviewView
+
+
+def sync_interval():
+    """
+    Seconds between passes of ``sync_survey_data`` (``SURVEY_SYNC_INTERVAL``).
+    """
+    return getattr(settings, "SURVEY_SYNC_INTERVAL", 60)
+
+
+def sync_max_interval():
+    """
+    Longest back-off between passes while nothing changes (``SURVEY_SYNC_MAX_INTERVAL``).
+    """
+    return getattr(settings, "SURVEY_SYNC_MAX_INTERVAL", 600)
+
+
+def known_form_ids():
+    """
+    Return the registered survey forms followed by every course feedback form.
+    """
+    form_ids = registered_form_ids()
+    for form_id in CourseFeedbackModel.objects.values_list("form_id", flat=True).order_by("form_id").distinct():
+        if form_id not in form_ids:
+            form_ids.append(form_id)
+    return form_ids
+
+
+def sync_form(form_id, headers):
+    """
+    Pull the new submissions of one form; return how many responses were added or updated.
+
+    A form seen for the first time, or whose cached list has expired, is
+    reloaded in full and all its responses count as changed.
+    """
+    last_key = f"{form_id}.last_submitted"
+    timeout = max(getattr(settings, "SURVEY_RESPONSES_CACHE_TIMEOUT", 60), 2 * sync_max_interval())
+
+    # Metadata is only fetched again once its own cache entry expires.
+    get_form(form_id, headers)
+
+    cached = FORM_RESPONSES.get(form_id)
+    last_submitted = SYNC.get(last_key)
+    if cached is None or last_submitted is None:
+        responses = get_form_responses(form_id, headers, refresh=True)
+        changed = len(responses)
+        last_submitted = latest_submitted(responses)
+    else:
+        new = list(iter_form_responses(form_id, headers, f"timestamp > {last_submitted}"))
+        changed = len(new)
+        responses = cached
+        if new:
+            new_ids = {resp.get("responseId") for resp in new}
+            responses = [resp for resp in cached if resp.get("responseId") not in new_ids] + new
+            last_submitted = latest_submitted(new, last_submitted)
+
+    cache_form_responses(form_id, responses, timeout)
+    if last_submitted is not None:
+        SYNC.set(last_key, last_submitted, timeout)
+    return changed
+
+
+def sync_once(form_ids=None):
+    """
+    Run one sync pass at background priority and return ``{form_id: changed count or exception}``.
+    """
+    results = {}
+    with priority(BACKGROUND):
+        headers = {"Authorization": f"Bearer {get_access_token()}"}
+        for form_id in form_ids or known_form_ids():
+            try:
+                results[form_id] = sync_form(form_id, headers)
+            except Exception as e:  # pylint: disable=broad-except
+                results[form_id] = e
+
+        changed = any(not isinstance(result, Exception) and result for result in results.values())
+        if changed or COURSE_OVERVIEW.get("courses") is None:
+            CourseFeedbackOverviewView().get_courses(refresh=True)
+    return results
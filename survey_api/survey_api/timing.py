@@ -0,0 +1,180 @@
+"""
+Per-request phase timing (``Server-Timing`` header) and opt-in profiling.
+
+Code anywhere below a view can mark a phase with ``with phase("token"):``.
+Phases nest and are timed exclusively: while an inner phase runs, the outer
+one is paused, so e.g. the ``db`` time spent inside ``auth`` is only reported
+under ``db``. Outside of a request ``phase`` does nothing.
+"""
+import cProfile
+import io
+import pstats
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.http import HttpResponse
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover
+    pyinstrument = None
+
+_current = ContextVar("survey_api_server_timing", default=None)
+
+
+class ServerTiming:
+    """
+    Accumulates exclusive wall time per phase for one request.
+    """
+
+    def __init__(self):
+        """
+        Start timing the request.
+        """
+        self.durations = {}
+        self._stack = []
+        self._started = time.perf_counter()
+
+    def _add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def start(self, name):
+        """
+        Enter phase ``name``, pausing the enclosing one.
+        """
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self._add(parent[0], now - parent[1])
+        self._stack.append([name, now])
+
+    def stop(self):
+        """
+        Leave the current phase, resuming the enclosing one.
+        """
+        now = time.perf_counter()
+        name, since = self._stack.pop()
+        self._add(name, now - since)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def header_value(self):
+        """
+        Return the ``Server-Timing`` header value: each phase, then the request's total.
+        """
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.durations.items()]
+        entries.append(f"total;dur={(time.perf_counter() - self._started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+@contextmanager
+def phase(name):
+    """
+    Time the block as phase ``name`` of the current request, if any.
+    """
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    timing.start(name)
+    try:
+        yield
+    finally:
+        timing.stop()
+
+
+def _db_phase(execute, sql, params, many, context):
+    with phase("db"):
+        return execute(sql, params, many, context)
+
+
+def _start_profiler():
+    if pyinstrument is not None:
+        profiler = pyinstrument.Profiler()
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    return profiler
+
+
+def _stop_profiler(profiler):
+    if pyinstrument is not None:
+        profiler.stop()
+    else:
+        profiler.disable()
+
+
+def _profile_response(profiler):
+    """
+    Return the report of a stopped profiler: pyinstrument HTML, or the top cProfile entries as text.
+    """
+    if pyinstrument is not None:
+        return HttpResponse(profiler.output_html(), content_type="text/html")
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(60)
+    return HttpResponse(stream.getvalue(), content_type="text/plain")
+
+
+class ServerTimingMixin:
+    """
+    Emit a ``Server-Timing`` header on every response of the view.
+
+    Superusers can add ``?profile=1`` to get a profile of the request instead
+    of its normal response: pyinstrument HTML when it is installed, cProfile
+    text otherwise. The profiler only starts in ``initial``, once DRF has
+    authenticated the request and checked its permissions, so other callers
+    can't make the server profile anything and just get their normal response.
+    """
+
+    _profile_requested = False
+    _profiler = None
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Time the request, answering with its profile when one was started.
+        """
+        self._profile_requested = request.GET.get("profile") == "1"
+        try:
+            response = self._timed_dispatch(request, *args, **kwargs)
+        finally:
+            if self._profiler is not None:
+                _stop_profiler(self._profiler)
+        if self._profiler is None:
+            return response
+        profile = _profile_response(self._profiler)
+        profile["Server-Timing"] = response["Server-Timing"]
+        return profile
+
+    def initial(self, request, *args, **kwargs):
+        """
+        Start the profiler for a superuser's ``?profile=1`` once the request is authorized.
+        """
+        super().initial(request, *args, **kwargs)
+        if self._profile_requested and request.user.is_superuser:
+            self._profiler = _start_profiler()
+
+    def perform_authentication(self, request):
+        """
+        Authenticate the request under the ``auth`` phase.
+        """
+        with phase("auth"):
+            super().perform_authentication(request)
+
+    def _timed_dispatch(self, request, *args, **kwargs):
+        timing = ServerTiming()
+        token = _current.set(timing)
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(_db_phase))
+                response = super().dispatch(request, *args, **kwargs)
+                if callable(getattr(response, "render", None)) and not response.is_rendered:
+                    with phase("serialize"):
+                        response.render()
+        finally:
+            _current.reset(token)
+        response["Server-Timing"] = timing.header_value()
+        return response
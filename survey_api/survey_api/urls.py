@@ -1,15 +1,47 @@
 """
 URLs for survey_api.
 """
+from django.conf import settings
 from django.urls import re_path  # pylint: disable=unused-import
 from django.views.generic import TemplateView  # pylint: disable=unused-import
 
-from .views import PermissionsAccessView, DashboardInfoView, SurveyCompletedView, SurveyStatusView, FormResponses, RegistrationResponsesView, GoogleFormResponseView, CourseResponseView, UserRegistrationView, UserCourseView, UserOnboardingView
+from .views import (
+    PermissionsAccessView,
+    DashboardInfoView,
+    SurveyCompletedView,
+    SurveyStatusView,
+    SurveyStatusWaitView,
+    FormResponses,
+    RegistrationResponsesView,
+    RegistrationDemographicsView,
+    SubmissionFeedView,
+    ChangesView,
+    GoogleFormResponseView,
+    CourseResponseView,
+    CourseFeedbackOverviewView,
+    UserRegistrationView,
+    UserCourseView,
+    UserOnboardingView,
+    MetricsView,
+    GoogleQuotaView,
+)
+
+if getattr(settings, "SURVEY_ASYNC_VIEWS", False):
+    # Under ASGI the Google-bound views don't tie up a worker while Google answers.
+    from .async_views import (  # pylint: disable=ungrouped-imports
+        AsyncFormResponses as FormResponses,
+        AsyncCourseResponseView as CourseResponseView,
+        AsyncUserCourseView as UserCourseView,
+        AsyncUserOnboardingView as UserOnboardingView,
+        AsyncSurveyStatusWaitView as SurveyStatusWaitView,
+    )
 
 urlpatterns = [
     # TODO: Fill in URL patterns and views here.
     # re_path(r'', TemplateView.as_view(template_name="survey_api/base.html")),
     re_path(r'^api/status/?$', SurveyStatusView.as_view(), name='survey-status'),
+    # GET → the status again once the popup is closed; the async view waits for the survey to be completed
+    re_path(r'^api/status/wait/?$', SurveyStatusWaitView.as_view(), name='survey-status-wait'),
     re_path(r'^api/allowed/?$', PermissionsAccessView.as_view(), name='allowed'),
 
     re_path(r'^api/dashboard/?$', DashboardInfoView.as_view(), name='dashboard'),
@@ -19,11 +51,25 @@ urlpatterns = [
 
     re_path(r'^api/responses/q', FormResponses.as_view(), name='form-responses'),
     re_path(r'^api/responses/registration/?$', RegistrationResponsesView.as_view(), name='registration-responses'),
+    re_path(
+        r'^api/responses/registration/demographics/?$',
+        RegistrationDemographicsView.as_view(),
+        name='registration-demographics',
+    ),
     re_path(r'^api/responses/course/q', CourseResponseView.as_view(), name='course-responses'),
+    re_path(
+        r'^api/responses/course/overview/?$', CourseFeedbackOverviewView.as_view(), name='course-feedback-overview'
+    ),
 
     re_path(r'^api/user/course/q', UserCourseView.as_view(), name='user-course'),
     re_path(r'^api/user/onboarding/q', UserOnboardingView.as_view(), name='user-onboarding'),
     re_path(r'^api/user/registration/q', UserRegistrationView.as_view(), name='user-registration'),
 
+    re_path(r'^api/submissions/?$', SubmissionFeedView.as_view(), name='submissions-feed'),
+    re_path(r'^api/changes/?$', ChangesView.as_view(), name='changes'),
+
     re_path(r'^api/course-forms/?$', GoogleFormResponseView.as_view(), name='course-form'),
+
+    re_path(r'^api/metrics/?$', MetricsView.as_view(), name='metrics'),
+    re_path(r'^api/google/quota/?$', GoogleQuotaView.as_view(), name='google-quota'),
 ]
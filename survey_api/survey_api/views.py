@@ -4,12 +4,11 @@ from requests.exceptions import RequestException
 from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth.models import User
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ObjectDoesNotExist
 
-from google.auth.transport.requests import Request
-from google.oauth2 import service_account
+from google.auth.exceptions import RefreshError
 
 from common.djangoapps.student.models.user import UserProfile
 
@@ -20,67 +19,157 @@ from rest_framework.views import APIView
 
 from acl_extra_reg_fields.models import ExtraInfo
 
-from .models import SurveyModel, GoogleFormResponseModel, CourseFeedbackModel
-
-def get_access_token():
-    SCOPES = [
-        "https://www.googleapis.com/auth/forms.responses.readonly",
-        "https://www.googleapis.com/auth/forms.body.readonly",
-        "https://www.googleapis.com/auth/drive.file",
-        "https://www.googleapis.com/auth/drive",
-        "openid",
-        "profile",
-        "email",
-    ]
-
-    credentials = service_account.Credentials.from_service_account_info(
-        settings.SERVICE_ACCOUNT_INFO, scopes=SCOPES
-    )
-
-    credentials.refresh(Request())
-    return credentials.token
-
-class PermissionsAccessView(APIView):
+from . import metrics
+from .caching import COURSE_OVERVIEW, DASHBOARD, REGISTRATIONS, TRANSLATIONS
+from .changes import collect_changes, start_cursor
+from .circuit_breaker import CircuitOpenError, StaleFallbackMixin
+from .feeds import page_size, submissions_page
+from .filters import FieldSelection, ResponseFilter, ResponseFilterError, parse_timestamp
+from .formats import REPORT_RENDERER_CLASSES, ColumnarEncoder, wants_columnar
+from .google_forms import (
+    fetch_forms,
+    get_access_token,
+    get_form,
+    get_form_response,
+    get_form_responses,
+    iter_form_responses,
+)
+from .models import (
+    SurveyModel,
+    GoogleFormResponseModel,
+    CourseFeedbackModel,
+    RegistrationSnapshotModel,
+    SurveyFormModel,
+)
+from .rate_limit import google_bucket
+from .registry import get_survey_forms
+from .replica import for_reports
+from .reports import course_feedback_overview, registration_demographics
+from .timing import ServerTimingMixin, phase
+
+
+class SurveyAPIView(ServerTimingMixin, metrics.MetricsViewMixin, APIView):
+    """
+    Base class for survey_api views.
+
+    Adds a ``Server-Timing`` header (and ``?profile=1`` for superusers) and
+    records per-view Prometheus metrics.
+    """
+
+
+class PermissionsAccessView(SurveyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         return Response({"is_allowed": bool(request.user.is_superuser)})
 
 
-class DashboardInfoView(APIView):
+class DashboardInfoView(SurveyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        users = list(User.objects.values('id', 'username', 'email'))
+        return JsonResponse(DASHBOARD.get_or_set("info", self.get_info))
+
+    def get_info(self):
+        """
+        Return the learners and course feedback forms of the dashboard.
+        """
+        users = list(for_reports(User.objects.values('id', 'username', 'email')))
         feedback_forms = [
             {
                 'id': feedback.id,
                 'form_id': feedback.form_id,
                 'course': feedback.course.display_name,
             }
-            for feedback in CourseFeedbackModel.objects.select_related('course').all()
+            for feedback in for_reports(CourseFeedbackModel.objects.select_related('course'))
         ]
 
-        return JsonResponse({ "users": users, "feedback_forms": feedback_forms })
+        return { "users": users, "feedback_forms": feedback_forms }
+
+
+SURVEY_DONE_COOKIE_SALT = "survey_api.survey_done"
 
-class SurveyStatusView(APIView):
+
+def set_survey_done_cookie(response, survey):
+    """
+    Give a completed learner the signed ``SURVEY_DONE_COOKIE_NAME`` cookie.
+
+    Its value is the user id, so the survey popup can skip ``api/status/``
+    for the learner it was issued to. It is readable by the MFEs, and shared
+    with them through ``SESSION_COOKIE_DOMAIN``.
+    """
+    if not survey.is_completed:
+        return response
+    response.set_signed_cookie(
+        getattr(settings, "SURVEY_DONE_COOKIE_NAME", "openedx-survey-done"),
+        str(survey.user_id),
+        salt=SURVEY_DONE_COOKIE_SALT,
+        max_age=getattr(settings, "SURVEY_DONE_COOKIE_AGE", 365 * 24 * 60 * 60),
+        domain=getattr(settings, "SESSION_COOKIE_DOMAIN", None),
+        secure=getattr(settings, "SESSION_COOKIE_SECURE", False),
+        samesite="Lax",
+    )
+    return response
+
+
+class SurveyStatusView(SurveyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         survey, _ = SurveyModel.objects.get_or_create(user=request.user)
-        return Response(
+        response = Response(
             {"status": survey.status, "count": survey.times_shown, "email": request.user.email},
             status=status.HTTP_200_OK,
         )
+        return set_survey_done_cookie(response, survey)
 
     def post(self, request):
         survey, _ = SurveyModel.objects.get_or_create(user=request.user)
         if not survey.is_completed:
             survey.update_count()
-        return Response({"status": survey.status}, status=status.HTTP_200_OK)
+        return set_survey_done_cookie(Response({"status": survey.status}, status=status.HTTP_200_OK), survey)
 
 
-class SurveyCompletedView(APIView):
+def status_wait_timeout(params):
+    """
+    Return the ``?timeout=`` of a status wait in seconds, at most ``SURVEY_STATUS_WAIT_TIMEOUT``.
+
+    Raise ValueError when it is malformed.
+    """
+    max_timeout = getattr(settings, "SURVEY_STATUS_WAIT_TIMEOUT", 10)
+    return min(max(float(params.get("timeout", max_timeout)), 0), max_timeout)
+
+
+class SurveyStatusWaitView(SurveyAPIView):
+    """
+    ``SurveyStatusView`` for the survey popup to poll after it is closed.
+
+    This synchronous view answers at once: waiting here would hold an LMS
+    worker per closed popup, so the popup polls it until ``?timeout=``
+    seconds have passed instead. With ``SURVEY_ASYNC_VIEWS``,
+    ``AsyncSurveyStatusWaitView`` waits for the completion server-side.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Answer with the survey status of the learner.
+        """
+        try:
+            status_wait_timeout(request.query_params)
+        except ValueError:
+            return Response({"error": "timeout must be a number of seconds."}, status=status.HTTP_400_BAD_REQUEST)
+
+        survey, _ = SurveyModel.objects.get_or_create(user=request.user)
+        response = Response(
+            {"status": survey.status, "count": survey.times_shown, "email": request.user.email},
+            status=status.HTTP_200_OK,
+        )
+        return set_survey_done_cookie(response, survey)
+
+
+class SurveyCompletedView(SurveyAPIView):
     def post(self, request):
         email = request.data.get("email")
         if not email:
@@ -96,13 +185,24 @@ class SurveyCompletedView(APIView):
             survey.is_completed = True
             survey.save()
 
-        return Response({"status": survey.status}, status=status.HTTP_200_OK)
+        # Only useful when the learner's browser makes this call; the Google
+        # Form webhook drops it and the learner gets it from api/status/.
+        return set_survey_done_cookie(Response({"status": survey.status}, status=status.HTTP_200_OK), survey)
 
 
-class FormResponses(APIView):
+class FormResponses(StaleFallbackMixin, SurveyAPIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
+    renderer_classes = REPORT_RENDERER_CLASSES
+
+    survey = SurveyFormModel.SURVEY_ONBOARDING
 
     def get(self, request):
+        try:
+            response_filter = ResponseFilter.from_query_params(request.query_params)
+            selection = FieldSelection.from_query_params(request.query_params)
+        except ResponseFilterError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             token = get_access_token()
         except Exception as e:
@@ -110,108 +210,123 @@ class FormResponses(APIView):
 
         headers = {"Authorization": f"Bearer {token}"}
 
-        ID_ENGLISH_FORM = "1MXaneZl67ofajuD9CuEhABtW-xzuWOw-uYfxGLyZ3dA"
-        ID_FRENCH_FORM = "1xjY3XCawFdY5L_NcU4L7HCuDtwaizGg3fIbF8fVlThQ"
-
-        url_en_base = f"https://forms.googleapis.com/v1/forms/{ID_ENGLISH_FORM}"
-        url_fr_base = f"https://forms.googleapis.com/v1/forms/{ID_FRENCH_FORM}"
-        url_en = f"https://forms.googleapis.com/v1/forms/{ID_ENGLISH_FORM}/responses"
-        url_fr = f"https://forms.googleapis.com/v1/forms/{ID_FRENCH_FORM}/responses"
-
         try:
-            resp_en_base = requests.get(url_en_base, headers=headers)
-            resp_en_base.raise_for_status()
-            metaEn = resp_en_base.json()
+            variants = get_survey_forms(self.survey)
+            fetched = fetch_forms([variant.form_id for variant in variants], headers, response_filter.google_filter())
+            forms = [(variant, meta, responses) for variant, (meta, responses) in zip(variants, fetched)]
 
-            resp_fr_base = requests.get(url_fr_base, headers=headers)
-            resp_fr_base.raise_for_status()
-            metaFr = resp_fr_base.json()
+            lang = request.query_params.get('language')
 
-            resp_en = requests.get(url_en, headers=headers)
-            resp_en.raise_for_status()
-            responsesEn = resp_en.json().get("responses", [])
+            with phase("transform"):
+                data = self.build_report(forms, lang, response_filter, selection, wants_columnar(request))
+            return Response(data)
 
-            resp_fr = requests.get(url_fr, headers=headers)
-            resp_fr.raise_for_status()
-            responsesFr = resp_fr.json().get("responses", [])
+        except requests.exceptions.RequestException as e:
+            return JsonResponse({"error": f"API error: {str(e)}"}, status=500)
 
-            lang = request.query_params.get('language')
+    def get_translation_table(self, forms, refresh=False):
+        """
+        Return ``(options, position)`` of the choice questions of ``forms``.
 
+        ``options`` holds the option values of every choice question by
+        locale, and ``position`` the index of each value in any language.
 
-            qmap = {}
-            for meta, code in ((metaEn, "en"), (metaFr, "fr-ca")):
-                form_id = meta.get("formId")
+        Cached per revision of the variants' metadata; ``refresh`` builds it again even when cached.
+        """
+        def load():
+            options = {}   # qid -> {locale: [option values]}
+            position = {}  # qid -> {option value in any language: index}
+            for variant, meta, _ in forms:
                 for item in meta.get("items", []):
                     q = item.get("questionItem", {}).get("question", {})
                     qid = q.get("questionId")
                     if not qid:
                         continue
-                    qmap.setdefault(qid, {"title": {}, "options": {}})
-                    # store title
-                    qmap[qid]["title"][code] = item.get("title", "")
                     # extract choice/checkbox options
                     opts = []
                     if "choiceQuestion" in q:
                         opts = [o["value"] for o in q["choiceQuestion"]["options"]]
                     elif "checkboxQuestion" in q:
                         opts = [o["value"] for o in q["checkboxQuestion"]["options"]]
-                    qmap[qid]["options"][code] = opts
-
-            def translate(qid, raw_value):
-                opts_en = qmap.get(qid, {}).get("options", {}).get("en", [])
-                opts_fr = qmap.get(qid, {}).get("options", {}).get("fr-ca", [])
-                # find index
-                if raw_value in opts_en:
-                    idx = opts_en.index(raw_value)
-                elif raw_value in opts_fr:
-                    idx = opts_fr.index(raw_value)
-                else:
-                    # free-text or unknown -> passthrough
-                    return raw_value
-                # pick target list (fallback to en)
-                tgt_opts = qmap[qid]["options"].get(lang, opts_en)
-                return tgt_opts[idx] if idx < len(tgt_opts) else raw_value
-
-            merged = []
-            for src in (responsesEn, responsesFr):
-                blocks = src.get("responses") if isinstance(src, dict) else src
-                for resp in blocks:
-                    new_ans = {}
-                    for qid, ans_block in resp.get("answers", {}).items():
-                        # extract raw values
-                        raws = []
-                        if "value" in ans_block:
-                            raws = [ans_block["value"]]
-                        elif "textAnswers" in ans_block:
-                            raws = [a["value"] for a in ans_block["textAnswers"]["answers"]]
-
-                        translated = [translate(qid, v) for v in raws]
-
-                        # rebuild the Answer object exactly as Google returns it
-                        new_ans[qid] = {
-                            "questionId": qid,
-                            "textAnswers": {
-                                "answers": [{"value": v} for v in translated]
-                            }
-                        }
+                    options.setdefault(qid, {})[variant.locale] = opts
+                    for idx, value in enumerate(opts):
+                        position.setdefault(qid, {}).setdefault(value, idx)
+            return options, position
+
+        key = ",".join(f"{variant.locale}:{variant.form_id}@{meta.get('revisionId', '')}" for variant, meta, _ in forms)
+        return TRANSLATIONS.get_or_set(key, load, refresh=refresh)
+
+    def build_report(self, forms, lang, response_filter, selection, columnar=False):
+        """
+        Merge the responses of every language variant, translated to ``lang``.
+
+        ``forms`` is a list of ``(SurveyForm, meta, responses)``, default
+        language first. Choice answers are matched by their position in the
+        question's options, so question ids must be shared across variants.
+        """
+        options, position = self.get_translation_table(forms)
+
+        default_locale = forms[0][0].locale if forms else None
+        target = lang if any(variant.locale == lang for variant, _, _ in forms) else default_locale
+
+        def translate(qid, raw_value):
+            idx = position.get(qid, {}).get(raw_value)
+            if idx is None:
+                # free-text or unknown -> passthrough
+                return raw_value
+            # pick target list (fallback to the default language)
+            tgt_opts = options[qid].get(target, options[qid].get(default_locale, []))
+            return tgt_opts[idx] if idx < len(tgt_opts) else raw_value
+
+        meta = next((meta for variant, meta, _ in forms if variant.locale == target), {"items": []})
+        encoder = ColumnarEncoder(selection.items(meta.get("items", []))) if columnar else None
+        merged = []
+        for _, form_meta, form_responses in forms:
+            for resp in form_responses:
+                # drop non-matching responses before doing any transform work
+                if not response_filter.matches(resp, translate):
+                    continue
 
-                    merged.append({
-                        "formId":           resp.get("formId", metaEn.get("formId")),
-                        "responseId":       resp.get("responseId"),
-                        "createTime":       resp.get("createTime"),
-                        "lastSubmittedTime": resp.get("lastSubmittedTime", resp.get("createTime")),
-                        "respondentEmail":  resp.get("respondentEmail"),
-                        "answers":          new_ans
-                    })
+                if encoder is not None:
+                    merged.append(encoder.encode(resp, translate))
+                    continue
 
-            return Response({"responses": merged, "meta": metaEn if lang == "en" else metaFr })
+                new_ans = {}
+                for qid, ans_block in resp.get("answers", {}).items():
+                    if not selection.wants(qid):
+                        continue
+                    # extract raw values
+                    raws = []
+                    if "value" in ans_block:
+                        raws = [ans_block["value"]]
+                    elif "textAnswers" in ans_block:
+                        raws = [a["value"] for a in ans_block["textAnswers"]["answers"]]
+
+                    translated = [translate(qid, v) for v in raws]
+
+                    # rebuild the Answer object exactly as Google returns it
+                    new_ans[qid] = {
+                        "questionId": qid,
+                        "textAnswers": {
+                            "answers": [{"value": v} for v in translated]
+                        }
+                    }
 
+                merged.append({
+                    "formId":           resp.get("formId", form_meta.get("formId")),
+                    "responseId":       resp.get("responseId"),
+                    "createTime":       resp.get("createTime"),
+                    "lastSubmittedTime": resp.get("lastSubmittedTime", resp.get("createTime")),
+                    "respondentEmail":  resp.get("respondentEmail"),
+                    "answers":          new_ans
+                })
 
-        except requests.exceptions.RequestException as e:
-            return JsonResponse({"error": f"API error: {str(e)}"}, status=500)
+        if encoder is not None:
+            return selection.payload(meta, **encoder.payload(merged))
+        return selection.payload(meta, responses=merged)
 
 
-class GoogleFormResponseView(APIView):
+class GoogleFormResponseView(SurveyAPIView):
     permission_classes = [AllowAny]  
 
     def post(self, request):
@@ -258,8 +373,9 @@ class GoogleFormResponseView(APIView):
         )
 
 
-class RegistrationResponsesView(APIView):
+class RegistrationResponsesView(SurveyAPIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = REPORT_RENDERER_CLASSES
 
     def get_items(self):
         lang_options = [
@@ -367,173 +483,350 @@ class RegistrationResponsesView(APIView):
             },
         ]
 
-    def get_responses(self):
-        qs = ExtraInfo.objects.all()
-        out = []
-        for info in qs:
-            out.append({
-                "responseId": str(info.pk),
-                "answers": {
-                    "name": {
-                        "questionId": "name",
-                        "textAnswers": {"answers": [{"value": info.user.profile.name}]}
-                    },
-                    "username": {
-                        "questionId": "username",
-                        "textAnswers": {"answers": [{"value": info.user.username}]}
-                    },
-                    "email": {
-                        "questionId": "email",
-                        "textAnswers": {"answers": [{"value": info.user.email}]}
-                    },
-                    "lastSubmittedTime": {
-                        "questionId": "lastSubmittedTime",
-                        "textAnswers": {"answers": [{"value": info.user.date_joined}]}
-                    },
-                    "yearOfBirth": {
-                        "questionId": "yearOfBirth",
-                        "textAnswers": {"answers": [{"value": info.user.profile.year_of_birth}]}
-                    },
-                    "gender": {
-                        "questionId": "gender",
-                        "textAnswers": {"answers": [{"value": info.user.profile.gender_display}]}
-                    },
-                    "preferred_language": {
-                        "questionId": "preferred_language",
-                        "textAnswers": {
-                            "answers": [{"value": info.get_preferred_language_display()}]
-                        }
-                    },
-                    "referrer": {
-                        "questionId": "referrer",
-                        "textAnswers": {
-                            "answers": [{"value": info.get_referrer_display()}]
-                        }
-                    }
-                }
-            })
-        return out
+    # questionId -> RegistrationSnapshotModel field holding that answer
+    ANSWERS = {
+        "name": "name",
+        "username": "username",
+        "email": "email",
+        "lastSubmittedTime": "date_joined",
+        "yearOfBirth": "year_of_birth",
+        "gender": "gender",
+        "preferred_language": "preferred_language",
+        "referrer": "referrer",
+    }
+
+    def get_answers(self, snapshot, selection=None):
+        """
+        Return the selected registration answers of a snapshot by question id.
+        """
+        return {
+            qid: snapshot[field]
+            for qid, field in self.ANSWERS.items()
+            if selection is None or selection.wants(qid)
+        }
+
+    def get_snapshots(self, username=None):
+        """
+        Snapshot values of every learner, or of the one with ``username``, in ``ExtraInfo`` order.
+        """
+        fields = ["extra_info_id", *self.ANSWERS.values()]
+        if not RegistrationSnapshotModel.objects.rebuilding():
+            snapshots = for_reports(RegistrationSnapshotModel.objects.all())
+            found = list((snapshots if username is None else snapshots.filter(username=username)).values(*fields))
+            if found or (username is not None and snapshots.exists()):
+                return found
+
+        # rebuild_registration_snapshots hasn't filled the table yet, or is refilling it: read the join.
+        infos = for_reports(ExtraInfo.objects.all())
+        if username is not None:
+            infos = infos.filter(user__username=username)
+        return [
+            {field: getattr(snapshot, field) for field in fields}
+            for snapshot in RegistrationSnapshotModel.objects.joined(infos)
+        ]
+
+    def get_records(self):
+        """
+        ``[(responseId, answers)]`` of every learner, cached until a learner changes.
+        """
+        def load():
+            return [(str(snapshot["extra_info_id"]), self.get_answers(snapshot)) for snapshot in self.get_snapshots()]
+
+        return REGISTRATIONS.get_or_set("all", load)
+
+    def build_response(self, response_id, answers, selection=None):
+        """
+        Return ``answers`` as a Google Forms response with the selected questions.
+        """
+        return {
+            "responseId": response_id,
+            "answers": {
+                qid: {"questionId": qid, "textAnswers": {"answers": [{"value": value}]}}
+                for qid, value in answers.items()
+                if selection is None or selection.wants(qid)
+            }
+        }
+
+    def get_responses(self, selection=None):
+        return [self.build_response(pk, answers, selection) for pk, answers in self.get_records()]
+
+    def get_rows(self, encoder, selection=None):
+        """
+        Return the columnar rows of every learner's registration answers.
+        """
+        return [
+            encoder.row(
+                (pk, None, None, None),
+                {qid: [value] for qid, value in answers.items() if selection is None or selection.wants(qid)},
+            )
+            for pk, answers in self.get_records()
+        ]
 
     def get(self, request):
-        return Response({
-            "meta": {"items": self.get_items()},
-            "responses": self.get_responses(),
-        })
-    
+        try:
+            selection = FieldSelection.from_query_params(request.query_params)
+        except ResponseFilterError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        meta = {"items": self.get_items()}
+        if wants_columnar(request):
+            encoder = ColumnarEncoder(selection.items(meta["items"]))
+            with phase("transform"):
+                rows = self.get_rows(encoder, selection)
+            return Response(selection.payload(meta, **encoder.payload(rows)))
+
+        with phase("transform"):
+            responses = self.get_responses(selection)
+        return Response(selection.payload(meta, responses=responses))
+
+
+class RegistrationDemographicsView(SurveyAPIView):
+    """
+    Gender, year of birth, preferred language and referrer histograms of the learners.
+
+    Optionally only those who joined between ``joined_after`` and
+    ``joined_before`` are counted. For charts that don't need the full
+    registration report.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        """
+        Answer with the histograms of the requested window, cached until a learner changes.
+        """
+        try:
+            window = {
+                name: parse_timestamp(request.query_params[name])
+                for name in ("joined_after", "joined_before")
+                if request.query_params.get(name)
+            }
+        except ResponseFilterError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        key = "demographics.{}.{}".format(
+            *(int(window[name].timestamp()) if name in window else "" for name in ("joined_after", "joined_before"))
+        )
+        return Response(REGISTRATIONS.get_or_set(key, lambda: registration_demographics(**window)))
+
+
+class SubmissionFeedView(SurveyAPIView):
+    """
+    Recent course feedback and survey submissions recorded by ``GoogleFormResponseView``.
+
+    Newest first, optionally for one ``form_id`` and between ``submitted_after``
+    and ``submitted_before``. Pass the ``next`` cursor of a page back as
+    ``?cursor=`` to get the following one.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminUser]
 
-class CourseResponseView(APIView):
+    def get(self, request):
+        """
+        Answer with one page of the feed.
+        """
+        params = request.query_params
+        try:
+            window = {
+                name: parse_timestamp(params[name])
+                for name in ("submitted_after", "submitted_before")
+                if params.get(name)
+            }
+            page = submissions_page(
+                form_id=params.get("form_id"),
+                cursor=params.get("cursor"),
+                limit=page_size(params.get("limit")),
+                **window,
+            )
+        except ResponseFilterError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(page)
+
+
+class ChangesView(SurveyAPIView):
+    """
+    What changed in the reports since ``?cursor=``.
+
+    That is new submissions, changed and removed registration rows, survey
+    status changes and, for each ``?form_id=``, the Google responses submitted
+    since. Without a cursor, answers with the cursor to use after loading the
+    full reports. See ``survey_api.changes``.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        """
+        Answer with the changes after ``?cursor=``, or with a cursor to start from.
+        """
+        cursor = request.query_params.get("cursor")
+        if not cursor:
+            return Response({"cursor": start_cursor(), "full_refresh": True})
+
+        form_ids = request.query_params.getlist("form_id")
+        headers = None
+        if form_ids:
+            try:
+                headers = {"Authorization": f"Bearer {get_access_token()}"}
+            except Exception as e:
+                return JsonResponse({"error": f"Token error: {str(e)}"}, status=500)
+
+        registrations = RegistrationResponsesView()
+        try:
+            changes = collect_changes(cursor, registrations.ANSWERS.values(), form_ids, headers)
+        except ResponseFilterError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
+            return JsonResponse({"error": f"API error: {str(e)}"}, status=500)
+
+        if not changes["full_refresh"]:
+            changes["registrations"] = [
+                registrations.build_response(str(snapshot["extra_info_id"]), registrations.get_answers(snapshot))
+                for snapshot in changes["registrations"]
+            ]
+        return Response(changes)
+
+
+class CourseResponseView(StaleFallbackMixin, SurveyAPIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = REPORT_RENDERER_CLASSES
 
     def get(self, request):
         form_id = request.query_params.get('form_id')
-        
+
+        try:
+            response_filter = ResponseFilter.from_query_params(request.query_params)
+            selection = FieldSelection.from_query_params(request.query_params)
+        except ResponseFilterError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             token = get_access_token()
         except Exception as e:
             return JsonResponse({"error": f"Token error: {str(e)}"}, status=500)
 
-        url_base = f"https://forms.googleapis.com/v1/forms/{form_id}"
-        url_responses = f"https://forms.googleapis.com/v1/forms/{form_id}/responses"
-
         headers = {"Authorization": f"Bearer {token}"}
 
         try: 
-            meta = requests.get(url_base, headers=headers)
-            meta.raise_for_status()
-            meta = meta.json()
-
-            responses = requests.get(url_responses, headers=headers)
-            responses.raise_for_status()
-            responses = responses.json()
+            meta = get_form(form_id, headers)
+            google_filter = response_filter.google_filter()
+            data = self.build_report(
+                meta,
+                iter_form_responses(form_id, headers, google_filter)
+                if google_filter else get_form_responses(form_id, headers),
+                response_filter,
+                selection,
+                wants_columnar(request),
+            )
 
         except requests.exceptions.RequestException as e:
             return JsonResponse({"error": f"API error: {str(e)}"}, status=500)
-        return JsonResponse({
-            "meta": meta,
-            "responses": responses['responses']
-        })
-    
 
+        return JsonResponse(data)
+
+    def build_report(self, meta, responses, response_filter, selection, columnar=False):
+        """
+        Return the payload of the ``responses`` matching ``response_filter``, projected on ``selection``.
+        """
+        responses = (
+            selection.response(resp)
+            for resp in responses
+            if response_filter.matches(resp)
+        )
+        if columnar:
+            encoder = ColumnarEncoder(selection.items(meta.get("items", [])))
+            with phase("transform"):
+                rows = [encoder.encode(resp) for resp in responses]
+            return selection.payload(meta, **encoder.payload(rows))
+        return selection.payload(meta, responses=list(responses))
+
+
+class CourseFeedbackOverviewView(StaleFallbackMixin, SurveyAPIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        """
+        Answer with the feedback overview of every course.
+        """
+        try:
+            courses = self.get_courses()
+        except (RefreshError, RequestException) as e:
+            # CircuitOpenError and RateLimitExceeded are left to StaleFallbackMixin and DRF.
+            return JsonResponse({"error": f"Token error: {str(e)}"}, status=500)
+
+        return JsonResponse({"courses": courses})
+
+    def get_courses(self, refresh=False):
+        """
+        Return the overview rows, cached unless a form failed; ``refresh`` rebuilds them.
+        """
+        def get_headers():
+            return {"Authorization": f"Bearer {get_access_token()}"}
+
+        def timeout(courses):
+            # Don't pin partial results for the whole TTL when a form failed.
+            return 0 if any("error" in row for row in courses) else None
+
+        return COURSE_OVERVIEW.get_or_set(
+            "courses", lambda: course_feedback_overview(get_headers), timeout=timeout, refresh=refresh
+        )
 
-class UserRegistrationView(APIView):
+
+class UserRegistrationView(SurveyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_items(self):
         return RegistrationResponsesView().get_items()
 
-    def get_responses(self, username):
-        try:
-            user = get_object_or_404(User, username=username)
-            info = ExtraInfo.objects.select_related('user').get(user=user)
-        except ExtraInfo.DoesNotExist:
+    def get_record(self, username):
+        """
+        ``(responseId, answers)`` of the learner, or ``()`` when they have no registration info.
+        """
+        def load():
+            view = RegistrationResponsesView()
+            snapshots = view.get_snapshots(username=username)
+            if not snapshots:
+                # 404 for unknown users, empty report for users without registration info
+                get_object_or_404(for_reports(User.objects), username=username)
+                return ()
+            return (str(snapshots[0]["extra_info_id"]), view.get_answers(snapshots[0]))
+
+        return REGISTRATIONS.get_or_set(f"user.{username}", load)
+
+    def get_responses(self, username, selection=None):
+        record = self.get_record(username)
+        if not record:
             return []
-
-        return [{
-            "responseId": str(info.pk),
-            "answers": {
-                "name": {
-                    "questionId": "name",
-                    "textAnswers": {"answers": [{"value": info.user.profile.name}]}
-                },
-                "username": {
-                    "questionId": "username",
-                    "textAnswers": {"answers": [{"value": info.user.username}]}
-                },
-                "email": {
-                    "questionId": "email",
-                    "textAnswers": {"answers": [{"value": info.user.email}]}
-                },
-                "lastSubmittedTime": {
-                    "questionId": "lastSubmittedTime",
-                    "textAnswers": {"answers": [{"value": info.user.date_joined}]}
-                },
-                "yearOfBirth": {
-                    "questionId": "yearOfBirth",
-                    "textAnswers": {"answers": [{"value": info.user.profile.year_of_birth}]}
-                },
-                "gender": {
-                    "questionId": "gender",
-                    "textAnswers": {"answers": [{"value": info.user.profile.gender_display}]}
-                },
-                "preferred_language": {
-                    "questionId": "preferred_language",
-                    "textAnswers": {
-                        "answers": [{"value": info.get_preferred_language_display()}]
-                    }
-                },
-                "referrer": {
-                    "questionId": "referrer",
-                    "textAnswers": {
-                        "answers": [{"value": info.get_referrer_display()}]
-                    }
-                }
-            }
-        }]
+        return [RegistrationResponsesView().build_response(*record, selection)]
 
     def get(self, request):
 
         username = request.query_params.get('username')
 
-        responses = self.get_responses(username)
+        try:
+            selection = FieldSelection.from_query_params(request.query_params)
+        except ResponseFilterError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        responses = self.get_responses(username, selection)
         if not responses:
-            return Response({
-                "meta": {"items": []},
-                "responses": []
-            })
+            return Response(selection.payload({"items": []}, responses=[]))
 
-        return Response({
-            "meta": {"items": self.get_items()},
-            "responses": responses
-        })
+        return Response(selection.payload({"items": self.get_items()}, responses=responses))
 
 
-class UserCourseView(APIView):
+class UserCourseView(StaleFallbackMixin, SurveyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         form_id = request.query_params.get('form_id')
         username = request.query_params.get('username')
 
+        try:
+            selection = FieldSelection.from_query_params(request.query_params)
+        except ResponseFilterError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         user = get_object_or_404(User, username=username)
 
         try:
@@ -542,48 +835,38 @@ class UserCourseView(APIView):
             submission = None
 
         if not submission: 
-            return JsonResponse({
-                "meta": {"items": []},
-                "responses": []
-            })
+            return JsonResponse(selection.payload({"items": []}, responses=[]))
 
         try:
             token = get_access_token()
         except Exception as e:
             return JsonResponse({"error": f"Token error: {str(e)}"}, status=500)
 
-        url_base = f"https://forms.googleapis.com/v1/forms/{form_id}"
-        url_responses = f"https://forms.googleapis.com/v1/forms/{form_id}/responses/{submission.response_id}"
-
         headers = {"Authorization": f"Bearer {token}"}        
 
         try: 
-            meta = requests.get(url_base, headers=headers)
-            meta.raise_for_status()
-            meta = meta.json()
-
-            responses = requests.get(url_responses, headers=headers)
-            responses.raise_for_status()
-            responses = responses.json()
+            meta = get_form(form_id, headers)
+            responses = get_form_response(form_id, submission.response_id, headers)
 
         except requests.exceptions.RequestException as e:
             return JsonResponse({"error": f"API error: {str(e)}"}, status=500)
         
-        return JsonResponse({
-            "meta": meta,
-            "responses": [responses]
-        })
+        return JsonResponse(selection.payload(meta, responses=[selection.response(responses)]))
     
 
-class UserOnboardingView(APIView):
+class UserOnboardingView(StaleFallbackMixin, SurveyAPIView):
     permission_classes = [IsAuthenticated]
 
-    ID_ENGLISH_FORM = "1MXaneZl67ofajuD9CuEhABtW-xzuWOw-uYfxGLyZ3dA"
-    ID_FRENCH_FORM = "1xjY3XCawFdY5L_NcU4L7HCuDtwaizGg3fIbF8fVlThQ"
+    survey = SurveyFormModel.SURVEY_ONBOARDING
 
     def get(self, request):
         email = request.query_params.get('email')
 
+        try:
+            selection = FieldSelection.from_query_params(request.query_params)
+        except ResponseFilterError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             token = get_access_token()
         except Exception as e:
@@ -591,110 +874,132 @@ class UserOnboardingView(APIView):
         
         headers = {"Authorization": f"Bearer {token}"}        
 
-        def get_form_responses(form_id, headers):
-            """
-            Fetch form metadata and all responses from Google Forms API.
-            Raises RuntimeError on any network/HTTP failure.
-            """
-            base_url = f"https://forms.googleapis.com/v1/forms/{form_id}"
-            try:
-                # Metadata (to find question IDs)
-                resp_meta = requests.get(base_url, headers=headers)
-                resp_meta.raise_for_status()
-                meta = resp_meta.json()
-
-                # All responses
-                resp_data = requests.get(f"{base_url}/responses", headers=headers)
-                resp_data.raise_for_status()
-                responses = resp_data.json().get("responses", [])
-
-                return meta, responses
-
-            except RequestException as e:
-                raise RuntimeError(f"Google Forms API request failed for form {form_id}: {e}")
-            
-        def find_email_question_id(form_meta, email_field_titles):
-            """
-            Scan form metadata for any item whose title matches one of
-            email_field_titles, and return its questionId.
-            """
-            for item in form_meta.get("items", []):
-                title = item.get("title", "").strip()
-                q = item.get("questionItem", {}).get("question", {})
-                qid = q.get("questionId")
-                if title in email_field_titles and qid:
-                    return qid
-            return None
-        
-        def find_response_by_email(responses, email_qid, email_to_find):
-            """
-            Look through each response's answers[email_qid] for a match
-            against email_to_find. Supports both textAnswers and emailAnswer.
-            Returns the first matching response dict, or None.
-            """
-            for resp in responses:
-                ans = resp.get("answers", {}).get(email_qid)
-                if not ans:
-                    continue
-
-                # Try textAnswers → list of {"value": "..."}
-                if "textAnswers" in ans:
-                    for a in ans["textAnswers"].get("answers", []):
-                        if a.get("value", "").strip().lower() == email_to_find.lower():
-                            return resp
-
-                # Fallback to emailAnswer → {"email": "..."}
-                if "emailAnswer" in ans:
-                    if ans["emailAnswer"].get("email", "").strip().lower() == email_to_find.lower():
-                        return resp
-
-            return None
-
+        variants = get_survey_forms(self.survey)
         try:
-            meta_en, responses_en = get_form_responses(self.ID_ENGLISH_FORM, headers)
-            meta_fr, responses_fr = get_form_responses(self.ID_FRENCH_FORM, headers)
-        except RuntimeError as e:
+            # Metadata (to find question IDs) and all responses of every language variant
+            fetched = fetch_forms([variant.form_id for variant in variants], headers)
+        except RequestException as e:
             return Response(
-                {"error": str(e)},
+                {"error": f"Google Forms API request failed: {e}"},
                 status=status.HTTP_502_BAD_GATEWAY
             )
-        
-        qid_en = find_email_question_id(meta_en, {"Email address"})
-        qid_fr = find_email_question_id(meta_fr, {"Adresse e-mail"})
 
-        if not qid_en and not qid_fr:
-            return Response(
-                {"error": "Could not locate an email question in either form."},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        forms = [(variant, meta, responses) for variant, (meta, responses) in zip(variants, fetched)]
+        data, status_code = self.build_report(email, selection, forms)
+        if status_code != status.HTTP_200_OK:
+            return Response(data, status=status_code)
+        return JsonResponse(data)
+
+    def find_email_question_id(self, form_meta, email_field_titles):
+        """
+        Return the questionId of the item whose title is one of ``email_field_titles``, or None.
+        """
+        for item in form_meta.get("items", []):
+            title = item.get("title", "").strip()
+            q = item.get("questionItem", {}).get("question", {})
+            qid = q.get("questionId")
+            if title in email_field_titles and qid:
+                return qid
+        return None
+
+    def find_response_by_email(self, responses, email_qid, email_to_find):
+        """
+        Return the first response whose ``email_qid`` answer is ``email_to_find``, or None.
+
+        Supports both textAnswers and emailAnswer.
+        """
+        for resp in responses:
+            ans = resp.get("answers", {}).get(email_qid)
+            if not ans:
+                continue
+
+            # Try textAnswers → list of {"value": "..."}
+            if "textAnswers" in ans:
+                for a in ans["textAnswers"].get("answers", []):
+                    if a.get("value", "").strip().lower() == email_to_find.lower():
+                        return resp
+
+            # Fallback to emailAnswer → {"email": "..."}
+            if "emailAnswer" in ans:
+                if ans["emailAnswer"].get("email", "").strip().lower() == email_to_find.lower():
+                    return resp
+
+        return None
 
+    def build_report(self, email, selection, forms):
+        """
+        Return ``(data, status_code)`` for the response of ``email`` in the first variant that has one.
+
+        ``forms`` is a list of ``(SurveyForm, meta, responses)``.
+        """
+        email_qids = [
+            self.find_email_question_id(meta, {variant.email_question})
+            for variant, meta, _ in forms
+        ]
+
+        if not any(email_qids):
+            return (
+                {"error": "Could not locate an email question in any language variant of the form."},
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
 
         try:
-            match = None
-            match_meta = None
-            if qid_en:
-                match = find_response_by_email(responses_en, qid_en, email)
-                if match:
-                    match_meta = meta_en
-            if qid_fr and match is None:
-                match = find_response_by_email(responses_fr, qid_fr, email)
-                if match:
-                    match_meta = meta_fr
+            with phase("transform"):
+                match = None
+                match_meta = None
+                for qid, (_, meta, responses) in zip(email_qids, forms):
+                    if not qid:
+                        continue
+                    match = self.find_response_by_email(responses, qid, email)
+                    if match:
+                        match_meta = meta
+                        break
 
         except Exception as e:
-            return Response(
+            return (
                 {"error": f"Error scanning form responses: {str(e)}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-        
 
         if match:
-            return JsonResponse({
-                "meta": match_meta,
-                "responses": [match]
-            })
-        else:
-            return JsonResponse({
-                "meta": {"items": []},
-                "responses": []
-            })
\ No newline at end of file
+            return selection.payload(match_meta, responses=[selection.response(match)]), status.HTTP_200_OK
+        return selection.payload({"items": []}, responses=[]), status.HTTP_200_OK
+
+
+class GoogleQuotaView(SurveyAPIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        """
+        Answer with the usage of the shared Google Forms rate limit.
+        """
+        return Response(google_bucket.usage())
+
+
+class MetricsView(APIView):
+    """
+    Prometheus scrape endpoint.
+
+    Requires ``Authorization: Bearer <SURVEY_METRICS_TOKEN>`` when that setting
+    is configured, an admin user otherwise. Returns 404 when
+    ``prometheus_client`` is not installed.
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        """
+        Answer with the metrics in the Prometheus text format.
+        """
+        if not metrics.ENABLED:
+            return Response({"detail": "Metrics are not enabled."}, status=status.HTTP_404_NOT_FOUND)
+
+        token = getattr(settings, "SURVEY_METRICS_TOKEN", None)
+        if token:
+            if request.META.get("HTTP_AUTHORIZATION") != f"Bearer {token}":
+                return Response(status=status.HTTP_403_FORBIDDEN)
+        elif not request.user.is_staff:
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        body, content_type = metrics.render_latest()
+        return HttpResponse(body, content_type=content_type)
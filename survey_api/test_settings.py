@@ -3,8 +3,12 @@ These settings are here to use during tests, because django requires them.
 
 In a real-world use case, apps in this project are installed into other
 Django applications, so these settings will not be used.
+
+The tests run without an edx-platform checkout: its imports are served by the
+stand-ins under ``test_utils/edx_stubs``.
 """
 
+import sys
 from os.path import abspath, dirname, join
 
 
@@ -15,6 +19,9 @@ def root(*args):
     return join(abspath(dirname(__file__)), *args)
 
 
+sys.path.insert(0, root('test_utils', 'edx_stubs'))
+
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -32,6 +39,10 @@ INSTALLED_APPS = (
     'django.contrib.contenttypes',
     'django.contrib.messages',
     'django.contrib.sessions',
+    'rest_framework',
+    'openedx.core.djangoapps.content.course_overviews',
+    'common.djangoapps.student',
+    'acl_extra_reg_fields',
     'survey_api',
 )
 
@@ -44,9 +55,9 @@ ROOT_URLCONF = 'survey_api.urls'
 SECRET_KEY = 'insecure-secret-key'
 
 MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
 )
 
 TEMPLATES = [{
@@ -59,3 +70,23 @@ TEMPLATES = [{
         ],
     },
 }]
+
+# survey_api migrations depend on edx-platform apps; build tables from the models instead.
+MIGRATION_MODULES = {'survey_api': None}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+USE_TZ = True
+
+SERVICE_ACCOUNT_INFO = {}
+
+# Overridden per test by the fake_google fixture.
+SURVEY_FORMS_API_URL = 'http://127.0.0.1:0/v1/forms'
+
+# Keep the shared Google rate limiter in the code path without ever throttling a test.
+SURVEY_GOOGLE_RATE_LIMIT = 10 ** 9
+SURVEY_GOOGLE_BURST = 10 ** 6
@@ -0,0 +1,41 @@
+"""
+A controllable stand-in for the ``time`` module.
+"""
+
+
+class FakeClock:
+    """
+    Replaces a module's ``time`` import in tests; sleeping moves the clock forward.
+    """
+
+    def __init__(self):
+        """
+        Start the clock at an arbitrary fixed time.
+        """
+        self.now = 1_000_000.0
+        self.slept = []
+
+    def time(self):
+        """
+        Return the current fake time.
+        """
+        return self.now
+
+    def monotonic(self):
+        """
+        Return the current fake time.
+        """
+        return self.now
+
+    def perf_counter(self):
+        """
+        Return the current fake time.
+        """
+        return self.now
+
+    def sleep(self, seconds):
+        """
+        Record the sleep and move the clock forward by ``seconds``.
+        """
+        self.slept.append(seconds)
+        self.now += seconds
@@ -0,0 +1,165 @@
+"""
+Synthetic data for the tests and benchmarks: LMS rows and Google Forms payloads.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+from acl_extra_reg_fields.models import ExtraInfo
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.models.user import UserProfile
+from django.contrib.auth.models import User
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+from survey_api.models import CourseFeedbackModel, GoogleFormResponseModel, RegistrationSnapshotModel, SurveyModel
+from survey_api.registry import get_survey_forms
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+EMAIL_TITLES = {"en": "Email address", "fr-ca": "Adresse e-mail"}
+
+QUESTIONS = [
+    # (questionId, {lang: title}, {lang: options} or None for free text, checkbox?)
+    ("email", EMAIL_TITLES, None, False),
+    ("role", {"en": "Role", "fr-ca": "Rôle"},
+     {"en": ["Student", "Teacher", "Other"], "fr-ca": ["Étudiant", "Enseignant", "Autre"]}, False),
+    ("topics", {"en": "Topics", "fr-ca": "Sujets"},
+     {"en": ["Math", "Science", "Art", "History"], "fr-ca": ["Maths", "Sciences", "Art", "Histoire"]}, True),
+    ("rating", {"en": "Rating", "fr-ca": "Note"},
+     {"en": ["1", "2", "3", "4", "5"], "fr-ca": ["1", "2", "3", "4", "5"]}, False),
+    ("comments", {"en": "Comments", "fr-ca": "Commentaires"}, None, False),
+]
+
+
+def learner_email(index):
+    """
+    Return the email of learner ``index``.
+    """
+    return f"learner{index}@example.com"
+
+
+def timestamp(offset_seconds):
+    """
+    Return the Google timestamp ``offset_seconds`` after the data's epoch.
+    """
+    return (EPOCH + timedelta(seconds=offset_seconds)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def make_form(form_id, language="en"):
+    """
+    Form metadata shaped like ``forms.get``; question ids are shared across languages.
+    """
+    items = []
+    for qid, titles, options, checkbox in QUESTIONS:
+        question = {"questionId": qid}
+        if options is None:
+            question["textQuestion"] = {}
+        elif checkbox:
+            question["checkboxQuestion"] = {"options": [{"value": v} for v in options[language]]}
+        else:
+            question["choiceQuestion"] = {"type": "RADIO", "options": [{"value": v} for v in options[language]]}
+        items.append({"itemId": f"item-{qid}", "title": titles[language], "questionItem": {"question": question}})
+    return {"formId": form_id, "info": {"title": f"Form {form_id}"}, "items": items}
+
+
+def make_responses(form_id, count, language="en", first_learner=0, seed=0):
+    """
+    ``count`` responses shaped like ``forms.responses.list``, one per learner starting at ``first_learner``.
+    """
+    rng = random.Random(seed)
+    options = {qid: opts[language] for qid, _, opts, _ in QUESTIONS if opts}
+    responses = []
+    for i in range(count):
+        learner = first_learner + i
+        answers = {
+            "email": {"questionId": "email", "textAnswers": {"answers": [{"value": learner_email(learner)}]}},
+            "role": {"questionId": "role", "textAnswers": {"answers": [{"value": rng.choice(options["role"])}]}},
+            "topics": {"questionId": "topics", "textAnswers": {
+                "answers": [{"value": v} for v in rng.sample(options["topics"], rng.randint(1, 3))]
+            }},
+            "rating": {"questionId": "rating", "textAnswers": {"answers": [{"value": rng.choice(options["rating"])}]}},
+            "comments": {"questionId": "comments", "textAnswers": {"answers": [{"value": f"Comment {learner}"}]}},
+        }
+        responses.append({
+            "formId": form_id,
+            "responseId": f"{form_id}-r{i}",
+            "createTime": timestamp(i * 60),
+            "lastSubmittedTime": timestamp(i * 60 + 30),
+            "respondentEmail": learner_email(learner),
+            "answers": answers,
+        })
+    return responses
+
+
+def add_onboarding_forms(fake_google, count):
+    """
+    Serve every registered onboarding form with ``count`` responses each (distinct learners).
+
+    Variants in a language the synthetic questions don't have are served in English.
+    """
+    for i, variant in enumerate(get_survey_forms()):
+        language = variant.locale if variant.locale in EMAIL_TITLES else "en"
+        fake_google.add_form(
+            make_form(variant.form_id, language),
+            make_responses(variant.form_id, count, language, first_learner=i * count),
+        )
+
+
+def create_learners(count, seed=0):
+    """
+    Bulk-create ``count`` users with ``UserProfile``, ``ExtraInfo`` and ``SurveyModel`` rows.
+    """
+    rng = random.Random(seed)
+    start = User.objects.count()
+    users = User.objects.bulk_create([
+        User(username=f"learner{start + i}", email=learner_email(start + i), date_joined=EPOCH + timedelta(hours=i))
+        for i in range(count)
+    ])
+    if users and users[0].pk is None:
+        users = list(User.objects.order_by("id")[start:start + count])
+
+    genders = [code for code, _ in UserProfile.GENDER_CHOICES]
+    languages = [code for code, _ in ExtraInfo.LANGUAGES]
+    referrers = [code for code, _ in ExtraInfo.SOCIAL_NETWORKS]
+    UserProfile.objects.bulk_create([
+        UserProfile(user=user, name=f"Learner {user.pk}", year_of_birth=rng.randint(1950, 2008),
+                    gender=rng.choice(genders))
+        for user in users
+    ])
+    ExtraInfo.objects.bulk_create([
+        ExtraInfo(user=user, preferred_language=rng.choice(languages), referrer=rng.choice(referrers))
+        for user in users
+    ])
+    SurveyModel.objects.bulk_create([
+        SurveyModel(user=user, times_shown=rng.randint(0, 4), is_completed=rng.random() < 0.5)
+        for user in users
+    ])
+    # bulk_create skips the signals that keep the snapshots current.
+    RegistrationSnapshotModel.objects.rebuild()
+    return users
+
+
+def create_courses(count, learners=()):
+    """
+    Create ``count`` courses with a feedback form each, enrolling every learner in all of them.
+    """
+    courses = CourseOverview.objects.bulk_create([
+        CourseOverview(id=f"course-v1:Bench+C{i}+Run", display_name=f"Course {i}") for i in range(count)
+    ])
+    CourseFeedbackModel.objects.bulk_create([
+        CourseFeedbackModel(course=course, form_id=f"course-form-{i}") for i, course in enumerate(courses)
+    ])
+    CourseEnrollment.objects.bulk_create([
+        CourseEnrollment(user=user, course_id=course.id) for course in courses for user in learners
+    ])
+    return courses
+
+
+def create_form_submissions(form_id, users):
+    """
+    ``GoogleFormResponseModel`` rows for ``users``, matching the ids of ``make_responses(form_id, len(users))``.
+    """
+    return GoogleFormResponseModel.objects.bulk_create([
+        GoogleFormResponseModel(user=user, form_id=form_id, response_id=f"{form_id}-r{i}",
+                                submitted_at=EPOCH + timedelta(seconds=i * 60 + 30))
+        for i, user in enumerate(users)
+    ])
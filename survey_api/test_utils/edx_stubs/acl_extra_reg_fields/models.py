@@ -0,0 +1,17 @@
+"""
+Stand-in for ``acl_extra_reg_fields.models``.
+"""
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class ExtraInfo(models.Model):
+    LANGUAGES = (("en", "English"), ("fr", "French"))
+    SOCIAL_NETWORKS = (("facebook", "Facebook"), ("linkedin", "LinkedIn"), ("other", "Other"))
+
+    user = models.OneToOneField(User, null=True, on_delete=models.CASCADE)
+    preferred_language = models.CharField(max_length=16, choices=LANGUAGES, blank=True)
+    referrer = models.CharField(max_length=32, choices=SOCIAL_NETWORKS, blank=True)
+
+    class Meta:
+        app_label = "acl_extra_reg_fields"
@@ -0,0 +1,16 @@
+"""
+Stand-in for ``common.djangoapps.student.models`` (edx-platform).
+"""
+from django.contrib.auth.models import User
+from django.db import models
+
+from .user import UserProfile
+
+
+class CourseEnrollment(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    course_id = models.CharField(max_length=255, db_index=True)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        app_label = "student"
@@ -0,0 +1,21 @@
+"""
+Stand-in for ``common.djangoapps.student.models.user`` (edx-platform).
+"""
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class UserProfile(models.Model):
+    GENDER_CHOICES = (("m", "Male"), ("f", "Female"), ("o", "Other/Prefer Not to Say"))
+
+    user = models.OneToOneField(User, unique=True, on_delete=models.CASCADE, related_name="profile")
+    name = models.CharField(blank=True, max_length=255, db_index=True)
+    year_of_birth = models.IntegerField(blank=True, null=True, db_index=True)
+    gender = models.CharField(blank=True, null=True, max_length=6, db_index=True, choices=GENDER_CHOICES)
+
+    class Meta:
+        app_label = "student"
+
+    @property
+    def gender_display(self):
+        return self.get_gender_display()
@@ -0,0 +1,9 @@
+"""
+Stand-in for ``edx_django_utils.plugins.constants``.
+"""
+class PluginURLs:
+    CONFIG = "url_config"
+    NAMESPACE = "namespace"
+    APP_NAME = "app_name"
+    REGEX = "regex"
+    RELATIVE_PATH = "relative_path"
@@ -0,0 +1,6 @@
+"""
+Stand-in for ``openedx.core.djangoapps.plugins.constants`` (edx-platform).
+"""
+class ProjectType:
+    LMS = "lms.djangoapp"
+    CMS = "cms.djangoapp"
@@ -0,0 +1,8 @@
+"""
+Stand-in for ``openedx.core.djangoapps.user_api.accounts.signals`` (edx-platform).
+"""
+from django.dispatch import Signal
+
+# Sent with ``user`` once the LMS has retired the learner's account data.
+USER_RETIRE_LMS_CRITICAL = Signal()
+USER_RETIRE_LMS_MISC = Signal()
@@ -0,0 +1,150 @@
+"""
+A local stand-in for the Google Forms API.
+
+Serves ``GET /v1/forms/{formId}``, ``GET /v1/forms/{formId}/responses`` (with
+``pageSize``/``pageToken`` pagination and the ``timestamp >=``/``>`` filter)
+and ``GET /v1/forms/{formId}/responses/{responseId}`` from in-memory forms,
+optionally sleeping ``latency`` seconds per request to mimic the network.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.utils.dateparse import parse_datetime
+
+
+class FakeGoogleForms:
+    """
+    In-memory Google Forms API served over HTTP from a background thread.
+    """
+
+    def __init__(self, page_size=5000, latency=0.0):
+        """
+        Serve ``page_size`` responses per page, each request taking ``latency`` seconds longer.
+        """
+        self.page_size = page_size
+        self.latency = latency
+        self.forms = {}
+        self.request_count = 0
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        The Forms API base url of the running server.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/forms"
+
+    def add_form(self, meta, responses):
+        """
+        Serve the form ``meta`` and its ``responses``, replacing any earlier version.
+        """
+        self.forms[meta["formId"]] = {
+            "meta": meta,
+            "responses": responses,
+            "by_id": {resp["responseId"]: resp for resp in responses},
+        }
+
+    def reset(self):
+        """
+        Forget every form and the request count.
+        """
+        self.forms.clear()
+        self.request_count = 0
+
+    def start(self):
+        """
+        Start serving from a daemon thread and return the server.
+        """
+        fake = self
+
+        class Handler(_Handler):
+            google = fake
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Shut the server down.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def _timestamp_filter(expression):
+    """
+    Turn ``timestamp >= X`` / ``timestamp > X`` into a predicate on responses.
+    """
+    if not expression:
+        return lambda resp: True
+    _, op, value = expression.split(None, 2)
+    bound = parse_datetime(value)
+
+    def predicate(resp):
+        stamp = parse_datetime(resp.get("lastSubmittedTime", resp["createTime"]))
+        return stamp >= bound if op == ">=" else stamp > bound
+
+    return predicate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    google = None
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (e.g. its timeout expired while we slept).
+            pass
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        google = self.google
+        google.request_count += 1
+        if google.latency:
+            time.sleep(google.latency)
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = url.path.strip("/").split("/")
+        # v1 / forms / {formId} [/ responses [/ {responseId}]]
+        if len(parts) < 3 or parts[:2] != ["v1", "forms"] or parts[2] not in google.forms:
+            return self._send(404, {"error": {"code": 404, "message": "Requested entity was not found."}})
+        form = google.forms[parts[2]]
+
+        if len(parts) == 3:
+            return self._send(200, form["meta"])
+
+        if len(parts) == 5:
+            resp = form["by_id"].get(parts[4])
+            if resp is None:
+                return self._send(404, {"error": {"code": 404, "message": "Requested entity was not found."}})
+            return self._send(200, resp)
+
+        matches = _timestamp_filter(query.get("filter", [None])[0])
+        responses = [resp for resp in form["responses"] if matches(resp)]
+        page_size = int(query.get("pageSize", [google.page_size])[0])
+        offset = int(query.get("pageToken", ["0"])[0])
+        body = {}
+        page = responses[offset:offset + page_size]
+        if page:
+            body["responses"] = page
+        if offset + page_size < len(responses):
+            body["nextPageToken"] = str(offset + page_size)
+        return self._send(200, body)
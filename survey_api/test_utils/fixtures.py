@@ -0,0 +1,63 @@
+"""
+pytest fixtures shared by the tests and the benchmarks; their conftest modules import them.
+
+``SURVEY_BENCH_GOOGLE_LATENCY`` (seconds per call) and
+``SURVEY_BENCH_PAGE_SIZE`` tune the Google Forms stand-in.
+"""
+import os
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from survey_api.caching import clear_local
+from test_utils.fake_google import FakeGoogleForms
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Start every test with empty shared and in-process caches.
+    """
+    cache.clear()
+    clear_local()
+
+
+@pytest.fixture(scope="session")
+def fake_google_server():
+    """
+    One Google Forms stand-in for the session, configured by the ``SURVEY_BENCH_*`` environment variables.
+    """
+    server = FakeGoogleForms(
+        page_size=int(os.environ.get("SURVEY_BENCH_PAGE_SIZE", "5000")),
+        latency=float(os.environ.get("SURVEY_BENCH_GOOGLE_LATENCY", "0")),
+    ).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fake_google(fake_google_server, settings, monkeypatch):
+    """
+    Return the Google Forms stand-in, emptied, with survey_api pointed at it and token refresh stubbed out.
+
+    The cache is cleared too, so no form data survives from an earlier test.
+    """
+    fake_google_server.reset()
+    cache.clear()
+    settings.SURVEY_FORMS_API_URL = fake_google_server.url
+    monkeypatch.setattr("survey_api.views.get_access_token", lambda: "bench-token")
+    return fake_google_server
+
+
+@pytest.fixture
+def admin_client(django_user_model):
+    """
+    Return an API client authenticated as a superuser.
+    """
+    admin = django_user_model.objects.create(
+        username="bench-admin", email="bench-admin@example.com", is_staff=True, is_superuser=True,
+    )
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
@@ -0,0 +1,5 @@
+"""
+Fixtures for the tests.
+"""
+# pylint: disable=unused-import
+from test_utils.fixtures import admin_client, clear_caches, fake_google, fake_google_server
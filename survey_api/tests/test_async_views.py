@@ -0,0 +1,177 @@
+"""
+Tests of the async Google-bound views against their synchronous counterparts.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIClient
+
+from test_utils import datagen
+from test_utils.clock import FakeClock
+
+pytest.importorskip("httpx")
+
+from survey_api import async_views  # pylint: disable=wrong-import-position
+from survey_api.circuit_breaker import google_breaker  # pylint: disable=wrong-import-position
+from survey_api.models import SurveyModel  # pylint: disable=wrong-import-position
+from survey_api.registry import get_survey_forms  # pylint: disable=wrong-import-position
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def async_get(fake_google, admin_client, django_user_model, monkeypatch):
+    """
+    Call an async view as the test admin and return ``(status_code, body)``.
+    """
+    async def token():
+        return "bench-token"
+
+    monkeypatch.setattr(async_views, "aget_access_token", token)
+    admin = django_user_model.objects.get(username="bench-admin")
+
+    def get(view_class, path):
+        request = AsyncRequestFactory().get(path)
+        request.user = admin
+        response = async_to_sync(view_class.as_view())(request)
+        return response.status_code, json.loads(response.content)
+
+    return get
+
+
+def test_async_course_views(fake_google, admin_client, async_get):
+    datagen.add_onboarding_forms(fake_google, 10)
+    form_id = get_survey_forms()[0].form_id
+    path = f"/api/responses/course/q?form_id={form_id}&format=columnar&fields=role"
+    assert async_get(async_views.AsyncCourseResponseView, path) == (200, admin_client.get(path).json())
+
+    learner = datagen.create_learners(1)[0]
+    datagen.create_form_submissions(form_id, [learner])
+    path = f"/api/user/course/q?form_id={form_id}&username={learner.username}"
+    assert async_get(async_views.AsyncUserCourseView, path) == (200, admin_client.get(path).json())
+    assert async_get(async_views.AsyncUserCourseView, f"{path}-missing")[0] == 404
+
+
+def test_async_views_share_the_google_caches(fake_google, admin_client, async_get):
+    datagen.add_onboarding_forms(fake_google, 10)
+    form_id = get_survey_forms()[0].form_id
+    path = f"/api/responses/course/q?form_id={form_id}"
+    admin_client.get(path)
+    fake_google.request_count = 0
+    assert async_get(async_views.AsyncCourseResponseView, path)[0] == 200
+    assert async_get(async_views.AsyncFormResponses, "/api/responses/q?language=en")[0] == 200
+    # Only the other language variants of the survey were not cached yet.
+    assert fake_google.request_count == 2 * (len(get_survey_forms()) - 1)
+
+
+def call(view_class, path, user):
+    request = AsyncRequestFactory().get(path)
+    request.user = user
+    return async_to_sync(view_class.as_view())(request)
+
+
+def open_breaker():
+    for _ in range(google_breaker.failure_threshold):
+        google_breaker.record_failure()
+
+
+@pytest.mark.usefixtures("async_get")
+def test_async_views_serve_stale_copies_while_the_breaker_is_open(fake_google, admin_client, django_user_model):
+    datagen.add_onboarding_forms(fake_google, 10)
+    admin = django_user_model.objects.get(username="bench-admin")
+    form_id = get_survey_forms()[0].form_id
+    path = f"/api/responses/course/q?form_id={form_id}"
+    fresh = admin_client.get(path).json()
+    open_breaker()
+    fake_google.request_count = 0
+
+    # The copy kept by the synchronous view is served by the async one.
+    response = call(async_views.AsyncCourseResponseView, path, admin)
+    assert response.status_code == 200
+    assert json.loads(response.content) == fresh
+    assert response["Warning"] == '110 - "Response is Stale"'
+
+    response = call(async_views.AsyncFormResponses, "/api/responses/q?language=en", admin)
+    assert response.status_code == 503
+    assert response["Retry-After"] == str(google_breaker.reset_timeout)
+    assert fake_google.request_count == 0
+
+
+def test_async_views_keep_a_stale_copy(fake_google, admin_client, async_get):
+    datagen.add_onboarding_forms(fake_google, 10)
+    status_code, fresh = async_get(async_views.AsyncFormResponses, "/api/responses/q?language=en")
+    assert status_code == 200
+    open_breaker()
+    response = admin_client.get("/api/responses/q?language=en")
+    assert response.status_code == 200
+    assert response.json() == fresh
+    assert response["Warning"] == '110 - "Response is Stale"'
+
+
+def test_async_views_check_access_like_the_sync_views():
+    learner = datagen.create_learners(1)[0]
+    learner_client = APIClient()
+    learner_client.force_authenticate(learner)
+    for view_class, path in [
+        (async_views.AsyncFormResponses, "/api/responses/q?language=en"),
+        (async_views.AsyncSurveyStatusWaitView, "/api/status/wait/?timeout=0"),
+    ]:
+        for user, client in [(AnonymousUser(), APIClient()), (learner, learner_client)]:
+            response = call(view_class, path, user)
+            expected = client.get(path)
+            assert (response.status_code, json.loads(response.content)) == (expected.status_code, expected.json())
+
+
+def test_async_status_wait():
+    learner = datagen.create_learners(1)[0]
+    SurveyModel.objects.filter(user=learner).update(times_shown=3, is_completed=True)
+    request = AsyncRequestFactory().get("/api/status/wait/")
+    request.user = learner
+    response = async_to_sync(async_views.AsyncSurveyStatusWaitView.as_view())(request)
+    assert json.loads(response.content)["status"] == "dont_show"
+
+
+@pytest.fixture
+def wait_clock(monkeypatch, settings):
+    settings.SURVEY_STATUS_WAIT_TIMEOUT = 2
+    clock = FakeClock()
+    clock.on_sleep = None
+
+    async def sleep(seconds):
+        clock.sleep(seconds)
+        if clock.on_sleep:
+            await clock.on_sleep()
+
+    monkeypatch.setattr(async_views, "time", clock)
+    monkeypatch.setattr(async_views, "asyncio", SimpleNamespace(sleep=sleep, gather=asyncio.gather))
+    return clock
+
+
+def test_async_status_wait_gives_up_after_the_timeout(wait_clock):
+    learner = datagen.create_learners(1)[0]
+    SurveyModel.objects.filter(user=learner).update(times_shown=3, is_completed=False)
+
+    response = call(async_views.AsyncSurveyStatusWaitView, "/api/status/wait/?timeout=60", learner)
+    assert json.loads(response.content)["status"] == "must_show"
+    assert sum(wait_clock.slept) == 2
+    assert all(seconds <= async_views.AsyncSurveyStatusWaitView.POLL_INTERVAL for seconds in wait_clock.slept)
+    assert call(async_views.AsyncSurveyStatusWaitView, "/api/status/wait/?timeout=soon", learner).status_code == 400
+
+
+def test_async_status_wait_returns_when_completed(wait_clock):
+    learner = datagen.create_learners(1)[0]
+    SurveyModel.objects.filter(user=learner).update(times_shown=3, is_completed=False)
+
+    async def complete():
+        # The Google Form webhook lands while the popup is waiting.
+        await sync_to_async(APIClient().post)("/api/completed/", {"email": learner.email})
+
+    wait_clock.on_sleep = complete
+    response = call(async_views.AsyncSurveyStatusWaitView, "/api/status/wait/?timeout=5", learner)
+    assert json.loads(response.content)["status"] == "dont_show"
+    assert len(wait_clock.slept) == 1
@@ -0,0 +1,76 @@
+"""
+Checks of the two-tier cache: LRU bounds, versioned invalidation and single-flight loading.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+
+from survey_api.caching import Namespace, local_cache
+
+
+def test_local_tier_is_bounded_lru(settings):
+    settings.SURVEY_LOCAL_CACHE_SIZE = 2
+    namespace = Namespace("test_lru")
+    namespace.set("a", 1)
+    namespace.set("b", 2)
+    assert namespace.get("a") == 1
+    namespace.set("c", 3)
+    # "b" was the least recently used local entry; the shared tier still has it.
+    assert local_cache.get(namespace.key("b")) is None
+    assert namespace.get("b") == 2
+
+
+def test_local_entries_expire(settings):
+    settings.SURVEY_LOCAL_CACHE_TIMEOUT = 0.01
+    namespace = Namespace("test_ttl")
+    namespace.set("a", 1)
+    time.sleep(0.02)
+    assert local_cache.get(namespace.key("a")) is None
+
+
+def test_invalidate_drops_every_key():
+    namespace = Namespace("test_invalidate")
+    namespace.set("a", 1)
+    other = Namespace("test_other")
+    other.set("a", 1)
+    namespace.invalidate()
+    assert namespace.get("a") is None
+    assert other.get("a") == 1
+
+
+def test_zero_timeout_caches_nothing():
+    namespace = Namespace("test_zero")
+    assert namespace.get_or_set("a", lambda: {"error": "x"}, timeout=lambda value: 0) == {"error": "x"}
+    assert namespace.get("a") is None
+
+
+def test_get_or_set_loads_once():
+    namespace = Namespace("test_single_flight")
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(namespace.get_or_set("a", load)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+
+def test_get_or_set_waits_for_another_process():
+    namespace = Namespace("test_other_process")
+    key = namespace.key("a")
+    # Another process holds the load lock and publishes its result shortly.
+    cache.add(f"{key}.loading", True, 30)
+    threading.Timer(0.05, lambda: cache.set(key, "theirs", 60)).start()
+    assert namespace.get_or_set("a", lambda: "ours") == "theirs"
@@ -0,0 +1,89 @@
+"""
+Tests of what ``api/changes/`` reports.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from acl_extra_reg_fields.models import ExtraInfo
+
+from survey_api.changes import make_cursor, parse_cursor
+from survey_api.models import GoogleFormResponseModel, SurveyModel
+from test_utils import datagen
+
+pytestmark = pytest.mark.django_db
+
+
+def changes(client, cursor, query=""):
+    response = client.get(f"/api/changes/?cursor={cursor}{query}")
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+@pytest.fixture
+def no_overlap(settings):
+    settings.SURVEY_CHANGES_OVERLAP = 0
+
+
+def test_changes_since_cursor(fake_google, admin_client, no_overlap, monkeypatch, django_capture_on_commit_callbacks):
+    monkeypatch.setattr("survey_api.views.get_access_token", lambda: "bench-token")
+    learners = datagen.create_learners(4)
+    SurveyModel.objects.filter(user=learners[1]).update(is_completed=False)
+    responses = datagen.make_responses("course-form-0", 2)
+    fake_google.add_form(datagen.make_form("course-form-0"), responses)
+
+    start = admin_client.get("/api/changes/").json()
+    assert start["full_refresh"] is True
+    assert changes(admin_client, start["cursor"])["responses"] == []
+
+    admin_client.post("/api/course-forms/", {"email": learners[0].email, "form_id": "course-form-0",
+                                             "response_id": "course-form-0-r1"}, format="json")
+    admin_client.post("/api/completed/", {"email": learners[1].email}, format="json")
+    learners[2].profile.name = "Renamed Learner"
+    removed = ExtraInfo.objects.get(user=learners[3]).pk
+    with django_capture_on_commit_callbacks(execute=True):
+        learners[2].profile.save()
+        ExtraInfo.objects.filter(pk=removed).delete()
+    responses[1]["lastSubmittedTime"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    fake_google.add_form(datagen.make_form("course-form-0"), responses)
+
+    delta = changes(admin_client, start["cursor"], "&form_id=course-form-0")
+    assert delta["full_refresh"] is False
+    assert [(row["response_id"], row["user"]["id"]) for row in delta["responses"]] == [
+        ("course-form-0-r1", learners[0].pk)
+    ]
+    assert [row["username"] for row in delta["survey_status"]] == [learners[1].username]
+    assert delta["survey_status"][0]["status"] == SurveyModel.STATUS_DONT_SHOW
+    names = [row["answers"]["name"]["textAnswers"]["answers"][0]["value"] for row in delta["registrations"]]
+    assert names == ["Renamed Learner"]
+    assert delta["removed_registrations"] == [str(removed)]
+    assert [resp["responseId"] for resp in delta["forms"]["course-form-0"]] == ["course-form-0-r1"]
+
+    # Nothing happened since the new cursor.
+    quiet = changes(admin_client, delta["cursor"])
+    assert quiet["responses"] == quiet["registrations"] == quiet["survey_status"] == []
+    assert quiet["removed_registrations"] == []
+
+
+def test_changes_sees_submissions_committed_out_of_order(admin_client):
+    learners = datagen.create_learners(2)
+    now = datetime.now(timezone.utc)
+    late, early = [
+        GoogleFormResponseModel.objects.create(user=learner, form_id="course-form-0",
+                                               response_id=f"r{i}", submitted_at=now)
+        for i, learner in enumerate(learners)
+    ]
+    # The client saw ``early`` before ``late``, with its lower id, was committed.
+    cursor = make_cursor(now + timedelta(seconds=1), early.pk)
+    delta = changes(admin_client, cursor)
+    assert [row["id"] for row in delta["responses"]] == [late.pk, early.pk]
+    # The next cursor never moves back below the last id seen.
+    assert parse_cursor(delta["cursor"])[1] == early.pk
+
+
+def test_changes_asks_for_a_reload(admin_client, settings):
+    cursor = admin_client.get("/api/changes/").json()["cursor"]
+    datagen.create_form_submissions("course-form-0", datagen.create_learners(3))
+    settings.SURVEY_CHANGES_MAX_ROWS = 2
+    reload = changes(admin_client, cursor)
+    assert reload["full_refresh"] is True and "responses" not in reload
+    assert admin_client.get("/api/changes/?cursor=forged").status_code == 400
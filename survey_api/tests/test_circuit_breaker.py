@@ -0,0 +1,161 @@
+"""
+Checks of the Google circuit breaker and the stale-response fallback of the report views.
+"""
+import pytest
+from django.core.cache import cache
+from django.http import HttpResponse
+from google.auth.exceptions import RefreshError
+
+from survey_api import circuit_breaker
+from survey_api.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    google_breaker,
+    stale_response,
+    store_stale,
+)
+from survey_api.rate_limit import RateLimitExceeded
+from survey_api.registry import get_survey_forms
+from survey_api.views import CourseFeedbackOverviewView
+from test_utils import datagen
+from test_utils.clock import FakeClock
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(settings):
+    settings.SURVEY_BREAKER_FAILURE_THRESHOLD = 3
+    settings.SURVEY_BREAKER_RESET_TIMEOUT = 30
+    return CircuitBreaker("test")
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_the_failure_threshold(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state() == CLOSED
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state() == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_the_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state() == CLOSED
+
+
+def test_half_open_breaker_lets_one_probe_through(breaker, clock):
+    open_breaker(breaker)
+    clock.now += 29
+    assert breaker.state() == OPEN
+    clock.now += 1
+    assert breaker.state() == HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state() == CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_opens_the_breaker_again(breaker, clock):
+    open_breaker(breaker)
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state() == OPEN
+    clock.now += 30
+    # The next probe may go.
+    breaker.before_call()
+
+
+@pytest.mark.django_db
+def test_open_breaker_serves_the_stale_copy(fake_google, admin_client):
+    datagen.add_onboarding_forms(fake_google, 10)
+    path = f"/api/responses/course/q?form_id={get_survey_forms()[0].form_id}"
+    fresh = admin_client.get(path)
+    open_breaker(google_breaker)
+    fake_google.request_count = 0
+
+    response = admin_client.get(path)
+    assert response.status_code == 200
+    assert response.content == fresh.content
+    assert response["Warning"] == '110 - "Response is Stale"'
+    assert int(response["Age"]) >= 0
+    assert fake_google.request_count == 0
+
+
+@pytest.mark.django_db
+def test_open_breaker_without_a_copy_answers_503(fake_google, admin_client):
+    datagen.add_onboarding_forms(fake_google, 10)
+    open_breaker(google_breaker)
+    response = admin_client.get(f"/api/responses/course/q?form_id={get_survey_forms()[0].form_id}")
+    assert response.status_code == 503
+    assert response["Retry-After"] == str(google_breaker.reset_timeout)
+    assert fake_google.request_count == 0
+
+
+@pytest.mark.django_db
+def test_overview_leaves_google_failures_to_the_fallbacks(fake_google, admin_client, monkeypatch):
+    datagen.create_courses(2)
+    for i in range(2):
+        fake_google.add_form(datagen.make_form(f"course-form-{i}"), datagen.make_responses(f"course-form-{i}", 3))
+    path = "/api/responses/course/overview/"
+    fresh = admin_client.get(path)
+    assert fresh.status_code == 200
+
+    def fail(error):
+        def get_courses(self, refresh=False):
+            raise error
+        monkeypatch.setattr(CourseFeedbackOverviewView, "get_courses", get_courses)
+
+    fail(CircuitOpenError("Google API circuit breaker is open."))
+    response = admin_client.get(path)
+    assert (response.status_code, response.content) == (200, fresh.content)
+    assert response["Warning"] == '110 - "Response is Stale"'
+    assert admin_client.get(f"{path}?fresh=1").status_code == 503
+
+    fail(RateLimitExceeded(wait=2))
+    assert admin_client.get(path).status_code == 429
+
+    fail(RefreshError("invalid_grant"))
+    response = admin_client.get(path)
+    assert response.status_code == 500
+    assert response.json()["error"].startswith("Token error")
+
+
+def test_oversized_bodies_are_not_kept(settings):
+    settings.SURVEY_STALE_MAX_BYTES = 10
+    store_stale("survey_api.stale.test", HttpResponse(b"x" * 11))
+    assert stale_response("survey_api.stale.test").status_code == 503
+
+
+def test_unchanged_bodies_are_not_written_again(monkeypatch):
+    writes = []
+    set_many = cache.set_many
+    monkeypatch.setattr(cache, "set_many", lambda data, timeout: writes.append(data) or set_many(data, timeout))
+
+    store_stale("survey_api.stale.test", HttpResponse(b"same"))
+    store_stale("survey_api.stale.test", HttpResponse(b"same"))
+    assert len(writes) == 1
+    store_stale("survey_api.stale.test", HttpResponse(b"changed"))
+    assert len(writes) == 2
+    assert stale_response("survey_api.stale.test").content == b"changed"
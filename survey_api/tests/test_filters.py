@@ -0,0 +1,162 @@
+"""
+Tests of the response filters and of the ``fields=`` / ``include_meta=`` projection of the synchronous reports.
+"""
+import pytest
+
+from survey_api.filters import FieldSelection, ResponseFilter, ResponseFilterError, parse_timestamp
+from survey_api.registry import get_survey_forms
+from test_utils import datagen
+from test_utils.datagen import timestamp
+
+FORM_ID = "course-form-0"
+
+
+@pytest.fixture
+def course_form(fake_google):
+    responses = datagen.make_responses(FORM_ID, 5)
+    fake_google.add_form(datagen.make_form(FORM_ID), responses)
+    return responses
+
+
+def course_report(client, query=""):
+    response = client.get(f"/api/responses/course/q?form_id={FORM_ID}{query}")
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+def response_ids(report):
+    return [resp["responseId"] for resp in report["responses"]]
+
+
+def test_date_windows_include_the_lower_bound_only():
+    response_filter = ResponseFilter(created_after=parse_timestamp(timestamp(60)),
+                                     created_before=parse_timestamp(timestamp(180)))
+    responses = datagen.make_responses(FORM_ID, 5)
+    assert [resp["responseId"] for resp in responses if response_filter.matches(resp)] == [
+        f"{FORM_ID}-r1", f"{FORM_ID}-r2",
+    ]
+
+
+def test_answers_match_raw_or_translated_values():
+    resp = datagen.make_responses(FORM_ID, 1)[0]
+    role = resp["answers"]["role"]["textAnswers"]["answers"][0]["value"]
+    assert ResponseFilter(question_id="role", answer=role).matches(resp)
+    assert not ResponseFilter(question_id="role", answer="Astronaut").matches(resp)
+    assert ResponseFilter(question_id="role", answer="Astronaut").matches(resp, lambda qid, value: "Astronaut")
+    assert not ResponseFilter(question_id="missing", answer=role).matches(resp)
+
+
+@pytest.mark.parametrize("params", [
+    {"question_id": "role"},
+    {"answer": "Teacher"},
+    {"created_after": "yesterday"},
+    {"submitted_before": "2025-13-01"},
+])
+def test_malformed_filters_are_rejected(params):
+    with pytest.raises(ResponseFilterError):
+        ResponseFilter.from_query_params(params)
+
+
+def test_only_the_submission_lower_bound_goes_to_google():
+    assert ResponseFilter.from_query_params({"created_after": "2025-01-01"}).google_filter() is None
+    assert ResponseFilter.from_query_params({"submitted_after": "2025-01-01"}).google_filter() == (
+        "timestamp >= 2025-01-01T00:00:00.000000Z"
+    )
+
+
+@pytest.mark.django_db
+def test_course_report_filters_on_respondent_email(admin_client, course_form):
+    report = course_report(admin_client, f"&respondent_email=%20{datagen.learner_email(2).upper()}")
+    assert response_ids(report) == [f"{FORM_ID}-r2"]
+
+
+@pytest.mark.django_db
+def test_course_report_filters_on_an_answer(admin_client, course_form):
+    report = course_report(admin_client, "&question_id=comments&answer=Comment%203")
+    assert response_ids(report) == [f"{FORM_ID}-r3"]
+
+
+@pytest.mark.django_db
+def test_course_report_filters_on_dates(admin_client, course_form, fake_google):
+    report = course_report(admin_client, f"&created_after={timestamp(60)}&created_before={timestamp(180)}")
+    assert response_ids(report) == [f"{FORM_ID}-r1", f"{FORM_ID}-r2"]
+
+    fake_google.request_count = 0
+    report = course_report(admin_client, f"&submitted_after={timestamp(90)}&submitted_before={timestamp(210)}")
+    assert response_ids(report) == [f"{FORM_ID}-r1", f"{FORM_ID}-r2"]
+    # The lower bound is applied by Google, so the window isn't served from the cached full list.
+    assert fake_google.request_count == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["&question_id=role", "&created_after=soon", "&include_meta=maybe"])
+def test_course_report_rejects_malformed_parameters(admin_client, course_form, query):
+    response = admin_client.get(f"/api/responses/course/q?form_id={FORM_ID}{query}")
+    assert response.status_code == 400
+    assert "error" in response.json()
+
+
+@pytest.mark.django_db
+def test_merged_report_matches_answers_in_any_language(admin_client, fake_google):
+    datagen.add_onboarding_forms(fake_google, 10)
+    variants = get_survey_forms()
+    assert {variant.locale for variant in variants} >= {"en", "fr-ca"}
+    raw = [
+        resp for variant in variants for resp in datagen.make_responses(
+            variant.form_id, 10, variant.locale if variant.locale in datagen.EMAIL_TITLES else "en",
+        )
+        if resp["answers"]["role"]["textAnswers"]["answers"][0]["value"] in ("Teacher", "Enseignant")
+    ]
+
+    response = admin_client.get("/api/responses/q?language=fr-ca&question_id=role&answer=Enseignant")
+    assert response.status_code == 200, response.content
+    responses = response.json()["responses"]
+    assert len(responses) == len(raw) > 0
+    assert {resp["answers"]["role"]["textAnswers"]["answers"][0]["value"] for resp in responses} == {"Enseignant"}
+
+
+def test_field_selection_prunes_answers_and_meta():
+    selection = FieldSelection.from_query_params({"fields": " role, email ,"})
+    assert selection.wants("role") and not selection.wants("rating")
+    resp = selection.response(datagen.make_responses(FORM_ID, 1)[0])
+    assert set(resp["answers"]) == {"role", "email"}
+    meta = selection.meta(datagen.make_form(FORM_ID))
+    assert [item["itemId"] for item in meta["items"]] == ["item-email", "item-role"]
+    assert FieldSelection.from_query_params({"include_meta": "No"}).payload({"items": []}, responses=[]) == {
+        "responses": []
+    }
+
+
+@pytest.mark.django_db
+def test_course_report_projection(admin_client, course_form):
+    report = course_report(admin_client, "&fields=rating,email")
+    assert [item["itemId"] for item in report["meta"]["items"]] == ["item-email", "item-rating"]
+    assert {qid for resp in report["responses"] for qid in resp["answers"]} == {"rating", "email"}
+
+    report = course_report(admin_client, "&fields=rating&include_meta=false")
+    assert "meta" not in report
+    assert [set(resp["answers"]) for resp in report["responses"]] == [{"rating"}] * 5
+
+
+@pytest.mark.django_db
+def test_merged_report_projection(admin_client, fake_google):
+    datagen.add_onboarding_forms(fake_google, 3)
+    response = admin_client.get("/api/responses/q?fields=topics&include_meta=0")
+    assert response.status_code == 200, response.content
+    report = response.json()
+    assert "meta" not in report
+    assert report["responses"] and all(set(resp["answers"]) == {"topics"} for resp in report["responses"])
+
+
+@pytest.mark.django_db
+def test_registration_report_projection(admin_client):
+    learners = datagen.create_learners(2)
+    report = admin_client.get("/api/responses/registration/?fields=name,gender").json()
+    assert [item["itemId"] for item in report["meta"]["items"]] == ["name", "gender"]
+    assert [set(resp["answers"]) for resp in report["responses"]] == [{"name", "gender"}] * 2
+
+    report = admin_client.get(
+        f"/api/user/registration/q?username={learners[0].username}&fields=email&include_meta=false"
+    ).json()
+    assert "meta" not in report
+    assert report["responses"][0]["answers"]["email"]["textAnswers"]["answers"] == [{"value": learners[0].email}]
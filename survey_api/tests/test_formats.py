@@ -0,0 +1,53 @@
+"""
+Checks of the columnar report encoding.
+"""
+from survey_api.formats import HEAD_COLUMNS, ColumnarEncoder
+
+ITEMS = [
+    {
+        "title": "Role",
+        "questionItem": {"question": {
+            "questionId": "role",
+            "choiceQuestion": {"type": "RADIO", "options": [{"value": "Student"}, {"value": "Teacher"}]},
+        }},
+    },
+    {"title": "About you", "textItem": {}},
+    {
+        "title": "Rate the course",
+        "questionGroupItem": {
+            "questions": [
+                {"questionId": "pace", "rowQuestion": {"title": "Pace"}},
+                {"questionId": "content", "rowQuestion": {"title": "Content"}},
+            ],
+            "grid": {"columns": {"type": "RADIO", "options": [{"value": "Bad"}, {"value": "Good"}]}},
+        },
+    },
+    {
+        "title": "Formats you used",
+        "questionGroupItem": {
+            "questions": [{"questionId": "formats", "rowQuestion": {"title": "Week 1"}}],
+            "grid": {"columns": {"type": "CHECKBOX", "options": [{"value": "Video"}, {"value": "Text"}]}},
+        },
+    },
+]
+
+
+def answer(*values):
+    return {"textAnswers": {"answers": [{"value": value} for value in values]}}
+
+
+def test_grid_rows_are_columns():
+    encoder = ColumnarEncoder(ITEMS)
+    assert encoder.columns == HEAD_COLUMNS + ["role", "pace", "content", "formats"]
+    assert encoder.questions[1:] == [
+        {"questionId": "pace", "title": "Rate the course [Pace]", "options": ["Bad", "Good"], "multiple": False},
+        {"questionId": "content", "title": "Rate the course [Content]", "options": ["Bad", "Good"], "multiple": False},
+        {"questionId": "formats", "title": "Formats you used [Week 1]", "options": ["Video", "Text"], "multiple": True},
+    ]
+
+    row = encoder.encode({
+        "responseId": "r1",
+        "createTime": "2025-01-01T00:00:00Z",
+        "answers": {"role": answer("Teacher"), "content": answer("Good"), "formats": answer("Text", "Audio")},
+    })
+    assert row == ["r1", "2025-01-01T00:00:00Z", "2025-01-01T00:00:00Z", None, 1, None, 1, [1, "Audio"]]
@@ -0,0 +1,143 @@
+"""
+Checks of the shared Google token bucket: refill, interactive reserve, waiting, draining, its lock and priorities.
+"""
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from survey_api import rate_limit
+from survey_api.google_forms import fetch_forms
+from survey_api.rate_limit import BACKGROUND, INTERACTIVE, RateLimitExceeded, TokenBucket, current_priority
+from survey_api.reports import course_feedback_overview
+from test_utils import datagen
+from test_utils.clock import FakeClock
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def bucket(settings, clock):
+    # One token per second, ten at most, the last two kept for interactive calls.
+    settings.SURVEY_GOOGLE_RATE_LIMIT = 60
+    settings.SURVEY_GOOGLE_BURST = 10
+    settings.SURVEY_GOOGLE_INTERACTIVE_RESERVE = 0.2
+    settings.SURVEY_GOOGLE_MAX_WAIT = 2
+    settings.SURVEY_GOOGLE_BACKGROUND_MAX_WAIT = 30
+    return TokenBucket("test")
+
+
+def empty(bucket):
+    for _ in range(bucket.capacity):
+        assert bucket.try_acquire(INTERACTIVE) == 0
+
+
+def test_bucket_refills_at_the_rate(bucket, clock):
+    empty(bucket)
+    assert bucket.try_acquire(INTERACTIVE) == pytest.approx(1)
+    clock.now += 3
+    assert bucket.usage()["tokens_available"] == 3
+    clock.now += 60
+    assert bucket.usage()["tokens_available"] == bucket.capacity
+
+
+def test_background_calls_leave_the_reserve(bucket):
+    for _ in range(8):
+        assert bucket.try_acquire(BACKGROUND) == 0
+    assert bucket.try_acquire(BACKGROUND) == pytest.approx(1)
+    assert bucket.try_acquire(INTERACTIVE) == 0
+    assert bucket.try_acquire(INTERACTIVE) == 0
+    assert bucket.try_acquire(INTERACTIVE) == pytest.approx(1)
+
+
+def test_acquire_waits_for_the_refill(bucket, clock):
+    empty(bucket)
+    bucket.acquire(INTERACTIVE)
+    assert clock.slept == [pytest.approx(1)]
+
+
+def test_acquire_rejects_past_the_wait_limit(bucket, clock):
+    empty(bucket)
+    bucket.drain(5)
+    with pytest.raises(RateLimitExceeded) as raised:
+        bucket.acquire(INTERACTIVE)
+    assert raised.value.wait == 6
+    assert not clock.slept
+
+
+def test_background_priority_waits_longer(bucket, clock):
+    empty(bucket)
+    bucket.drain(5)
+    with rate_limit.priority(BACKGROUND):
+        bucket.acquire()
+    assert sum(clock.slept) == pytest.approx(8)
+
+
+def test_drain_pushes_the_next_token_away(bucket, clock):
+    bucket.drain(30)
+    assert bucket.try_acquire(INTERACTIVE) == pytest.approx(31)
+    clock.now += 31
+    assert bucket.try_acquire(INTERACTIVE) == 0
+
+
+def test_lock_held_elsewhere_is_left_alone(bucket):
+    cache.set(bucket.lock_key, "another-worker", 60)
+    assert bucket.try_acquire(INTERACTIVE) == TokenBucket.LOCK_WAIT
+    assert cache.get(bucket.lock_key) == "another-worker"
+    assert bucket.usage()["tokens_available"] == bucket.capacity
+
+
+def test_lock_is_released(bucket):
+    assert bucket.try_acquire(INTERACTIVE) == 0
+    assert cache.get(bucket.lock_key) is None
+
+
+def test_disabled_bucket_never_waits(settings, clock):
+    settings.SURVEY_GOOGLE_RATE_LIMIT = None
+    bucket = TokenBucket("test")
+    bucket.drain(30)
+    bucket.acquire(INTERACTIVE)
+    assert not clock.slept
+
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_rate_must_be_positive(settings, rate):
+    settings.SURVEY_GOOGLE_RATE_LIMIT = rate
+    with pytest.raises(ImproperlyConfigured):
+        TokenBucket("test").acquire(INTERACTIVE)
+
+
+@pytest.fixture
+def acquired(monkeypatch):
+    levels = []
+    monkeypatch.setattr(
+        rate_limit.google_bucket, "acquire", lambda level=None: levels.append(level or current_priority())
+    )
+    return levels
+
+
+@pytest.mark.django_db
+def test_overview_pool_keeps_the_background_priority(fake_google, acquired):
+    datagen.create_courses(3)
+    for i in range(3):
+        fake_google.add_form(datagen.make_form(f"course-form-{i}"), datagen.make_responses(f"course-form-{i}", 2))
+
+    with rate_limit.priority(BACKGROUND):
+        rows = course_feedback_overview(lambda: {"Authorization": "Bearer bench-token"})
+    assert [row["response_count"] for row in rows] == [2, 2, 2]
+    assert acquired and set(acquired) == {BACKGROUND}
+
+
+def test_form_fetch_pool_keeps_the_background_priority(fake_google, acquired):
+    for form_id in ("form-a", "form-b"):
+        fake_google.add_form(datagen.make_form(form_id), datagen.make_responses(form_id, 2))
+
+    with rate_limit.priority(BACKGROUND):
+        fetch_forms(["form-a", "form-b"], {"Authorization": "Bearer bench-token"})
+    assert len(acquired) == 4 and set(acquired) == {BACKGROUND}
+    fetch_forms(["form-a", "form-b"], {}, "timestamp >= 2025-01-01T00:00:00Z")
+    assert set(acquired[4:]) == {INTERACTIVE}
@@ -0,0 +1,94 @@
+"""
+Tests of ``reconcile_form_responses``: matching, inserting and checkpoints.
+"""
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from requests.exceptions import RequestException
+
+from survey_api import reconcile as reconcile_module
+from survey_api.management.commands import reconcile_form_responses
+from survey_api.models import GoogleFormResponseModel, ReconcileCheckpointModel
+from test_utils import datagen
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def token(fake_google, monkeypatch):
+    monkeypatch.setattr(reconcile_form_responses, "get_access_token", lambda: "bench-token")
+
+
+def reconcile(*args):
+    out = StringIO()
+    call_command("reconcile_form_responses", *args, stdout=out)
+    return out.getvalue()
+
+
+def test_reconcile_inserts_only_missing_rows(fake_google, token, django_assert_max_num_queries):
+    learners = datagen.create_learners(5)
+    datagen.create_courses(1, learners)
+    responses = datagen.make_responses("course-form-0", 6)
+    responses[2]["respondentEmail"] = responses[2]["respondentEmail"].upper()
+    # The sixth respondent has no account.
+    fake_google.add_form(datagen.make_form("course-form-0"), responses)
+    datagen.create_form_submissions("course-form-0", learners[:2])
+
+    # Forms and checkpoint, then per batch: existing rows, users, insert and checkpoint.
+    with django_assert_max_num_queries(12):
+        out = reconcile("--batch-size", "4")
+    assert "6 response(s) seen, 3 inserted, 1 without a matching user" in out
+
+    rows = GoogleFormResponseModel.objects.filter(form_id="course-form-0").order_by("response_id")
+    assert [(row.user_id, row.response_id) for row in rows] == [
+        (learner.pk, f"course-form-0-r{i}") for i, learner in enumerate(learners)
+    ]
+    assert rows[4].submitted_at.isoformat().startswith("2025-01-01T00:04:30")
+
+
+def test_reconcile_resumes_from_checkpoint(fake_google, token):
+    learners = datagen.create_learners(12)
+    datagen.create_courses(1, learners)
+    responses = datagen.make_responses("course-form-0", 12)
+    fake_google.add_form(datagen.make_form("course-form-0"), responses[:10])
+    reconcile()
+    assert GoogleFormResponseModel.objects.count() == 10
+
+    fake_google.add_form(datagen.make_form("course-form-0"), responses)
+    # The checkpoint is kept in the database, not in the cache.
+    cache.clear()
+    out = reconcile()
+    # Only the last reconciled submission and the two new ones are streamed again.
+    assert "3 response(s) seen, 2 inserted" in out
+    assert GoogleFormResponseModel.objects.count() == 12
+
+
+def test_interrupted_reconcile_resumes_after_the_last_batch(fake_google, token, monkeypatch):
+    learners = datagen.create_learners(10)
+    datagen.create_courses(1, learners)
+    fake_google.add_form(datagen.make_form("course-form-0"), datagen.make_responses("course-form-0", 10))
+
+    batches = []
+
+    def reconcile_batch(form_id, responses):
+        if len(batches) == 2:
+            raise RequestException("connection reset")
+        batches.append([resp["responseId"] for resp in responses])
+        return real_reconcile_batch(form_id, responses)
+
+    real_reconcile_batch = reconcile_module.reconcile_batch
+    monkeypatch.setattr(reconcile_module, "reconcile_batch", reconcile_batch)
+    with pytest.raises(CommandError):
+        reconcile("--batch-size", "3")
+    checkpoint = ReconcileCheckpointModel.objects.get(form_id="course-form-0")
+    assert (checkpoint.since, checkpoint.reconciled) == (None, 6)
+
+    monkeypatch.setattr(reconcile_module, "reconcile_batch", real_reconcile_batch)
+    assert "4 response(s) seen, 4 inserted" in reconcile("--batch-size", "3")
+    assert GoogleFormResponseModel.objects.count() == 10
+    checkpoint.refresh_from_db()
+    assert checkpoint.reconciled == 0
+    assert checkpoint.latest is not None
+    assert checkpoint.since == checkpoint.latest
@@ -0,0 +1,167 @@
+"""
+Tests that the registration snapshots match their source rows and are kept current.
+"""
+from io import StringIO
+
+import pytest
+from acl_extra_reg_fields.models import ExtraInfo
+from common.djangoapps.student.models.user import UserProfile
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from openedx.core.djangoapps.user_api.accounts.signals import USER_RETIRE_LMS_CRITICAL
+
+from survey_api.caching import DASHBOARD, REGISTRATIONS, clear_local
+from survey_api.models import RegistrationSnapshotModel
+from test_utils import datagen
+
+pytestmark = pytest.mark.django_db
+
+
+def test_snapshot_matches_the_joined_rows():
+    learner = datagen.create_learners(1)[0]
+    info = ExtraInfo.objects.select_related("user", "user__profile").get(user=learner)
+    snapshot = RegistrationSnapshotModel.objects.get(extra_info=info)
+    assert (snapshot.name, snapshot.username, snapshot.email, snapshot.date_joined) == (
+        learner.profile.name, learner.username, learner.email, learner.date_joined,
+    )
+    assert snapshot.gender == learner.profile.gender_display
+    assert snapshot.preferred_language == info.get_preferred_language_display()
+    assert snapshot.referrer == info.get_referrer_display()
+
+
+def registration_names(client):
+    return [
+        response["answers"]["name"]["textAnswers"]["answers"][0]["value"]
+        for response in client.get("/api/responses/registration/").json()["responses"]
+    ]
+
+
+def test_signals_keep_snapshots_current(admin_client, django_capture_on_commit_callbacks):
+    learner = datagen.create_learners(1)[0]
+    assert len(admin_client.get("/api/responses/registration/").json()["responses"]) == 1
+
+    email = learner.email
+    learner.profile.name = "Renamed Learner"
+    learner.email = "renamed@example.com"
+    with django_capture_on_commit_callbacks() as callbacks:
+        learner.profile.save()
+        learner.save()
+    # Nothing is written before the transaction commits.
+    assert RegistrationSnapshotModel.objects.get(user=learner).email == email
+    for callback in callbacks:
+        callback()
+    answers = admin_client.get("/api/responses/registration/").json()["responses"][0]["answers"]
+    assert answers["name"]["textAnswers"]["answers"][0]["value"] == "Renamed Learner"
+    assert answers["email"]["textAnswers"]["answers"][0]["value"] == "renamed@example.com"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ExtraInfo.objects.get(user=learner).delete()
+    assert admin_client.get("/api/responses/registration/").json()["responses"] == []
+    assert admin_client.get(f"/api/user/registration/q?username={learner.username}").json()["responses"] == []
+
+
+def test_saves_of_other_fields_are_skipped(django_capture_on_commit_callbacks):
+    learner = datagen.create_learners(1)[0]
+    with django_capture_on_commit_callbacks() as callbacks:
+        learner.save(update_fields=["last_login"])
+        learner.save(update_fields=["first_name", "is_active"])
+    assert callbacks == []
+    with django_capture_on_commit_callbacks() as callbacks:
+        learner.save(update_fields=["last_login", "email"])
+    assert len(callbacks) == 1
+
+
+def test_reports_read_the_join_until_the_first_rebuild(admin_client, django_capture_on_commit_callbacks):
+    learners = datagen.create_learners(3)
+    built = admin_client.get("/api/responses/registration/").json()
+    user_path = f"/api/user/registration/q?username={learners[1].username}"
+    user_report = admin_client.get(user_path).json()
+    # As right after migrating an existing install.
+    RegistrationSnapshotModel.objects.all().delete()
+    cache.clear()
+
+    assert admin_client.get("/api/responses/registration/").json() == built
+    assert admin_client.get(user_path).json() == user_report
+
+    # A learner saved before the rebuild doesn't make the table look built.
+    learners[0].profile.name = "Renamed Learner"
+    with django_capture_on_commit_callbacks(execute=True):
+        learners[0].profile.save()
+    assert not RegistrationSnapshotModel.objects.exists()
+    assert registration_names(admin_client) == [
+        "Renamed Learner", f"Learner {learners[1].pk}", f"Learner {learners[2].pk}",
+    ]
+
+    call_command("rebuild_registration_snapshots", "--if-empty", stdout=StringIO())
+    assert RegistrationSnapshotModel.objects.count() == 3
+    assert registration_names(admin_client)[0] == "Renamed Learner"
+
+
+def test_first_learner_fills_the_empty_table(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        user = User.objects.create(username="first", email="first@example.com")
+        UserProfile.objects.create(user=user, name="First Learner")
+        ExtraInfo.objects.create(user=user)
+    assert RegistrationSnapshotModel.objects.get().name == "First Learner"
+
+
+def test_rebuild_drops_stale_snapshots():
+    learners = datagen.create_learners(3)
+    # A bulk delete skips the signals.
+    ExtraInfo.objects.filter(user=learners[1])._raw_delete(ExtraInfo.objects.db)
+    out = StringIO()
+    call_command("rebuild_registration_snapshots", stdout=out)
+    assert RegistrationSnapshotModel.objects.count() == 2
+    call_command("rebuild_registration_snapshots", "--if-empty", stdout=out)
+    assert "already built" in out.getvalue()
+
+
+def test_retirement_drops_the_snapshot(admin_client):
+    learners = datagen.create_learners(2)
+    extra_info_id = ExtraInfo.objects.get(user=learners[0]).pk
+    cursor = admin_client.get("/api/changes/").json()["cursor"]
+    assert len(admin_client.get("/api/responses/registration/").json()["responses"]) == 2
+
+    USER_RETIRE_LMS_CRITICAL.send(sender=None, user=learners[0])
+    assert not RegistrationSnapshotModel.objects.filter(user=learners[0]).exists()
+    assert [resp["responseId"] for resp in admin_client.get("/api/responses/registration/").json()["responses"]] == [
+        str(ExtraInfo.objects.get(user=learners[1]).pk)
+    ]
+    delta = admin_client.get(f"/api/changes/?cursor={cursor}").json()
+    assert delta["removed_registrations"] == [str(extra_info_id)]
+
+
+def test_reports_read_the_join_during_a_rebuild(admin_client):
+    learners = datagen.create_learners(3)
+    RegistrationSnapshotModel.objects.all().delete()
+    seen = []
+
+    def on_batch(written, last_pk):
+        REGISTRATIONS.invalidate()
+        seen.append(len(registration_names(admin_client)))
+        report = admin_client.get(f"/api/user/registration/q?username={learners[2].username}").json()
+        seen.append(len(report["responses"]))
+
+    RegistrationSnapshotModel.objects.rebuild(batch_size=1, on_batch=on_batch)
+    assert seen == [3, 1] * 3
+    assert not RegistrationSnapshotModel.objects.rebuilding()
+
+
+def test_only_report_changes_invalidate_the_caches(django_capture_on_commit_callbacks):
+    learner = datagen.create_learners(1)[0]
+
+    def invalidated(save):
+        versions = REGISTRATIONS.version(), DASHBOARD.version()
+        with django_capture_on_commit_callbacks(execute=True):
+            save()
+        clear_local()
+        return REGISTRATIONS.version() != versions[0], DASHBOARD.version() != versions[1]
+
+    learner.first_name = "Ignored"
+    assert invalidated(learner.save) == (False, False)
+    assert invalidated(learner.profile.save) == (False, False)
+    learner.profile.name = "Renamed Learner"
+    assert invalidated(learner.profile.save) == (True, False)
+    learner.email = "renamed@example.com"
+    assert invalidated(learner.save) == (True, True)
@@ -0,0 +1,36 @@
+"""
+Tests that ``sync_survey_data`` picks up new submissions.
+"""
+import pytest
+
+from survey_api import sync
+from survey_api.registry import get_survey_forms
+from test_utils import datagen
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def token(fake_google, monkeypatch):
+    monkeypatch.setattr(sync, "get_access_token", lambda: "bench-token")
+
+
+def test_sync_merges_new_submissions(fake_google, admin_client, token):
+    datagen.add_onboarding_forms(fake_google, 10)
+    first = sync.sync_once()
+    form_id = get_survey_forms()[0].form_id
+    assert first[form_id] == 10
+
+    form = fake_google.forms[form_id]
+    extra = datagen.make_responses(form_id, 12, "en")[10:]
+    fake_google.add_form(form["meta"], form["responses"] + extra)
+
+    calls = fake_google.request_count
+    assert sync.sync_once()[form_id] == 2
+    # One filtered list call per form; metadata is still cached.
+    assert fake_google.request_count - calls == 2
+
+    calls = fake_google.request_count
+    body = admin_client.get("/api/responses/q?language=en").json()
+    assert len(body["responses"]) == 22
+    assert fake_google.request_count == calls
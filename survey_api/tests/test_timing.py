@@ -0,0 +1,79 @@
+"""
+Checks of the ``Server-Timing`` header and of who can get a ``?profile=1`` profile.
+"""
+from types import SimpleNamespace
+
+import pytest
+from rest_framework.test import APIClient
+
+from survey_api import timing
+from survey_api.timing import ServerTiming, phase
+from test_utils import datagen
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profilers(monkeypatch):
+    started = []
+    start = timing._start_profiler
+    monkeypatch.setattr(timing, "_start_profiler", lambda: started.append(start()) or started[-1])
+    return started
+
+
+def client_for(django_user_model, **flags):
+    user = django_user_model.objects.create(username="timing-user", **flags)
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_phases_are_timed_exclusively(monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(timing, "time", SimpleNamespace(perf_counter=lambda: next(clock)))
+    server_timing = ServerTiming()
+    token = timing._current.set(server_timing)
+    try:
+        with phase("auth"):
+            with phase("db"):
+                pass
+    finally:
+        timing._current.reset(token)
+    assert server_timing.durations == {"auth": 2, "db": 1}
+
+
+def test_every_response_has_a_server_timing_header(admin_client):
+    datagen.create_learners(2)
+    response = admin_client.get("/api/responses/registration/")
+    assert response.status_code == 200
+    names = [entry.split(";")[0] for entry in response["Server-Timing"].split(", ")]
+    assert {"auth", "db", "serialize"} <= set(names)
+    assert names[-1] == "total"
+
+
+def test_superusers_get_a_profile(admin_client, profilers):
+    response = admin_client.get("/api/responses/registration/?profile=1")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith(("text/html", "text/plain"))
+    assert "Server-Timing" in response
+    assert len(profilers) == 1
+
+
+def test_staff_get_their_normal_response_unprofiled(django_user_model, profilers):
+    client = client_for(django_user_model, is_staff=True)
+    response = client.get("/api/submissions/?profile=1")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    assert profilers == []
+
+
+def test_anonymous_requests_are_never_profiled(profilers):
+    response = APIClient().get("/api/responses/registration/?profile=1")
+    assert response.status_code in (401, 403)
+    assert profilers == []
+
+
+def test_forbidden_requests_are_never_profiled(django_user_model, profilers):
+    response = client_for(django_user_model).get("/api/submissions/?profile=1")
+    assert response.status_code == 403
+    assert profilers == []
@@ -0,0 +1,111 @@
+"""
+Tests of the survey_api endpoints.
+"""
+import pytest
+from django.core import signing
+from rest_framework.test import APIClient
+
+from survey_api import views
+from survey_api.models import SurveyModel
+from survey_api.replica import report_database
+from survey_api.views import SURVEY_DONE_COOKIE_SALT
+from test_utils import datagen
+
+pytestmark = pytest.mark.django_db
+
+
+def get_ok(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.content
+    return response
+
+
+def test_submissions_feed_pages(admin_client):
+    learners = datagen.create_learners(7)
+    datagen.create_form_submissions("form-a", learners[:5])
+    datagen.create_form_submissions("form-b", learners[5:])
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = get_ok(admin_client, f"/api/submissions/?limit=2&cursor={cursor}").json()
+        seen += [(row["form_id"], row["response_id"]) for row in page["results"]]
+        cursor = page["next"]
+    # Newest first across forms; rows submitted at the same time come newest id first.
+    assert seen == [
+        ("form-a", "form-a-r4"), ("form-a", "form-a-r3"), ("form-a", "form-a-r2"),
+        ("form-b", "form-b-r1"), ("form-a", "form-a-r1"),
+        ("form-b", "form-b-r0"), ("form-a", "form-a-r0"),
+    ]
+
+    row = get_ok(admin_client, "/api/submissions/?form_id=form-b&limit=1").json()["results"][0]
+    assert row["user"] == {
+        "id": learners[6].pk, "username": learners[6].username,
+        "email": learners[6].email, "name": learners[6].profile.name,
+    }
+
+    window = get_ok(admin_client, "/api/submissions/?form_id=form-a&submitted_after=2025-01-01T00:01:00Z"
+                                  "&submitted_before=2025-01-01T00:03:00Z").json()
+    assert [row["response_id"] for row in window["results"]] == ["form-a-r2", "form-a-r1"]
+    assert admin_client.get("/api/submissions/?cursor=forged").status_code == 400
+    assert admin_client.get("/api/submissions/?limit=0").status_code == 400
+
+
+def test_report_database_falls_back_to_default(admin_client, settings):
+    learner = datagen.create_learners(1)[0]
+    settings.SURVEY_REPORT_DATABASE = "missing-replica"
+    assert report_database() == "default"
+    assert len(get_ok(admin_client, "/api/responses/registration/").json()["responses"]) == 1
+    assert len(get_ok(admin_client, f"/api/user/registration/q?username={learner.username}").json()["responses"]) == 1
+
+
+def test_survey_done_cookie():
+    learner = datagen.create_learners(1)[0]
+    SurveyModel.objects.filter(user=learner).update(is_completed=False)
+    client = APIClient()
+    client.force_authenticate(learner)
+    assert "openedx-survey-done" not in get_ok(client, "/api/status/").cookies
+
+    APIClient().post("/api/completed/", {"email": learner.email})
+    cookie = get_ok(client, "/api/status/").cookies["openedx-survey-done"]
+    # The popup compares the unsigned part with the logged-in user's id.
+    assert cookie.value.split(":")[0] == str(learner.pk)
+    assert signing.get_cookie_signer(salt="openedx-survey-done" + SURVEY_DONE_COOKIE_SALT).unsign(cookie.value)
+
+
+def learner_client(times_shown):
+    learner = datagen.create_learners(1)[0]
+    SurveyModel.objects.filter(user=learner).update(times_shown=times_shown, is_completed=False)
+    client = APIClient()
+    client.force_authenticate(learner)
+    return client, learner
+
+
+def test_status_wait_answers_at_once_in_sync_workers(monkeypatch, settings, django_assert_max_num_queries):
+    settings.SURVEY_STATUS_WAIT_TIMEOUT = 2
+    monkeypatch.setattr("time.sleep", lambda seconds: pytest.fail("the sync status wait slept"))
+    client, learner = learner_client(times_shown=3)
+    with django_assert_max_num_queries(2):
+        assert get_ok(client, "/api/status/wait/?timeout=60").json()["status"] == "must_show"
+
+    # The popup polls again once the Google Form webhook has landed.
+    APIClient().post("/api/completed/", {"email": learner.email})
+    assert get_ok(client, "/api/status/wait/?timeout=1").json()["status"] == "dont_show"
+    assert get_ok(learner_client(times_shown=1)[0], "/api/status/wait/?timeout=2").json()["status"] == "show"
+
+
+@pytest.mark.parametrize("query, timeout", [
+    ({"timeout": "1"}, 1),
+    ({}, 2),
+    ({"timeout": "60"}, 2),
+    ({"timeout": "-5"}, 0),
+])
+def test_status_wait_timeout_is_capped(settings, query, timeout):
+    settings.SURVEY_STATUS_WAIT_TIMEOUT = 2
+    assert views.status_wait_timeout(query) == timeout
+
+
+@pytest.mark.parametrize("timeout", ["soon", "", "1s"])
+def test_status_wait_rejects_a_malformed_timeout(timeout):
+    response = learner_client(times_shown=3)[0].get(f"/api/status/wait/?timeout={timeout}")
+    assert response.status_code == 400
+    assert "error" in response.json()
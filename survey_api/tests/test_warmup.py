@@ -0,0 +1,61 @@
+"""
+Tests that reports warmed by ``warm_survey_cache`` don't call Google.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from survey_api.caching import TRANSLATIONS
+from test_utils import datagen
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def warm(fake_google, monkeypatch):
+    monkeypatch.setattr(
+        "survey_api.management.commands.warm_survey_cache.get_access_token", lambda: "bench-token"
+    )
+
+    def run():
+        out = StringIO()
+        call_command("warm_survey_cache", stdout=out)
+        return out.getvalue()
+
+    return run
+
+
+def add_course_forms(fake_google, count, responses):
+    datagen.create_courses(count)
+    for i in range(count):
+        form_id = f"course-form-{i}"
+        fake_google.add_form(datagen.make_form(form_id), datagen.make_responses(form_id, responses))
+
+
+def test_warmed_reports_skip_google(fake_google, admin_client, warm):
+    datagen.add_onboarding_forms(fake_google, 10)
+    add_course_forms(fake_google, 2, 10)
+    warm()
+
+    calls = fake_google.request_count
+    email = datagen.learner_email(19)
+    for path in (
+        "/api/responses/q?language=en",
+        f"/api/user/onboarding/q?email={email}",
+        "/api/responses/course/q?form_id=course-form-1",
+        "/api/responses/course/overview/",
+    ):
+        assert admin_client.get(path).status_code == 200, path
+    assert fake_google.request_count == calls
+
+
+def test_warmup_fills_the_translation_tables(fake_google, admin_client, warm, monkeypatch):
+    datagen.add_onboarding_forms(fake_google, 3)
+    assert "onboarding translations" in warm()
+
+    def rebuilt(*args, **kwargs):
+        pytest.fail("the merged report rebuilt a warmed translation table")
+
+    monkeypatch.setattr(TRANSLATIONS, "set", rebuilt)
+    assert admin_client.get("/api/responses/q?language=fr-ca").status_code == 200
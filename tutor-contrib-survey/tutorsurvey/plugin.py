@@ -21,6 +21,39 @@ hooks.Filters.CONFIG_DEFAULTS.add_items(
         # Prefix your setting names with 'SURVEY_'.
         ("SURVEY_VERSION", __version__),
         ("SERVICE_ACCOUNT_INFO", {}),
+        # Pre-fetch the survey forms into the LMS cache during `tutor ... do init`.
+        ("SURVEY_WARM_CACHE_ON_INIT", False),
+        # Run a `survey-sync` service that pulls new submissions from Google in the background.
+        ("SURVEY_SYNC_ENABLED", False),
+        # Seconds between sync passes, and the longest back-off while no form changes.
+        ("SURVEY_SYNC_INTERVAL", 60),
+        ("SURVEY_SYNC_MAX_INTERVAL", 600),
+        # Longest the survey popup waits, on Close, for the submission to be recorded.
+        # The popup polls the status until then; see the README.
+        ("SURVEY_STATUS_WAIT_TIMEOUT", 10),
+        # Signed cookie given to learners who completed the survey, so the popup skips the status API.
+        ("SURVEY_DONE_COOKIE_NAME", "openedx-survey-done"),
+        # Connection settings of a read replica of the LMS database (e.g. {"HOST": "mysql-replica"}),
+        # merged over the default database. The admin reports read from it when set.
+        ("SURVEY_REPLICA_DATABASE", {}),
+        # Language variants of each survey, seeded into the LMS during `tutor ... do init`.
+        (
+            "SURVEY_FORMS",
+            {
+                "onboarding": [
+                    {
+                        "locale": "en",
+                        "form_id": "1MXaneZl67ofajuD9CuEhABtW-xzuWOw-uYfxGLyZ3dA",
+                        "email_question": "Email address",
+                    },
+                    {
+                        "locale": "fr-ca",
+                        "form_id": "1xjY3XCawFdY5L_NcU4L7HCuDtwaizGg3fIbF8fVlThQ",
+                        "email_question": "Adresse e-mail",
+                    },
+                ],
+            },
+        ),
     ]
 )
 
@@ -42,6 +75,9 @@ MY_INIT_TASKS: list[tuple[str, tuple[str, ...]]] = [
     # tutorsurvey/templates/survey/tasks/lms/init.sh
     # And then add the line:
     ### ("lms", ("survey", "tasks", "lms", "init.sh")),
+    # Seed the survey form registry, build the registration snapshots while the
+    # table is empty and, when SURVEY_WARM_CACHE_ON_INIT is enabled, warm the caches.
+    ("lms", ("survey", "tasks", "lms", "init.sh")),
 ]
 
 
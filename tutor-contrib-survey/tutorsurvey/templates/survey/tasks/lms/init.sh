@@ -0,0 +1,11 @@
+# Copy the survey language variants of SURVEY_FORMS into the admin-editable registry.
+./manage.py lms seed_survey_forms
+
+# Build the registration report snapshots once; signals keep them current afterwards.
+./manage.py lms rebuild_registration_snapshots --if-empty
+
+{% if SURVEY_WARM_CACHE_ON_INIT %}
+# Fill the survey report caches so the first admin doesn't pay for a cold start.
+# A Google outage must not fail the whole init job.
+./manage.py lms warm_survey_cache || echo "survey_api cache warm-up failed, continuing."
+{% endif %}